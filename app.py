@@ -1,10 +1,26 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 import logging
 from config import config
+from src.handlers.github_webhook import router as github_router
+from src.handlers.github_webhook import (
+    coalescer,
+    event_spool,
+    delivery_dedup,
+    github_verifier,
+    start_ingestion,
+    stop_ingestion,
+    webhook_queue,
+)
+from src.routes.discord import replay_guard, verifier
 from src.routes.discord import router as discord_router
+from src.container import container
+from src.utils.log import configure_logging, stop_logging
+from src.utils.command_sync import command_sync
+from src.utils.metrics import CONTENT_TYPE, metrics
+from src.utils.ratelimit import rate_limiter
+from src.utils.shared_state import shared_state
+from src.utils.subscriptions import subscriptions
 
-# Setup logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Initialize FastAPI with minimal settings
@@ -14,8 +30,59 @@ app = FastAPI(
     openapi_url=None
 )
 
-# Include the Discord router
+# Include the Discord and GitHub routers
 app.include_router(discord_router)
+app.include_router(github_router)
+
+# Log through a background writer thread at LOG_LEVEL
+app.add_event_handler("startup", configure_logging)
+
+# Run the GitHub webhook spool and workers for the lifetime of the app
+app.add_event_handler("startup", start_ingestion)
+app.add_event_handler("shutdown", stop_ingestion)
+app.add_event_handler("shutdown", webhook_queue.stop)
+app.add_event_handler("shutdown", coalescer.flush_all)
+app.add_event_handler("shutdown", event_spool.close)
+app.add_event_handler("shutdown", container.close)
+app.add_event_handler("shutdown", subscriptions.close)
+if shared_state is not None:
+    app.add_event_handler("shutdown", shared_state.close)
+if command_sync.state not in (None, shared_state):
+    app.add_event_handler("shutdown", command_sync.state.close)
+app.add_event_handler("shutdown", stop_logging)
+
+
+def gateway_latency():
+    """Return the bot's gateway heartbeat latency, if it is connected."""
+    bot = container.existing_bot
+    if bot is None or bot.is_closed():
+        return None
+    latency = bot.latency
+    return latency if latency == latency and latency != float("inf") else None
+
+
+metrics.gauge(
+    "discord_gateway_latency_seconds",
+    "Gateway heartbeat latency reported by the bot.",
+    gateway_latency,
+)
+metrics.register_stats("github_queue", webhook_queue.stats)
+metrics.register_stats("github_coalescer", coalescer.stats)
+metrics.register_stats("github_spool", event_spool.stats)
+metrics.register_stats("github_dedup", delivery_dedup.stats)
+metrics.register_stats(
+    "discord_ratelimit", rate_limiter.stats, labels={"buckets": "bucket"}
+)
+metrics.register_stats(
+    "discord_replay", replay_guard.stats, labels={"rejections": "reason"}
+)
+metrics.register_stats("discord_signature", verifier.stats)
+metrics.register_stats("github_signature", github_verifier.stats)
+
+@app.get("/metrics")
+async def metrics_endpoint():
+    """Expose metrics in the Prometheus text format."""
+    return Response(metrics.render(), media_type=CONTENT_TYPE)
 
 @app.get("/health")
 async def health_check():
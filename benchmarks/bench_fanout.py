@@ -0,0 +1,79 @@
+"""Benchmark fan-out of one GitHub event to many Discord targets.
+
+Sends one rendered message to 1, 10 and 100 webhook targets on a local stub
+that answers after a fixed delay, first one target after another (the
+previous behaviour) and then through FanOutDelivery.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_fanout
+"""
+
+import asyncio
+import time
+
+from aiohttp import web
+
+from config import config
+from src.handlers.delivery import FanOutDelivery
+from src.handlers.github_webhook import send_discord_webhook
+from src.utils.http import http_sessions
+
+STUB_LATENCY = 0.02
+TARGET_COUNTS = (1, 10, 100)
+MESSAGE = "**fleXRPL/flexrpl-discord-bot**\n• Octo Cat: Fix the build"
+
+
+async def start_stub_server():
+    async def handler(request):
+        await request.read()
+        await asyncio.sleep(STUB_LATENCY)
+        return web.Response(status=204)
+
+    app = web.Application()
+    app.router.add_post("/api/webhooks/{id}/{token}", handler)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}/api/webhooks"
+
+
+async def sequential(targets):
+    for target in targets:
+        await send_discord_webhook(target, MESSAGE)
+
+
+async def main():
+    runner, base_url = await start_stub_server()
+    delivery = FanOutDelivery(
+        send_discord_webhook, concurrency=config.GITHUB_DELIVERY_CONCURRENCY
+    )
+    print(
+        f"stub latency {STUB_LATENCY * 1000:.0f}ms, "
+        f"concurrency {config.GITHUB_DELIVERY_CONCURRENCY}"
+    )
+    try:
+        for count in TARGET_COUNTS:
+            targets = [f"{base_url}/{n}/token" for n in range(count)]
+            start = time.perf_counter()
+            await sequential(targets)
+            before = time.perf_counter() - start
+
+            start = time.perf_counter()
+            results = await delivery.deliver(targets, MESSAGE)
+            after = time.perf_counter() - start
+            assert all(results.values())
+
+            print(
+                f"{count:>4} targets  sequential {before * 1000:8.1f} ms"
+                f"  fan-out {after * 1000:8.1f} ms  ({before / after:.1f}x)"
+            )
+    finally:
+        await http_sessions.close()
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,45 @@
+"""Benchmark GitHub event formatting over a corpus of recorded payloads.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_formatting
+"""
+
+import json
+import time
+from pathlib import Path
+
+from src.utils.formatting import format_github_event
+
+CORPUS_PATH = Path(__file__).parent / "payloads" / "github_events.json"
+ROUNDS = 20_000
+
+
+def load_corpus():
+    with CORPUS_PATH.open(encoding="utf-8") as f:
+        return [(item["event"], item["payload"]) for item in json.load(f)]
+
+
+def main():
+    corpus = load_corpus()
+
+    print("Per event type:")
+    for event, payload in corpus:
+        start = time.perf_counter()
+        for _ in range(ROUNDS):
+            format_github_event(event, payload)
+        elapsed = time.perf_counter() - start
+        label = f"{event}/{payload.get('action', '-')}"
+        print(f"  {label:<32} {elapsed / ROUNDS * 1e6:6.2f} us/event")
+
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        for event, payload in corpus:
+            format_github_event(event, payload)
+    elapsed = time.perf_counter() - start
+    total = ROUNDS * len(corpus)
+    print(f"Whole corpus: {total / elapsed:,.0f} events/s")
+
+
+if __name__ == "__main__":
+    main()
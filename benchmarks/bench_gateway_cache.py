@@ -0,0 +1,214 @@
+"""Memory harness for the gateway cache policy.
+
+Replays a synthetic READY, then GUILD_CREATE for many large guilds, then a
+stream of MESSAGE_CREATE events through discord.py's own parsers, and
+reports the RSS the client's caches grow by. MESSAGE_CREATE is only
+replayed when the policy's intents would receive it.
+
+Policies:
+
+* ``legacy``: ``Intents.default()`` plus ``message_content`` and discord.py's
+  default cache sizes, as the bot was configured before.
+* ``legacy+members``: the same with the privileged members intent, as a
+  bot that needed member lists would run.
+* ``configured``: the cache policy from ``config`` (DISCORD_INTENTS,
+  DISCORD_MAX_MESSAGES, DISCORD_MEMBER_CACHE, DISCORD_CHUNK_GUILDS).
+
+Run from the repository root:
+
+    python -m benchmarks.bench_gateway_cache
+"""
+
+import asyncio
+import gc
+import json
+import os
+import resource
+import subprocess
+import sys
+
+GUILDS = 50
+MEMBERS_PER_GUILD = 2000
+CHANNELS_PER_GUILD = 50
+ROLES_PER_GUILD = 30
+MESSAGES = 5000
+POLICIES = ("legacy", "legacy+members", "configured")
+TIMESTAMP = "2024-01-01T00:00:00+00:00"
+
+
+def rss_bytes() -> int:
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def user(user_id: int) -> dict:
+    return {
+        "id": str(user_id),
+        "username": f"user{user_id}",
+        "discriminator": "0",
+        "global_name": None,
+        "avatar": None,
+    }
+
+
+def guild_create(guild_id: int) -> dict:
+    base = guild_id * 1_000_000
+    roles = [
+        {
+            "id": str(guild_id if i == 0 else base + i),
+            "name": "@everyone" if i == 0 else f"role-{i}",
+            "color": 0,
+            "hoist": False,
+            "position": i,
+            "permissions": "0",
+            "managed": False,
+            "mentionable": False,
+        }
+        for i in range(ROLES_PER_GUILD)
+    ]
+    channels = [
+        {
+            "id": str(base + 1000 + i),
+            "type": 0,
+            "name": f"channel-{i}",
+            "position": i,
+            "permission_overwrites": [],
+            "guild_id": str(guild_id),
+        }
+        for i in range(CHANNELS_PER_GUILD)
+    ]
+    members = [
+        {
+            "user": user(base + 10_000 + i),
+            "roles": [str(base + 1 + i % (ROLES_PER_GUILD - 1))],
+            "joined_at": TIMESTAMP,
+            "deaf": False,
+            "mute": False,
+            "flags": 0,
+        }
+        for i in range(MEMBERS_PER_GUILD)
+    ]
+    return {
+        "id": str(guild_id),
+        "name": f"guild-{guild_id}",
+        "owner_id": str(base + 10_000),
+        "roles": roles,
+        "channels": channels,
+        "members": members,
+        "member_count": MEMBERS_PER_GUILD,
+        "emojis": [],
+        "stickers": [],
+        "features": [],
+        "threads": [],
+        "presences": [],
+        "voice_states": [],
+        "large": True,
+        "unavailable": False,
+    }
+
+
+def message_create(n: int) -> dict:
+    guild_id = 1 + n % GUILDS
+    base = guild_id * 1_000_000
+    return {
+        "id": str(9_000_000_000 + n),
+        "channel_id": str(base + 1000 + n % CHANNELS_PER_GUILD),
+        "guild_id": str(guild_id),
+        "author": user(base + 10_000 + n % MEMBERS_PER_GUILD),
+        "content": f"message {n} " + "lorem ipsum " * 20,
+        "timestamp": TIMESTAMP,
+        "edited_timestamp": None,
+        "tts": False,
+        "mention_everyone": False,
+        "mentions": [],
+        "mention_roles": [],
+        "attachments": [],
+        "embeds": [],
+        "pinned": False,
+        "type": 0,
+    }
+
+
+def make_client(policy: str):
+    import discord
+
+    if policy == "configured":
+        from src.bot.bot import cache_policy
+
+        return discord.Client(**cache_policy())
+    intents = discord.Intents.default()
+    intents.message_content = True
+    intents.members = policy == "legacy+members"
+    return discord.Client(intents=intents, chunk_guilds_at_startup=False)
+
+
+async def replay(policy: str) -> dict:
+    client = make_client(policy)
+    state = client._connection
+    receives_messages = client.intents.guild_messages
+    gc.collect()
+    before = rss_bytes()
+
+    state.parse_ready(
+        {
+            "v": 10,
+            "user": user(1),
+            "guilds": [
+                {"id": str(g), "unavailable": True} for g in range(1, GUILDS + 1)
+            ],
+            "session_id": "bench",
+            "application": {"id": "1", "flags": 0},
+        }
+    )
+    for guild_id in range(1, GUILDS + 1):
+        state.parse_guild_create(guild_create(guild_id))
+    if receives_messages:
+        for n in range(MESSAGES):
+            state.parse_message_create(message_create(n))
+
+    gc.collect()
+    after = rss_bytes()
+    result = {
+        "policy": policy,
+        "rss_growth": after - before,
+        "guilds": len(state._guilds),
+        "members": sum(len(guild._members) for guild in state._guilds.values()),
+        "messages": len(state._messages or ()),
+    }
+    if state._ready_task is not None:
+        state._ready_task.cancel()
+    return result
+
+
+def run_policy(policy: str) -> dict:
+    output = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_gateway_cache", policy],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    print(
+        f"{GUILDS} guilds x {MEMBERS_PER_GUILD} members, "
+        f"{CHANNELS_PER_GUILD} channels, {MESSAGES} messages"
+    )
+    for policy in POLICIES:
+        result = run_policy(policy)
+        print(
+            f"  {policy:<15} RSS +{result['rss_growth'] / 2**20:7.1f} MiB  "
+            f"cached members {result['members']:>7}  "
+            f"cached messages {result['messages']:>5}"
+        )
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        print(json.dumps(asyncio.run(replay(sys.argv[1]))))
+    else:
+        main()
@@ -0,0 +1,128 @@
+"""Memory benchmark for GitHub webhook ingestion of a multi-MB push payload.
+
+Compares the previous path (``await request.body()`` for the HMAC, then
+``await request.json()``) with the streaming verifier that fills a single
+preallocated buffer and parses it once. Also times HMAC verification of a
+small ping payload with a freshly keyed ``hmac.new`` against the verifier's
+precomputed key state.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_github_ingest
+"""
+
+import asyncio
+import hashlib
+import hmac
+import json
+import timeit
+import tracemalloc
+
+from starlette.requests import Request
+
+from src.handlers import github_webhook
+from src.handlers.github_webhook import verify_signature
+from src.utils.responses import decode_json
+from src.utils.verification import GitHubSignatureVerifier
+
+SECRET = "benchmark-secret"
+REPO_URL = "https://github.com/fleXRPL/flexrpl-discord-bot"
+CHUNK_SIZE = 64 * 1024
+COMMITS = 5000
+
+
+def push_payload(commits: int) -> bytes:
+    return json.dumps(
+        {
+            "ref": "refs/heads/main",
+            "repository": {"full_name": "fleXRPL/flexrpl-discord-bot"},
+            "commits": [
+                {
+                    "id": f"{i:040x}",
+                    "message": f"Commit {i}: " + "refactor " * 20,
+                    "url": f"{REPO_URL}/commit/{i:040x}",
+                    "author": {"name": "Octo Cat", "email": "octo@example.com"},
+                    "added": [f"src/file_{i}.py"],
+                    "modified": [],
+                    "removed": [],
+                }
+                for i in range(commits)
+            ],
+        }
+    ).encode()
+
+
+def make_request(body: bytes) -> Request:
+    signature = hmac.new(SECRET.encode(), body, hashlib.sha256).hexdigest()
+    chunks = [body[i : i + CHUNK_SIZE] for i in range(0, len(body), CHUNK_SIZE)]
+
+    async def receive():
+        chunk = chunks.pop(0)
+        return {"type": "http.request", "body": chunk, "more_body": bool(chunks)}
+
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "headers": [
+            (b"x-hub-signature-256", f"sha256={signature}".encode()),
+            (b"content-length", str(len(body)).encode()),
+        ],
+    }
+    return Request(scope, receive)
+
+
+async def old_path(request: Request):
+    body = await request.body()
+    digest = hmac.new(SECRET.encode(), body, hashlib.sha256)
+    assert hmac.compare_digest(
+        request.headers["x-hub-signature-256"], f"sha256={digest.hexdigest()}"
+    )
+    return await request.json()
+
+
+async def new_path(request: Request):
+    return decode_json(await verify_signature(request))
+
+
+async def measure(name: str, func, body: bytes) -> int:
+    request = make_request(body)
+    tracemalloc.start()
+    payload = await func(request)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert len(payload["commits"]) == COMMITS
+    del payload
+    print(f"  {name:<28} peak {peak / 2**20:7.2f} MiB")
+    return peak
+
+
+def measure_hmac(iterations: int = 100000) -> None:
+    body = b'{"zen": "Keep it logically awesome.", "hook_id": 1}'
+    signature = "sha256=" + hmac.new(SECRET.encode(), body, hashlib.sha256).hexdigest()
+    verifier = GitHubSignatureVerifier([SECRET])
+
+    def fresh():
+        digest = hmac.new(SECRET.encode(), body, hashlib.sha256).hexdigest()
+        return hmac.compare_digest(signature, f"sha256={digest}")
+
+    print("small payload HMAC:")
+    for name, func in (
+        ("hmac.new per request", fresh),
+        ("precomputed key state", lambda: verifier.verify(body, "sha256", signature)),
+    ):
+        seconds = min(timeit.repeat(func, number=iterations, repeat=3))
+        print(f"  {name:<28} {seconds / iterations * 1e6:7.2f} us/request")
+
+
+async def main():
+    github_webhook.github_verifier = GitHubSignatureVerifier([SECRET])
+    body = push_payload(COMMITS)
+    print(f"push payload: {len(body) / 2**20:.2f} MiB, {COMMITS} commits")
+    before = await measure("body() + json()", old_path, body)
+    after = await measure("streaming verify + parse", new_path, body)
+    print(f"  saved {(before - after) / 2**20:.2f} MiB peak")
+    measure_hmac()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
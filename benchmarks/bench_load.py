@@ -0,0 +1,354 @@
+"""Load test for the /discord-interaction and /github endpoints.
+
+Builds validly signed requests up front (Ed25519 for interactions, HMAC
+SHA-256 for GitHub webhooks from ``payloads/github_events.json``) with a
+throwaway key and secret, then drives the real ``app`` with them:
+
+* ``asgi``: in process through ``httpx.ASGITransport``, measuring the app
+  without a network stack;
+* ``uvicorn``: against ``uvicorn app:app`` started as a subprocess on a
+  free local port, with ``--workers`` processes sharing one state file.
+
+Every request carries a fresh interaction ID or delivery ID, so replay
+protection and deduplication see realistic traffic. The app runs with
+its spool and subscriptions in a temporary directory and no Discord
+targets, so nothing leaves the machine.
+
+For each scenario it reports requests per second and p50/p90/p99/max
+latency, and writes the results as JSON (``benchmarks/results/`` by
+default, named after the current commit). Pass ``--baseline`` with an
+earlier results file to print the change per scenario.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_load
+    python -m benchmarks.bench_load --mode uvicorn --requests 5000 --concurrency 50
+    python -m benchmarks.bench_load --mode uvicorn --workers 4
+    python -m benchmarks.bench_load --baseline benchmarks/results/<commit>.json
+"""
+
+import argparse
+import asyncio
+import hashlib
+import hmac
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional
+
+import httpx
+from nacl.signing import SigningKey
+
+ROOT = Path(__file__).parent.parent
+CORPUS_PATH = Path(__file__).parent / "payloads" / "github_events.json"
+RESULTS_DIR = Path(__file__).parent / "results"
+SCENARIOS = ("interaction_ping", "command_help", "command_ping", "github_webhook")
+
+signing_key = SigningKey.generate()
+WEBHOOK_SECRET = "load-test-secret"
+
+
+class SignedRequest(NamedTuple):
+    path: str
+    body: bytes
+    headers: Dict[str, str]
+
+
+def app_environment(data_dir: str) -> Dict[str, str]:
+    """Return the environment the app under test is configured from."""
+    data = Path(data_dir)
+    return {
+        "DISCORD_PUBLIC_KEY": signing_key.verify_key.encode().hex(),
+        "DISCORD_PREVIOUS_PUBLIC_KEY": "",
+        "GITHUB_WEBHOOK_SECRET": WEBHOOK_SECRET,
+        "GITHUB_WEBHOOK_PREVIOUS_SECRETS": "",
+        "DISCORD_WEBHOOK_URL": "",
+        "DISCORD_MODE": "http",
+        "GITHUB_SPOOL_PATH": str(data / "spool.db"),
+        "SUBSCRIPTIONS_PATH": str(data / "subscriptions.db"),
+        "COMMAND_SYNC_PATH": str(data / "command_sync.db"),
+        "SHARED_STATE_PATH": str(data / "shared_state.db"),
+        "GITHUB_QUEUE_SIZE": "100000",
+        "LOG_LEVEL": os.environ.get("LOG_LEVEL", "WARNING"),
+    }
+
+
+def interaction_request(payload: dict) -> SignedRequest:
+    payload = {"id": str(uuid.uuid4().int >> 64), "version": 1, **payload}
+    body = json.dumps(payload).encode()
+    timestamp = str(int(time.time()))
+    signature = signing_key.sign(timestamp.encode() + body).signature.hex()
+    return SignedRequest(
+        "/discord-interaction",
+        body,
+        {
+            "X-Signature-Ed25519": signature,
+            "X-Signature-Timestamp": timestamp,
+            "Content-Type": "application/json",
+        },
+    )
+
+
+def command(name: str) -> dict:
+    return {
+        "type": 2,
+        "application_id": "1",
+        "channel_id": "2",
+        "guild_id": "3",
+        "token": "token",
+        "data": {"id": "4", "name": name, "type": 1},
+    }
+
+
+def github_request(event: dict) -> SignedRequest:
+    body = json.dumps(event["payload"]).encode()
+    digest = hmac.new(WEBHOOK_SECRET.encode(), body, hashlib.sha256).hexdigest()
+    return SignedRequest(
+        "/github",
+        body,
+        {
+            "X-Hub-Signature-256": f"sha256={digest}",
+            "X-GitHub-Event": event["event"],
+            "X-GitHub-Delivery": str(uuid.uuid4()),
+            "Content-Type": "application/json",
+        },
+    )
+
+
+def build_requests(scenario: str, count: int) -> List[SignedRequest]:
+    """Sign ``count`` distinct requests for a scenario before timing starts."""
+    if scenario == "interaction_ping":
+        return [interaction_request({"type": 1}) for _ in range(count)]
+    if scenario == "command_help":
+        return [interaction_request(command("help")) for _ in range(count)]
+    if scenario == "command_ping":
+        return [interaction_request(command("ping")) for _ in range(count)]
+    corpus = json.loads(CORPUS_PATH.read_text())
+    return [github_request(corpus[i % len(corpus)]) for i in range(count)]
+
+
+def percentile(ordered: List[float], fraction: float) -> float:
+    """Return the nearest-rank percentile of already sorted samples."""
+    if not ordered:
+        return 0.0
+    index = max(0, min(len(ordered) - 1, round(fraction * len(ordered)) - 1))
+    return ordered[index]
+
+
+async def drive(
+    client: httpx.AsyncClient, requests: List[SignedRequest], concurrency: int
+) -> dict:
+    """Send every request with ``concurrency`` in flight and time each one."""
+    latencies: List[float] = []
+    errors = 0
+    pending = iter(requests)
+
+    async def worker():
+        nonlocal errors
+        for request in pending:
+            started = time.perf_counter()
+            response = await client.post(
+                request.path, content=request.body, headers=request.headers
+            )
+            latencies.append(time.perf_counter() - started)
+            if response.status_code >= 300:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "requests": len(requests),
+        "concurrency": concurrency,
+        "errors": errors,
+        "rps": len(requests) / elapsed,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p90_ms": percentile(latencies, 0.90) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "max_ms": latencies[-1] * 1000 if latencies else 0.0,
+    }
+
+
+async def run_scenarios(
+    client: httpx.AsyncClient, mode: str, args: argparse.Namespace
+) -> List[dict]:
+    results = []
+    for scenario in args.scenarios:
+        # Warm up code paths and connections outside the measurement
+        await drive(client, build_requests(scenario, 50), args.concurrency)
+        stats = await drive(
+            client, build_requests(scenario, args.requests), args.concurrency
+        )
+        results.append({"mode": mode, "scenario": scenario, **stats})
+        print_result(results[-1])
+    return results
+
+
+async def run_asgi(args: argparse.Namespace, data_dir: str) -> List[dict]:
+    """Drive the app in process, with its startup and shutdown handlers."""
+    os.environ.update(app_environment(data_dir))
+    from app import app
+
+    await app.router.startup()
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://bench"
+        ) as client:
+            return await run_scenarios(client, "asgi", args)
+    finally:
+        await app.router.shutdown()
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def wait_until_up(client: httpx.AsyncClient, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if (await client.get("/health")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.1)
+    raise RuntimeError("uvicorn did not start")
+
+
+async def run_uvicorn(args: argparse.Namespace, data_dir: str) -> List[dict]:
+    """Drive uvicorn workers running the app in a subprocess."""
+    port = free_port()
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "app:app",
+            "--host",
+            "127.0.0.1",
+            "--port",
+            str(port),
+            "--workers",
+            str(args.workers),
+            "--log-level",
+            "warning",
+            "--no-access-log",
+        ],
+        cwd=ROOT,
+        env={**os.environ, **app_environment(data_dir)},
+    )
+    limits = httpx.Limits(
+        max_connections=args.concurrency, max_keepalive_connections=args.concurrency
+    )
+    try:
+        async with httpx.AsyncClient(
+            base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=30
+        ) as client:
+            await wait_until_up(client)
+            mode = "uvicorn" if args.workers == 1 else f"uvicorn-{args.workers}w"
+            return await run_scenarios(client, mode, args)
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+
+def print_result(result: dict) -> None:
+    print(
+        f"  {result['mode']:<10} {result['scenario']:<17} "
+        f"{result['rps']:8.0f} req/s  p50 {result['p50_ms']:7.2f} ms  "
+        f"p99 {result['p99_ms']:7.2f} ms  errors {result['errors']}"
+    )
+
+
+def current_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: List[dict], baseline_path: Path) -> None:
+    """Print the change of each scenario against an earlier results file."""
+    baseline = {
+        (entry["mode"], entry["scenario"]): entry
+        for entry in json.loads(baseline_path.read_text())["results"]
+    }
+    print(f"Compared with {baseline_path}:")
+    for result in results:
+        before = baseline.get((result["mode"], result["scenario"]))
+        if before is None:
+            continue
+        rps = (result["rps"] / before["rps"] - 1) * 100
+        p99 = (result["p99_ms"] / before["p99_ms"] - 1) * 100
+        print(
+            f"  {result['mode']:<10} {result['scenario']:<17} "
+            f"req/s {rps:+6.1f}%  p99 {p99:+6.1f}%"
+        )
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--mode", choices=("asgi", "uvicorn", "both"), default="both")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers")
+    parser.add_argument(
+        "--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS)
+    )
+    parser.add_argument("--output", type=Path, help="where to write the JSON results")
+    parser.add_argument("--baseline", type=Path, help="earlier results to compare")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    commit = current_commit()
+    print(
+        f"{args.requests} requests per scenario, concurrency {args.concurrency}, "
+        f"commit {commit or 'unknown'}"
+    )
+    results = []
+    with tempfile.TemporaryDirectory() as data_dir:
+        if args.mode in ("asgi", "both"):
+            results += asyncio.run(run_asgi(args, data_dir))
+        if args.mode in ("uvicorn", "both"):
+            results += asyncio.run(run_uvicorn(args, data_dir))
+
+    output = args.output or RESULTS_DIR / f"{commit or int(time.time())}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(
+        json.dumps(
+            {
+                "commit": commit,
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "results": results,
+            },
+            indent=2,
+        )
+    )
+    print(f"Wrote {output}")
+    if args.baseline:
+        compare(results, args.baseline)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Benchmark hot-path logging before and after lazy, queued logging.
+
+Measures what one interaction's log call costs the event loop:
+
+* disabled level: an f-string ``logger.info`` versus a lazy ``%s`` call
+  when INFO is filtered out by ``LOG_LEVEL``;
+* enabled level: a ``StreamHandler`` writing synchronously versus the
+  ``QueueHandler`` from ``configure_logging``, whose JSON rendering and
+  write happen on the listener thread, both to a fast file and to a sink
+  that blocks for a millisecond per write like a backed-up stderr pipe.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_logging
+"""
+
+import logging
+import tempfile
+import time
+import timeit
+
+from src.utils.log import JsonFormatter, configure_logging, stop_logging
+
+ITERATIONS = 20000
+PAYLOAD = {
+    "type": 2,
+    "id": "1234567890",
+    "data": {"name": "githubsub", "options": [{"name": "repository", "value": "o/r"}]},
+    "member": {"user": {"id": "42", "username": "someone"}},
+}
+
+logger = logging.getLogger("bench")
+
+
+def fstring_call():
+    logger.info(f"Sending response: {PAYLOAD}")
+
+
+def lazy_call():
+    logger.info("Sending response: %s", PAYLOAD)
+
+
+class SlowSink:
+    """A stream whose writes block, like a pipe nobody is draining."""
+
+    def write(self, text: str) -> int:
+        time.sleep(0.001)
+        return len(text)
+
+    def flush(self) -> None:
+        pass
+
+
+def per_call_us(func, iterations: int = ITERATIONS) -> float:
+    return timeit.timeit(func, number=iterations) / iterations * 1e6
+
+
+def compare_handlers(label: str, sink, iterations: int) -> None:
+    root = logging.getLogger()
+    sync = logging.StreamHandler(sink)
+    sync.setFormatter(JsonFormatter())
+    root.addHandler(sync)
+    sync_us = per_call_us(lazy_call, iterations)
+    root.removeHandler(sync)
+
+    configure_logging("INFO", "json", sink)
+    queued_us = per_call_us(lazy_call, iterations)
+    stop_logging()
+    print(f"  {label:<10} sync {sync_us:8.2f} us   queued {queued_us:8.2f} us")
+
+
+def main():
+    root = logging.getLogger()
+    with tempfile.TemporaryFile("w") as sink:
+        root.setLevel(logging.WARNING)
+        print("INFO disabled")
+        print(f"  f-string            {per_call_us(fstring_call):7.2f} us")
+        print(f"  lazy %s             {per_call_us(lazy_call):7.2f} us")
+
+        root.setLevel(logging.INFO)
+        print("INFO enabled, per call on the event loop")
+        compare_handlers("file", sink, ITERATIONS)
+        compare_handlers("slow sink", SlowSink(), ITERATIONS // 100)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Benchmark the cost of the metrics added to the interaction hot path.
+
+Times the instrumentation one Discord interaction pays (five clock reads,
+four histogram observations and one counter increment) against the
+signature check the same request already does, and times rendering a
+populated registry for a scrape.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_metrics
+"""
+
+import time
+import timeit
+
+from nacl.signing import SigningKey
+
+from src.utils.metrics import (
+    MetricsRegistry,
+    interaction_dispatch_seconds,
+    interaction_handler_seconds,
+    interaction_parse_seconds,
+    interaction_requests,
+    interaction_verify_seconds,
+)
+from src.utils.verification import InteractionVerifier
+
+ITERATIONS = 50000
+COMMANDS = ("ping", "help", "githubsub", "githubunsub")
+
+
+def instrument_interaction():
+    started = time.perf_counter()
+    verify_started = time.perf_counter()
+    interaction_verify_seconds.observe(time.perf_counter() - verify_started)
+    parse_started = time.perf_counter()
+    interaction_parse_seconds.observe(time.perf_counter() - parse_started)
+    interaction_requests.inc("application_command")
+    dispatch_started = time.perf_counter()
+    interaction_dispatch_seconds.observe(time.perf_counter() - dispatch_started, "ping")
+    interaction_handler_seconds.observe(time.perf_counter() - started, "ping")
+
+
+def populated_registry() -> MetricsRegistry:
+    registry = MetricsRegistry()
+    histograms = [
+        registry.histogram(f"stage_{i}_seconds", "Stage latency.", ["command"])
+        for i in range(8)
+    ]
+    counter = registry.counter("interactions_total", "Interactions.", ["type"])
+    for n in range(10000):
+        command = COMMANDS[n % len(COMMANDS)]
+        for histogram in histograms:
+            histogram.observe(n * 1e-6, command)
+        counter.inc(command)
+    return registry
+
+
+def main():
+    key = SigningKey.generate()
+    verifier = InteractionVerifier(key.verify_key.encode().hex())
+    body = b'{"type":2,"data":{"name":"ping"}}'
+    timestamp = str(int(time.time()))
+    signature = key.sign(timestamp.encode() + body).signature.hex()
+    assert verifier.verify_request(timestamp, body, signature)
+
+    instrumented = timeit.timeit(instrument_interaction, number=ITERATIONS)
+    verify = timeit.timeit(
+        lambda: verifier.verify_request(timestamp, body, signature),
+        number=ITERATIONS // 10,
+    )
+    per_request = instrumented / ITERATIONS * 1e6
+    per_verify = verify / (ITERATIONS // 10) * 1e6
+    print(f"metrics per interaction  {per_request:7.2f} us")
+    print(f"signature verification   {per_verify:7.2f} us")
+    print(f"overhead vs verification {per_request / per_verify:7.1%}")
+
+    registry = populated_registry()
+    render = timeit.timeit(registry.render, number=100) / 100
+    print(f"render 8 histograms x {len(COMMANDS)} labels {render * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
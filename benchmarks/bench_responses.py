@@ -0,0 +1,63 @@
+"""Micro-benchmark for interaction response serialization.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_responses
+"""
+
+import json
+import timeit
+
+from fastapi import Response
+
+from src.handlers.interactions import static_responses
+from src.utils.responses import encode_json, orjson, render_response
+
+ITERATIONS = 200_000
+
+
+def per_request_json_dumps():
+    payload = {
+        "type": 4,
+        "data": {"content": static_responses["help"]["data"]["content"], "flags": 64},
+    }
+    return Response(content=json.dumps(payload), media_type="application/json")
+
+
+def cached_static_body():
+    return render_response(static_responses["help"])
+
+
+def dynamic_encode_json():
+    payload = {"type": 4, "data": {"content": "Pong! 🏓 (Latency: 42ms)", "flags": 64}}
+    return encode_json(payload)
+
+
+def dynamic_stdlib_json():
+    payload = {"type": 4, "data": {"content": "Pong! 🏓 (Latency: 42ms)", "flags": 64}}
+    return json.dumps(payload).encode()
+
+
+def report(name, func, baseline=None):
+    seconds = min(timeit.repeat(func, number=ITERATIONS, repeat=3))
+    per_call_us = seconds / ITERATIONS * 1e6
+    line = f"{name:<32} {per_call_us:8.3f} us/request"
+    if baseline is not None:
+        line += f"  ({baseline / per_call_us:.2f}x)"
+    print(line)
+    return per_call_us
+
+
+def main():
+    print(f"orjson available: {orjson is not None}")
+    print("Static /help reply:")
+    baseline = report("json.dumps per request", per_request_json_dumps)
+    report("pre-rendered StaticResponse", cached_static_body, baseline)
+
+    print("Dynamic /ping reply body:")
+    baseline = report("json.dumps", dynamic_stdlib_json)
+    report("encode_json", dynamic_encode_json, baseline)
+
+
+if __name__ == "__main__":
+    main()
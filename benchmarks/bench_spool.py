@@ -0,0 +1,86 @@
+"""Benchmark the durable GitHub event spool.
+
+Compares committing (and fsyncing) every event on its own with the
+group-committed EventSpool under concurrent webhook deliveries, then times
+replaying the unacknowledged events as happens on startup.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_spool
+"""
+
+import asyncio
+import json
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+from src.utils.spool import SCHEMA, EventSpool
+
+EVENTS = 2000
+CONCURRENCY = 50
+BODY = json.dumps(
+    {"action": "opened", "issue": {"number": 1, "title": "x" * 200}}
+).encode()
+
+
+def commit_per_event(path: str) -> float:
+    conn = sqlite3.connect(path, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=FULL")
+    conn.execute(SCHEMA)
+    start = time.perf_counter()
+    for _ in range(EVENTS):
+        conn.execute(
+            "INSERT INTO events (event_type, delivery_id, body, received_at) "
+            "VALUES (?, ?, ?, ?)",
+            ("issues", None, BODY, time.time()),
+        )
+    elapsed = time.perf_counter() - start
+    conn.close()
+    return elapsed
+
+
+async def group_commit(path: str) -> float:
+    spool = EventSpool(path)
+    await spool.open()
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+
+    async def one():
+        async with semaphore:
+            await spool.append("issues", BODY)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(EVENTS)))
+    elapsed = time.perf_counter() - start
+    print(f"  avg batch size {spool.stats()['avg_batch_size']:.1f}")
+    await spool.close()
+    return elapsed
+
+
+async def replay(path: str) -> float:
+    spool = EventSpool(path)
+    await spool.open()
+    start = time.perf_counter()
+    events = await spool.replay()
+    elapsed = time.perf_counter() - start
+    await spool.close()
+    assert len(events) == EVENTS
+    return elapsed
+
+
+async def main():
+    with tempfile.TemporaryDirectory() as directory:
+        before = commit_per_event(str(Path(directory) / "single.db"))
+        print(f"commit per event       {EVENTS / before:10.0f} events/s")
+        path = str(Path(directory) / "spool.db")
+        after = await group_commit(path)
+        print(f"group commit           {EVENTS / after:10.0f} events/s")
+        print(f"speedup: {before / after:.2f}x")
+        elapsed = await replay(path)
+        print(f"replay {EVENTS} events   {elapsed * 1000:10.1f} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
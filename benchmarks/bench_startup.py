@@ -0,0 +1,168 @@
+"""Measure import time, RSS and Discord client count at startup.
+
+Each entry point is imported in a fresh interpreter, with the same paths as
+the Docker image (the project root and ``src/``), and reports wall time to
+import, peak RSS and how many discord.Client instances were created. The
+``gateway`` row also builds the container's bot, as ``run_all`` does unless
+``DISCORD_MODE=http``; ``src.main`` alone is the HTTP-only worker.
+
+It also starts ``python -m src.main`` in HTTP-only mode, as a scaled-from-zero
+worker would, and times how long the first ``/health`` request takes to be
+answered. It then breaks the import of ``app`` down with ``python -X importtime``
+and lists the modules that take longest, including their own imports.
+``tests/test_startup.py`` holds the same measurement to a budget.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_startup
+"""
+
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from pathlib import Path
+from typing import Dict
+
+ROOT = Path(__file__).resolve().parent.parent
+RUNS = 5
+TOP_IMPORTS = 15
+ENTRY_POINTS = (
+    ("app", "app", False),
+    ("src.main", "src.main", False),
+    ("gateway", "src.main", True),
+)
+
+PROBE = """
+import gc, json, resource, sys, time
+start = time.perf_counter()
+__import__(sys.argv[1])
+if sys.argv[2] == "1":
+    from src.container import container
+    container.bot
+elapsed = time.perf_counter() - start
+clients = 0
+if "discord" in sys.modules:
+    import discord
+    clients = sum(isinstance(o, discord.Client) for o in gc.get_objects())
+print(json.dumps({
+    "seconds": elapsed,
+    "rss_kib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    "clients": clients,
+    "discord_imported": "discord" in sys.modules,
+}))
+"""
+
+
+def probe(module: str, create_bot: bool) -> dict:
+    env = dict(os.environ, PYTHONPATH=f"{ROOT}{os.pathsep}{ROOT / 'src'}")
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE, module, "1" if create_bot else "0"],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def first_response_seconds() -> float:
+    """Return how long a fresh HTTP-only server takes to answer a request."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    with tempfile.TemporaryDirectory() as data_dir:
+        env = dict(
+            os.environ,
+            PORT=str(port),
+            DISCORD_MODE="http",
+            WEB_CONCURRENCY="1",
+            LOG_LEVEL="WARNING",
+            SHARED_STATE_PATH=str(Path(data_dir) / "shared_state.db"),
+            GITHUB_SPOOL_PATH=str(Path(data_dir) / "spool.db"),
+            SUBSCRIPTIONS_PATH=str(Path(data_dir) / "subscriptions.db"),
+        )
+        start = time.perf_counter()
+        server = subprocess.Popen(
+            [sys.executable, "-m", "src.main"],
+            cwd=ROOT,
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        try:
+            while server.poll() is None:
+                try:
+                    urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=1)
+                    return time.perf_counter() - start
+                except OSError:
+                    time.sleep(0.005)
+            raise RuntimeError("server exited before answering")
+        finally:
+            server.terminate()
+            server.wait(timeout=30)
+
+
+def import_times(module: str) -> Dict[str, float]:
+    """Return seconds spent importing ``module`` and each module it pulls in.
+
+    Runs ``import module`` under ``-X importtime`` in a fresh interpreter
+    and keeps the subtree under ``module``, with cumulative times, so
+    interpreter startup is left out and modules that were never imported
+    are absent from the result.
+    """
+    env = dict(os.environ, PYTHONPATH=f"{ROOT}{os.pathsep}{ROOT / 'src'}")
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stderr
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        # Nested imports are indented two more spaces per level
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        entries.append((depth, name.strip(), int(cumulative) / 1e6))
+
+    # Each module is listed after its imports, so its subtree precedes it
+    end = max(i for i, (depth, name, _) in enumerate(entries) if name == module)
+    start = end
+    while start > 0 and entries[start - 1][0] > entries[end][0]:
+        start -= 1
+    return {name: seconds for _, name, seconds in entries[start : end + 1]}
+
+
+def main():
+    for name, module, create_bot in ENTRY_POINTS:
+        runs = [probe(module, create_bot) for _ in range(RUNS)]
+        seconds = sorted(run["seconds"] for run in runs)[RUNS // 2]
+        rss = sorted(run["rss_kib"] for run in runs)[RUNS // 2]
+        print(
+            f"{name:<10} {seconds * 1000:8.1f} ms  "
+            f"RSS {rss / 1024:6.1f} MiB  "
+            f"discord clients {runs[0]['clients']}  "
+            f"discord imported {runs[0]['discord_imported']}"
+        )
+
+    runs = sorted(first_response_seconds() for _ in range(RUNS))
+    print(f"\nfirst response from python -m src.main: {runs[RUNS // 2] * 1000:.1f} ms")
+
+    times = import_times("app")
+    print(f"import app: {times['app'] * 1000:.1f} ms (-X importtime, cumulative)")
+    top = sorted(times.items(), key=lambda item: item[1], reverse=True)[1:TOP_IMPORTS]
+    for name, seconds in top:
+        print(f"  {name:<40} {seconds * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Benchmark routing GitHub events to subscriptions.
+
+Compares scanning every subscription for each webhook with the
+SubscriptionStore index keyed by repository and event type, for a store
+holding many repositories.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_subscriptions
+"""
+
+import timeit
+
+from src.utils.subscriptions import Subscription, SubscriptionStore
+
+REPOSITORIES = 5000
+CHANNELS_PER_REPO = 3
+ITERATIONS = 2000
+EVENTS = ("push", "pull_request", "issues", "release")
+
+
+def build_store() -> SubscriptionStore:
+    store = SubscriptionStore(":memory:")
+    for repo in range(REPOSITORIES):
+        for channel in range(CHANNELS_PER_REPO):
+            store.subscribe(
+                Subscription(
+                    channel_id=f"{repo}-{channel}",
+                    repository=f"org/repo-{repo}",
+                    events=(EVENTS[channel % len(EVENTS)],),
+                    branches=("main",) if channel == 0 else (),
+                )
+            )
+    return store
+
+
+def scan(subscriptions, repository: str, event_type: str, branch: str):
+    return [
+        sub
+        for sub in subscriptions
+        if sub.repository.lower() == repository.lower()
+        and (not sub.events or event_type in sub.events)
+        and sub.matches_branch(branch)
+    ]
+
+
+def main():
+    store = build_store()
+    subscriptions = [sub for subs in store._index.values() for sub in subs]
+    repository = f"org/repo-{REPOSITORIES // 2}"
+    expected = scan(subscriptions, repository, "push", "main")
+    assert sorted(store.match(repository, "push", "main"), key=id) == sorted(
+        expected, key=id
+    )
+
+    print(f"{len(subscriptions)} subscriptions over {REPOSITORIES} repositories")
+    results = {}
+    for name, func in (
+        ("linear scan", lambda: scan(subscriptions, repository, "push", "main")),
+        ("indexed lookup", lambda: store.match(repository, "push", "main")),
+    ):
+        seconds = min(timeit.repeat(func, number=ITERATIONS, repeat=3))
+        results[name] = seconds
+        print(f"  {name:<16} {seconds / ITERATIONS * 1e6:10.2f} us/event")
+    print(f"speedup: {results['linear scan'] / results['indexed lookup']:.0f}x")
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
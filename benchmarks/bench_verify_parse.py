@@ -0,0 +1,104 @@
+"""Benchmark interaction signature verification and JSON parsing.
+
+Compares the old path (decode body to str, f-string, re-encode, VerifyKey,
+json.loads on str) against verifying over the raw bytes and parsing them
+directly. Reports peak traced allocations and time per request for large
+autocomplete and modal payloads.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_verify_parse
+"""
+
+import json
+import time
+import timeit
+import tracemalloc
+
+from nacl.signing import SigningKey
+
+from src.utils.responses import decode_json
+from src.utils.verification import InteractionVerifier
+
+ITERATIONS = 200
+
+signing_key = SigningKey.generate()
+verify_key = signing_key.verify_key
+verifier = InteractionVerifier(verify_key.encode().hex())
+
+
+def autocomplete_payload(choices: int) -> bytes:
+    options = [
+        {"type": 3, "name": f"option_{i}", "value": "ünïcode query " * 8}
+        for i in range(choices)
+    ]
+    return json.dumps(
+        {
+            "type": 4,
+            "id": "1",
+            "token": "t" * 160,
+            "data": {"name": "githubsub", "type": 1, "options": options},
+        }
+    ).encode()
+
+
+def modal_payload(fields: int) -> bytes:
+    rows = [
+        {
+            "type": 1,
+            "components": [{"type": 4, "custom_id": f"field_{i}", "value": "x" * 4000}],
+        }
+        for i in range(fields)
+    ]
+    return json.dumps(
+        {"type": 5, "id": "1", "data": {"custom_id": "feedback", "components": rows}}
+    ).encode()
+
+
+def old_path(timestamp: str, body: bytes, signature: str):
+    body_str = body.decode()
+    verify_key.verify(f"{timestamp}{body_str}".encode(), bytes.fromhex(signature))
+    return json.loads(body_str)
+
+
+def new_path(timestamp: str, body: bytes, signature: str):
+    if not verifier.verify_request(timestamp, body, signature):
+        raise ValueError("bad signature")
+    return decode_json(body)
+
+
+def peak_allocations(func, *args) -> int:
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    func(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def run(name: str, body: bytes):
+    timestamp = str(int(time.time()))
+    signature = signing_key.sign(timestamp.encode() + body).signature.hex()
+    args = (timestamp, body, signature)
+
+    print(f"{name} ({len(body) / 1024:.0f} KiB):")
+    results = {}
+    for label, func in (("decode/re-encode", old_path), ("raw bytes", new_path)):
+        peak = peak_allocations(func, *args)
+        seconds = min(timeit.repeat(lambda: func(*args), number=ITERATIONS, repeat=3))
+        results[label] = peak
+        print(
+            f"  {label:<18} peak {peak / 1024:8.1f} KiB"
+            f"  {seconds / ITERATIONS * 1e6:8.1f} us/request"
+        )
+    saved = results["decode/re-encode"] - results["raw bytes"]
+    print(f"  saved {saved / 1024:.1f} KiB per request")
+
+
+def main():
+    run("autocomplete", autocomplete_payload(25))
+    run("modal", modal_payload(5))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Benchmark Discord webhook delivery against a local stub server.
+
+Compares opening a new aiohttp.ClientSession per message (the previous
+behaviour) with the shared, pooled session used by send_discord_webhook.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_webhook_delivery
+"""
+
+import asyncio
+import time
+
+import aiohttp
+from aiohttp import web
+
+from src.handlers.github_webhook import send_discord_webhook
+from src.utils.http import http_sessions
+
+MESSAGES = 2000
+CONCURRENCY = 20
+WEBHOOKS = 50
+
+
+async def start_stub_server():
+    async def handler(request):
+        await request.read()
+        return web.Response(status=204)
+
+    app = web.Application()
+    app.router.add_post("/api/webhooks/{id}/{token}", handler)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}/api/webhooks"
+
+
+async def send_with_new_session(url: str, content: str):
+    async with aiohttp.ClientSession() as session:
+        async with session.post(url, json={"content": content}) as response:
+            response.raise_for_status()
+
+
+async def measure(name: str, send, base_url: str) -> float:
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+
+    async def one(n: int):
+        # Spread messages over several webhooks, as a busy org would
+        async with semaphore:
+            await send(f"{base_url}/{n % WEBHOOKS}/token", f"message {n}")
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(n) for n in range(MESSAGES)))
+    elapsed = time.perf_counter() - start
+    rate = MESSAGES / elapsed
+    print(f"{name:<28} {rate:10.0f} messages/s")
+    return rate
+
+
+async def main():
+    runner, base_url = await start_stub_server()
+    try:
+        before = await measure(
+            "new session per message", send_with_new_session, base_url
+        )
+        after = await measure("shared pooled session", send_discord_webhook, base_url)
+        print(f"speedup: {after / before:.2f}x")
+    finally:
+        await http_sessions.close()
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
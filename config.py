@@ -21,19 +21,82 @@ def parse_admin_ids() -> List[int]:
     admin_ids = os.getenv('ADMIN_USER_IDS', '')
     return [int(id_) for id_ in admin_ids.split(',') if id_.strip().isdigit()]
 
+def parse_previous_webhook_secrets() -> List[str]:
+    """Parse previous GitHub webhook secrets from environment variable."""
+    secrets = os.getenv('GITHUB_WEBHOOK_PREVIOUS_SECRETS', '')
+    return [secret.strip() for secret in secrets.split(',') if secret.strip()]
+
+def parse_intents() -> List[str]:
+    """Parse gateway intent names from environment variable."""
+    intents = os.getenv('DISCORD_INTENTS', 'guilds')
+    return [name.strip() for name in intents.split(',') if name.strip()]
+
+def parse_flag(name: str, default: str = 'false') -> bool:
+    """Parse a boolean flag from environment variable."""
+    return os.getenv(name, default).strip().lower() in ('1', 'true', 'yes', 'on')
+
+def parse_web_workers() -> int:
+    """Parse the web worker count, defaulting to one per available CPU."""
+    workers = os.getenv('WEB_CONCURRENCY', '').strip()
+    if workers.isdigit() and int(workers) > 0:
+        return int(workers)
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
 @dataclass
 class Config:
     """Application configuration."""
     DISCORD_BOT_TOKEN: str = os.getenv('DISCORD_BOT_TOKEN', '')
     DISCORD_PUBLIC_KEY: str = os.getenv('DISCORD_PUBLIC_KEY', '')
+    DISCORD_PREVIOUS_PUBLIC_KEY: str = os.getenv('DISCORD_PREVIOUS_PUBLIC_KEY', '')
+    DISCORD_PREVIOUS_PUBLIC_KEY_EXPIRES_AT: float = float(os.getenv('DISCORD_PREVIOUS_PUBLIC_KEY_EXPIRES_AT', '0'))
+    DISCORD_TIMESTAMP_TOLERANCE: int = int(os.getenv('DISCORD_TIMESTAMP_TOLERANCE', '300'))
+    DISCORD_REPLAY_CACHE_SIZE: int = int(os.getenv('DISCORD_REPLAY_CACHE_SIZE', '10000'))
+    DISCORD_MODE: str = os.getenv('DISCORD_MODE', 'gateway')
+    DISCORD_INTENTS: List[str] = field(default_factory=parse_intents)
+    DISCORD_MAX_MESSAGES: int = int(os.getenv('DISCORD_MAX_MESSAGES', '0'))
+    DISCORD_MEMBER_CACHE: bool = parse_flag('DISCORD_MEMBER_CACHE')
+    DISCORD_CHUNK_GUILDS: bool = parse_flag('DISCORD_CHUNK_GUILDS')
     DISCORD_APPLICATION_ID: str = os.getenv('DISCORD_APPLICATION_ID', '')
     DISCORD_CLIENT_ID: str = os.getenv('DISCORD_CLIENT_ID', '')
     GITHUB_WEBHOOK_SECRET: str = os.getenv('GITHUB_WEBHOOK_SECRET', '')
+    GITHUB_WEBHOOK_PREVIOUS_SECRETS: List[str] = field(
+        default_factory=parse_previous_webhook_secrets
+    )
+    DISCORD_WEBHOOK_URL: str = os.getenv('DISCORD_WEBHOOK_URL', '')
+    GITHUB_COALESCE_WINDOW: float = float(os.getenv('GITHUB_COALESCE_WINDOW', '2.0'))
+    GITHUB_MAX_PAYLOAD_BYTES: int = int(
+        os.getenv('GITHUB_MAX_PAYLOAD_BYTES', str(25 * 1024 * 1024))
+    )
+    GITHUB_QUEUE_SIZE: int = int(os.getenv('GITHUB_QUEUE_SIZE', '1000'))
+    GITHUB_QUEUE_WORKERS: int = int(os.getenv('GITHUB_QUEUE_WORKERS', '4'))
+    GITHUB_DELIVERY_CONCURRENCY: int = int(os.getenv('GITHUB_DELIVERY_CONCURRENCY', '10'))
+    GITHUB_DELIVERY_RETRIES: int = int(os.getenv('GITHUB_DELIVERY_RETRIES', '2'))
+    GITHUB_SPOOL_PATH: str = os.getenv('GITHUB_SPOOL_PATH', 'data/github_spool.db')
+    GITHUB_SPOOL_MAX_ATTEMPTS: int = int(os.getenv('GITHUB_SPOOL_MAX_ATTEMPTS', '3'))
+    GITHUB_DEDUP_CACHE_SIZE: int = int(os.getenv('GITHUB_DEDUP_CACHE_SIZE', '10000'))
+    GITHUB_DEDUP_TTL: float = float(os.getenv('GITHUB_DEDUP_TTL', '86400'))
+    SHARED_STATE_PATH: str = os.getenv('SHARED_STATE_PATH', '')
+    COMMAND_SYNC_PATH: str = os.getenv('COMMAND_SYNC_PATH', 'data/command_sync.db')
+    COMMAND_SYNC_LEASE_TTL: float = float(os.getenv('COMMAND_SYNC_LEASE_TTL', '60'))
+    SUBSCRIPTIONS_PATH: str = os.getenv('SUBSCRIPTIONS_PATH', 'data/subscriptions.db')
+    SUBSCRIPTIONS_REFRESH_INTERVAL: float = float(os.getenv('SUBSCRIPTIONS_REFRESH_INTERVAL', '1'))
+    HTTP_POOL_SIZE: int = int(os.getenv('HTTP_POOL_SIZE', '100'))
+    HTTP_POOL_SIZE_PER_HOST: int = int(os.getenv('HTTP_POOL_SIZE_PER_HOST', '20'))
+    HTTP_KEEPALIVE_TIMEOUT: float = float(os.getenv('HTTP_KEEPALIVE_TIMEOUT', '30'))
     LOG_LEVEL: str = os.getenv('LOG_LEVEL', 'INFO')
+    LOG_FORMAT: str = os.getenv('LOG_FORMAT', 'json')
     PORT: int = int(os.getenv('PORT', '8000'))
+    WEB_CONCURRENCY: int = field(default_factory=parse_web_workers)
     ALLOWED_GUILD_IDS: List[int] = field(default_factory=parse_guild_ids)
     ADMIN_USER_IDS: List[int] = field(default_factory=parse_admin_ids)
 
+    @property
+    def http_only(self) -> bool:
+        """Return True when interactions are served without a gateway connection."""
+        return self.DISCORD_MODE.strip().lower() == 'http'
+
     def validate(self) -> None:
         """Validate all configuration variables."""
         missing_vars = []
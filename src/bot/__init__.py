@@ -1,7 +1,7 @@
-from .bot import FlexRPLBot, bot
+from .bot import FlexRPLBot
 from .commands import setup_commands
 from .events import setup_events
 
-__all__ = ["bot", "FlexRPLBot", "setup_commands", "setup_events"]
+__all__ = ["FlexRPLBot", "setup_commands", "setup_events"]
 
 VERSION = "1.0.0"
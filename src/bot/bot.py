@@ -1,18 +1,49 @@
 import logging
+from typing import Any, Dict, List
 
 import discord
 from discord.ext import commands
 
+from config import config
+
 logger = logging.getLogger(__name__)
 
 
+def build_intents(names: List[str]) -> discord.Intents:
+    """Enable only the named gateway intents."""
+    intents = discord.Intents.none()
+    for name in names:
+        if name not in discord.Intents.VALID_FLAGS:
+            raise ValueError(f"Unknown gateway intent: {name}")
+        setattr(intents, name, True)
+    return intents
+
+
+def cache_policy() -> Dict[str, Any]:
+    """Return client options for the configured intents and cache policy.
+
+    The bot only needs the guild list for slash commands and join/leave
+    logging, so by default no message or member cache is kept and guilds
+    are not chunked at startup.
+    """
+    intents = build_intents(config.DISCORD_INTENTS)
+    if config.DISCORD_MEMBER_CACHE:
+        member_cache_flags = discord.MemberCacheFlags.from_intents(intents)
+    else:
+        member_cache_flags = discord.MemberCacheFlags.none()
+    return {
+        "intents": intents,
+        "max_messages": config.DISCORD_MAX_MESSAGES or None,
+        "member_cache_flags": member_cache_flags,
+        "chunk_guilds_at_startup": config.DISCORD_CHUNK_GUILDS and intents.members,
+    }
+
+
 class FlexRPLBot(commands.Bot):
     """Custom bot class for FlexRPL."""
 
     def __init__(self):
-        intents = discord.Intents.default()
-        intents.message_content = True
-        super().__init__(command_prefix="!", intents=intents)
+        super().__init__(command_prefix="!", **cache_policy())
 
     async def setup_hook(self):
         """Set up bot hooks and sync commands."""
@@ -21,33 +52,32 @@ class FlexRPLBot(commands.Bot):
             # Import here to avoid circular imports
             from src.bot.commands import setup_commands
             from src.bot.events import setup_events
+            from src.utils.command_sync import command_sync, tree_payloads
 
             await setup_commands(self)
             await setup_events(self)
 
-            # Sync commands with Discord
-            await self.tree.sync()
+            # Sync commands with Discord only if the tree changed
+            await command_sync.sync_if_changed(tree_payloads(self.tree), self.tree.sync)
 
             # Log available commands
             commands = self.tree.get_commands()
-            logger.info("Available commands after sync:")
+            logger.info("Available commands:")
             for cmd in commands:
-                logger.info(f"- /{cmd.name}: {cmd.description}")
-
-            logger.info("Bot commands synced successfully")
+                logger.info("- /%s: %s", cmd.name, cmd.description)
 
         except Exception as e:
-            logger.error(f"Error in setup hook: {e}")
+            logger.error("Error in setup hook: %s", e)
             raise
 
     async def on_ready(self):
         """Handle bot ready event."""
-        logger.info(f"Logged in as {self.user} (ID: {self.user.id})")
+        logger.info("Logged in as %s (ID: %s)", self.user, self.user.id)
         logger.info("------")
         logger.info("Registered commands:")
         commands = self.tree.get_commands()
         for cmd in commands:
-            logger.info(f"- /{cmd.name}: {cmd.description}")
+            logger.info("- /%s: %s", cmd.name, cmd.description)
 
     async def on_app_command_error(
         self, interaction: discord.Interaction, error: Exception
@@ -77,8 +107,4 @@ class FlexRPLBot(commands.Bot):
                     "An error occurred while processing your command", ephemeral=True
                 )
             except Exception as e:
-                logger.error(f"Error sending error message: {e}")
-
-
-# Create bot instance
-bot = FlexRPLBot()
+                logger.error("Error sending error message: %s", e)
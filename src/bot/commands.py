@@ -1,64 +1,125 @@
+import inspect
 import logging
+from typing import Optional
 
 import discord
+from discord import app_commands
+
+from src.handlers.interactions import EPHEMERAL, RESPONSE_TYPES
+from src.handlers.interactions import registry as interactions
+from src.utils.dispatch import APPLICATION_COMMAND
 
 logger = logging.getLogger(__name__)
 
 
-async def setup_commands(bot_instance):
-    """Set up bot commands."""
-    try:
-        logger.info("Setting up commands...")
+def interaction_payload(interaction: discord.Interaction, name: str) -> dict:
+    """Build the raw interaction dict the registry dispatches on."""
+    data = getattr(interaction, "data", None)
+    if not isinstance(data, dict):
+        data = {"name": name}
+    payload = {"type": APPLICATION_COMMAND, "data": data}
+    for key in ("channel_id", "guild_id"):
+        value = getattr(interaction, key, None)
+        if isinstance(value, (int, str)):
+            payload[key] = str(value)
+    # The invoker's resolved channel permissions, as in a raw interaction
+    member = {}
+    user_id = getattr(getattr(interaction, "user", None), "id", None)
+    if isinstance(user_id, int):
+        member["user"] = {"id": str(user_id)}
+    permissions = getattr(getattr(interaction, "permissions", None), "value", None)
+    if isinstance(permissions, int):
+        member["permissions"] = str(permissions)
+    if member:
+        payload["member"] = member
+    return payload
 
-        @bot_instance.tree.command(name="ping", description="Check bot latency")
-        async def ping_command(interaction: discord.Interaction):
-            """Check bot latency."""
-            try:
-                latency = round(bot_instance.latency * 1000)
-                await interaction.response.send_message(
-                    f"Pong! 🏓 (Latency: {latency}ms)", ephemeral=True
-                )
-            except Exception as e:
-                logger.error(f"Error in ping command: {e}")
-                await interaction.response.send_message(
-                    "Pong! 🏓 (Latency unavailable)", ephemeral=True
-                )
 
-        @bot_instance.tree.command(name="help", description="Show available commands")
-        async def help_command(interaction: discord.Interaction):
-            """Show available commands."""
-            try:
-                commands = bot_instance.tree.get_commands()
-                commands_list = [
-                    f"`/{cmd.name}` - {cmd.description}" for cmd in commands
-                ]
-                await interaction.response.send_message(
-                    "**Available Commands:**\n" + "\n".join(commands_list),
-                    ephemeral=True,
-                )
-            except Exception as e:
-                logger.error(f"Error in help command: {e}")
-                await interaction.response.send_message(
-                    "❌ Error retrieving commands.", ephemeral=True
-                )
+async def send_response(interaction: discord.Interaction, response_data: dict):
+    """Send a registry response through the gateway interaction."""
+    response_type = response_data.get("type")
+    data = response_data.get("data", {})
+    ephemeral = bool(data.get("flags", 0) & EPHEMERAL)
 
-        @bot_instance.tree.command(
-            name="githubsub", description="Subscribe to GitHub notifications"
+    if response_type == RESPONSE_TYPES["DEFERRED_CHANNEL_MESSAGE"]:
+        await interaction.response.defer(ephemeral=ephemeral)
+    elif response_type == RESPONSE_TYPES["CHANNEL_MESSAGE"]:
+        await interaction.response.send_message(
+            data.get("content", ""), ephemeral=ephemeral
         )
-        async def githubsub_command(interaction: discord.Interaction):
-            """Subscribe to GitHub notifications."""
-            try:
+    else:
+        logger.warning("Unsupported gateway response type: %s", response_type)
+
+
+def make_command_callback(bot_instance, name: str):
+    """Create a CommandTree callback that dispatches through the registry."""
+
+    async def command_callback(interaction: discord.Interaction, **options):
+        try:
+            response_data = interactions.dispatch(
+                interaction_payload(interaction, name), bot_instance
+            )
+            if inspect.isawaitable(response_data):
                 await interaction.response.defer(ephemeral=True)
-                # Deferred response will be handled by webhook
-            except Exception as e:
-                logger.error(f"Error in githubsub command: {e}")
-                await interaction.response.send_message(
-                    "❌ Error processing subscription.", ephemeral=True
+                data = (await response_data).get("data", {})
+                await interaction.followup.send(
+                    data.get("content", ""),
+                    ephemeral=bool(data.get("flags", 0) & EPHEMERAL),
                 )
+                return
+            await send_response(interaction, response_data)
+        except Exception as e:
+            logger.error("Error in %s command: %s", name, e)
+            await interaction.response.send_message(
+                "❌ Error processing command.", ephemeral=True
+            )
+
+    command_callback.__name__ = f"{name}_command"
+
+    # Expose registry options as parameters so the CommandTree declares them;
+    # their values are read back from the raw interaction data
+    options = interactions.command_options(name)
+    parameters = [
+        inspect.Parameter(
+            "interaction",
+            inspect.Parameter.POSITIONAL_OR_KEYWORD,
+            annotation=discord.Interaction,
+        )
+    ]
+    for option in options:
+        parameters.append(
+            inspect.Parameter(
+                option.name,
+                inspect.Parameter.KEYWORD_ONLY,
+                annotation=str if option.required else Optional[str],
+                default=inspect.Parameter.empty if option.required else None,
+            )
+        )
+    command_callback.__signature__ = inspect.Signature(parameters)
+    if options:
+        app_commands.describe(
+            **{option.name: option.description for option in options}
+        )(command_callback)
+    return command_callback
+
+
+async def setup_commands(bot_instance):
+    """Set up bot commands."""
+    try:
+        logger.info("Setting up commands...")
+
+        for name, description in interactions.commands():
+            callback = make_command_callback(bot_instance, name)
+            permissions = interactions.command_permissions(name)
+            if permissions is not None:
+                callback = app_commands.default_permissions(
+                    discord.Permissions(permissions)
+                )(callback)
+            bot_instance.tree.command(name=name, description=description)(callback)
 
         logger.info("Commands setup complete")
         return True
 
     except Exception as e:
-        logger.error(f"Error setting up commands: {e}")
+        logger.error("Error setting up commands: %s", e)
         raise
@@ -11,17 +11,19 @@ async def setup_events(bot: commands.Bot):
 
     @bot.event
     async def on_guild_join(guild: discord.Guild):
-        logger.info(f"Bot has been added to guild: {guild.name} (ID: {guild.id})")
+        logger.info("Bot has been added to guild: %s (ID: %s)", guild.name, guild.id)
 
     @bot.event
     async def on_guild_remove(guild: discord.Guild):
-        logger.info(f"Bot has been removed from guild: {guild.name} (ID: {guild.id})")
+        logger.info(
+            "Bot has been removed from guild: %s (ID: %s)", guild.name, guild.id
+        )
 
     @bot.event
     async def on_command_error(ctx, error):
         if isinstance(error, commands.CommandNotFound):
             return
-        logger.error(f"Command error: {error}")
+        logger.error("Command error: %s", error)
         await ctx.send(f"An error occurred: {str(error)}")
 
     # Return True to prevent NoneType error
@@ -0,0 +1,80 @@
+import logging
+from typing import TYPE_CHECKING, Callable, Optional
+
+from src.utils.http import HTTPSessionManager, http_sessions
+
+if TYPE_CHECKING:
+    from fastapi import FastAPI
+
+    from src.bot.bot import FlexRPLBot
+
+logger = logging.getLogger(__name__)
+
+
+def default_bot_factory() -> "FlexRPLBot":
+    """Create the Discord bot."""
+    from src.bot.bot import FlexRPLBot
+
+    return FlexRPLBot()
+
+
+def default_app_factory() -> "FastAPI":
+    """Return the FastAPI application."""
+    from app import app
+
+    return app
+
+
+class AppContainer:
+    """Own the process-wide bot, web app and outbound HTTP session.
+
+    Each is created on first access and then shared, so every module that
+    needs the bot talks to the same, connected client instead of building
+    its own.
+    """
+
+    def __init__(
+        self,
+        bot_factory: Callable[[], "FlexRPLBot"] = default_bot_factory,
+        app_factory: Callable[[], "FastAPI"] = default_app_factory,
+        sessions: HTTPSessionManager = http_sessions,
+    ):
+        self._bot_factory = bot_factory
+        self._app_factory = app_factory
+        self.sessions = sessions
+        self._bot: Optional["FlexRPLBot"] = None
+        self._app: Optional["FastAPI"] = None
+
+    @property
+    def bot(self) -> "FlexRPLBot":
+        """Return the Discord bot, creating it on first use."""
+        if self._bot is None:
+            self._bot = self._bot_factory()
+            logger.info("Created Discord bot")
+        return self._bot
+
+    @property
+    def existing_bot(self) -> Optional["FlexRPLBot"]:
+        """Return the bot if it has been created, without creating it."""
+        return self._bot
+
+    @property
+    def app(self) -> "FastAPI":
+        """Return the FastAPI application, creating it on first use."""
+        if self._app is None:
+            self._app = self._app_factory()
+        return self._app
+
+    async def close(self) -> None:
+        """Close the bot connection and the outbound HTTP session."""
+        if self._bot is not None and not self._bot.is_closed():
+            await self._bot.close()
+        await self.sessions.close()
+
+    def reset(self) -> None:
+        """Forget the created bot and app."""
+        self._bot = None
+        self._app = None
+
+
+container = AppContainer()
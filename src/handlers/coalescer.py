@@ -0,0 +1,169 @@
+import asyncio
+import logging
+from typing import Callable, Dict, List, Optional, Sequence, Set, Tuple, Union
+
+from src.handlers.delivery import FanOutDelivery, SendFunc
+
+logger = logging.getLogger(__name__)
+
+# Discord's limit for the content of a single message
+MAX_MESSAGE_LENGTH = 2000
+
+DeliveredCallback = Callable[[], object]
+PendingBatch = Tuple[List[str], Tuple[str, ...], Optional[DeliveredCallback]]
+
+
+def pack_lines(header: str, lines: List[str], limit: int = MAX_MESSAGE_LENGTH):
+    """Pack lines into as few messages as fit under ``limit`` characters.
+
+    Every message starts with ``header``; a single line too long to fit is
+    truncated rather than split across messages.
+    """
+    messages = []
+    current = header
+    for line in lines:
+        if len(header) + 1 + len(line) > limit:
+            line = line[: limit - len(header) - 2] + "…"
+        if len(current) + 1 + len(line) > limit:
+            messages.append(current)
+            current = header
+        current = f"{current}\n{line}"
+    if current != header:
+        messages.append(current)
+    return messages
+
+
+class EventCoalescer:
+    """Batch formatted GitHub events per repository and fan them out.
+
+    Lines added for the same repository within ``window`` seconds are sent
+    together, so a burst of pushes becomes a handful of Discord messages
+    instead of one per event. Targets that end up with the same lines share
+    one rendering, which is delivered to all of them concurrently.
+    ``on_delivered`` callbacks run once per target that received every
+    message of its batch, or that rejected one with an error retrying
+    cannot fix, so a deleted channel does not hold its event back forever.
+    """
+
+    def __init__(
+        self,
+        send: SendFunc,
+        window: float = 2.0,
+        limit: int = MAX_MESSAGE_LENGTH,
+        concurrency: int = 10,
+        max_retries: int = 0,
+    ):
+        self.send = send
+        self.window = window
+        self.limit = limit
+        self.delivery = FanOutDelivery(
+            send, concurrency=concurrency, max_retries=max_retries
+        )
+        self._pending: Dict[str, List[PendingBatch]] = {}
+        self._timers: Dict[str, asyncio.Task] = {}
+        self.events = 0
+        self.messages_sent = 0
+        self.failures = 0
+
+    @property
+    def pending(self) -> int:
+        """Return the number of lines waiting to be sent, per target."""
+        return sum(
+            len(lines) * len(targets)
+            for batches in self._pending.values()
+            for lines, targets, _ in batches
+        )
+
+    def add(
+        self,
+        repo: str,
+        targets: Union[str, Sequence[str]],
+        lines: List[str],
+        on_delivered: Optional[DeliveredCallback] = None,
+    ) -> None:
+        """Queue lines for ``targets``, flushing after the coalescing window."""
+        if isinstance(targets, str):
+            targets = (targets,)
+        self._pending.setdefault(repo, []).append(
+            (list(lines), tuple(targets), on_delivered)
+        )
+        self.events += 1
+        if repo not in self._timers:
+            self._timers[repo] = asyncio.create_task(self._flush_later(repo))
+
+    async def _flush_later(self, repo: str) -> None:
+        await asyncio.sleep(self.window)
+        self._timers.pop(repo, None)
+        await self.flush(repo)
+
+    async def flush(self, repo: str) -> None:
+        """Send everything pending for ``repo`` now."""
+        batches = self._pending.pop(repo, [])
+        per_target: Dict[str, List[str]] = {}
+        for lines, targets, _ in batches:
+            for target in targets:
+                per_target.setdefault(target, []).extend(lines)
+
+        # Render once for every group of targets that receive the same lines
+        groups: Dict[Tuple[str, ...], List[str]] = {}
+        for target, lines in per_target.items():
+            groups.setdefault(tuple(lines), []).append(target)
+
+        failed: Set[str] = set()
+        await asyncio.gather(
+            *(
+                self._send_group(repo, list(lines), targets, failed)
+                for lines, targets in groups.items()
+                if lines
+            )
+        )
+
+        for _, targets, callback in batches:
+            if callback is None:
+                continue
+            for target in targets:
+                if target not in failed:
+                    callback()
+
+    async def _send_group(
+        self, repo: str, lines: List[str], targets: List[str], failed: Set[str]
+    ) -> None:
+        for message in pack_lines(f"**{repo}**", lines, self.limit):
+            rejected: Set[str] = set()
+            results = await self.delivery.deliver(targets, message, rejected)
+            targets = []
+            for target, delivered in results.items():
+                if delivered:
+                    self.messages_sent += 1
+                    targets.append(target)
+                else:
+                    self.failures += 1
+                    if target not in rejected:
+                        failed.add(target)
+            if not targets:
+                logger.error("Failed to send coalesced message for %s", repo)
+                return
+            if len(targets) < len(results):
+                logger.error(
+                    "Failed to send coalesced message for %s to %s target(s)",
+                    repo,
+                    len(results) - len(targets),
+                )
+
+    async def flush_all(self) -> None:
+        """Cancel pending timers and send everything immediately."""
+        timers, self._timers = self._timers, {}
+        for timer in timers.values():
+            timer.cancel()
+        await asyncio.gather(*timers.values(), return_exceptions=True)
+        await asyncio.gather(*(self.flush(repo) for repo in list(self._pending)))
+
+    def stats(self) -> dict:
+        """Return coalescing and delivery counters."""
+        return {
+            "events": self.events,
+            "messages_sent": self.messages_sent,
+            "failures": self.failures,
+            "pending_lines": self.pending,
+            "delivery": self.delivery.stats(),
+        }
@@ -0,0 +1,100 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Optional, Sequence, Set
+
+logger = logging.getLogger(__name__)
+
+SendFunc = Callable[[str, str], Awaitable[object]]
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Return False for client errors that will fail again on retry."""
+    from aiohttp import ClientResponseError
+
+    cause = error.__cause__ or error
+    if isinstance(cause, ClientResponseError):
+        return cause.status >= 500 or cause.status == 429
+    return True
+
+
+class FanOutDelivery:
+    """Send one rendered message to many targets concurrently.
+
+    At most ``concurrency`` sends are in flight at once. Each target is
+    retried independently with exponential backoff, so a slow or failing
+    channel never holds up delivery to the others.
+    """
+
+    def __init__(
+        self,
+        send: SendFunc,
+        concurrency: int = 10,
+        max_retries: int = 0,
+        retry_delay: float = 0.5,
+        sleep: Callable[[float], Awaitable[Any]] = asyncio.sleep,
+    ):
+        self.send = send
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self._sleep = sleep
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.sent = 0
+        self.retries = 0
+        self.failed = 0
+
+    async def deliver(
+        self,
+        targets: Sequence[str],
+        content: str,
+        rejected: Optional[Set[str]] = None,
+    ) -> Dict[str, bool]:
+        """Send ``content`` to every target and return per-target success.
+
+        Targets that failed with an error retrying cannot fix, such as a
+        deleted channel, are also added to ``rejected``.
+        """
+        results = await asyncio.gather(
+            *(self._deliver_one(target, content, rejected) for target in targets)
+        )
+        return dict(zip(targets, results))
+
+    async def _deliver_one(
+        self, target: str, content: str, rejected: Optional[Set[str]]
+    ) -> bool:
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                self.retries += 1
+                await self._sleep(self.retry_delay * 2 ** (attempt - 1))
+            async with self._semaphore:
+                self.in_flight += 1
+                self.max_in_flight = max(self.max_in_flight, self.in_flight)
+                try:
+                    await self.send(target, content)
+                    self.sent += 1
+                    return True
+                except Exception as e:
+                    error = e
+                finally:
+                    self.in_flight -= 1
+            if not is_retryable(error):
+                if rejected is not None:
+                    rejected.add(target)
+                break
+        self.failed += 1
+        logger.error(
+            "Giving up on delivery after %s attempt(s): %s", attempt + 1, error
+        )
+        return False
+
+    def stats(self) -> dict:
+        """Return delivery counters."""
+        return {
+            "concurrency": self.concurrency,
+            "sent": self.sent,
+            "retries": self.retries,
+            "failed": self.failed,
+            "max_in_flight": self.max_in_flight,
+        }
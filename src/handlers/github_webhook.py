@@ -1,68 +1,335 @@
-import hashlib
-import hmac
+import asyncio
 import logging
+import os
+import time
+from typing import Callable, List, Optional
 
-import aiohttp
-from discord import AsyncWebhookAdapter, Webhook
-from fastapi import APIRouter, Depends, HTTPException, Request
-from fastapi.security import HTTPBearer
+from fastapi import APIRouter, HTTPException, Request
 
 from config import config
-from src.utils.formatting import format_github_event
+from src.handlers.coalescer import EventCoalescer
+from src.handlers.webhook_queue import QueuedEvent, WebhookQueue
+from src.utils.dedup import DeliveryDeduplicator
+from src.utils.discord_api import bot_headers, channel_messages_url, needs_bot_auth
+from src.utils.formatting import format_event_lines
+from src.utils.log import request_id
+from src.utils.metrics import (
+    github_delivery_seconds,
+    github_events,
+    github_parse_seconds,
+    github_verify_seconds,
+)
+from src.utils.ratelimit import rate_limiter
+from src.utils.responses import decode_json
+from src.utils.shared_state import shared_state
+from src.utils.spool import EventSpool
+from src.utils.subscriptions import event_branch, get_subscriptions
+from src.utils.verification import GitHubSignatureVerifier
 
 router = APIRouter()
-security = HTTPBearer()
 
 logger = logging.getLogger(__name__)
 
+# Most of the body buffer is reserved up front from Content-Length, but the
+# header is unauthenticated, so larger declared sizes grow as chunks arrive
+MAX_PREALLOCATED_BYTES = 1024 * 1024
 
-async def verify_signature(request: Request):
-    """Verify GitHub webhook signature."""
-    signature = request.headers.get("X-Hub-Signature-256")
-    if not signature:
+
+def payload_too_large() -> HTTPException:
+    """Build the error raised for webhook bodies over the size cap."""
+    return HTTPException(status_code=413, detail="Payload too large")
+
+
+github_verifier = GitHubSignatureVerifier(
+    [config.GITHUB_WEBHOOK_SECRET, *config.GITHUB_WEBHOOK_PREVIOUS_SECRETS]
+)
+
+
+def get_github_verifier() -> GitHubSignatureVerifier:
+    """Get the cached GitHub webhook signature verifier."""
+    return github_verifier
+
+
+async def verify_signature(request: Request) -> bytearray:
+    """Verify GitHub webhook signature while reading the body.
+
+    The HMAC is fed chunk by chunk from the request stream into a single
+    buffer, preallocated from Content-Length when available. The buffer is
+    returned so the payload is parsed from it without reading it again.
+    """
+    verifier = get_github_verifier()
+    signed = verifier.signature_from_headers(request.headers)
+    if not signed:
         raise HTTPException(status_code=400, detail="No signature header")
+    algorithm, signature = signed
 
-    body = await request.body()
-    hmac_gen = hmac.new(config.GITHUB_WEBHOOK_SECRET.encode(), body, hashlib.sha256)
-    expected_signature = f"sha256={hmac_gen.hexdigest()}"
+    max_size = config.GITHUB_MAX_PAYLOAD_BYTES
+    try:
+        declared = int(request.headers.get("Content-Length", ""))
+    except ValueError:
+        declared = None
+    if declared is not None and declared > max_size:
+        raise payload_too_large()
+
+    check = verifier.start(algorithm)
+    body = bytearray(min(declared or 0, MAX_PREALLOCATED_BYTES))
+    view = memoryview(body)
+    size = 0
+    async for chunk in request.stream():
+        end = size + len(chunk)
+        if end > max_size:
+            raise payload_too_large()
+        check.update(chunk)
+        if end <= len(body):
+            view[size:end] = chunk
+        else:
+            view.release()
+            del body[size:]
+            body += chunk
+            view = memoryview(body)
+        size = end
+    view.release()
+    del body[size:]
 
-    if not hmac.compare_digest(signature, expected_signature):
+    if not check.matches(signature):
         raise HTTPException(status_code=401, detail="Invalid signature")
+    return body
+
+
+# GitHub text such as commit messages is untrusted, so it never pings anyone
+NO_MENTIONS = {"parse": []}
 
 
 async def send_discord_webhook(webhook_url: str, content: str):
-    """Send a message to Discord via webhook."""
+    """Send a message to Discord via webhook or channel messages endpoint."""
+    headers = bot_headers() if needs_bot_auth(webhook_url) else None
+    payload = {"content": content, "allowed_mentions": NO_MENTIONS}
     try:
-        async with aiohttp.ClientSession() as session:
-            webhook = Webhook.from_url(
-                webhook_url, adapter=AsyncWebhookAdapter(session)
-            )
-            await webhook.send(content=content)
-            logger.info("Successfully sent webhook message to Discord")
+        await rate_limiter.send(webhook_url, payload, headers=headers)
+        logger.debug("Sent message to Discord")
+    except Exception as e:
+        logger.error("Error sending webhook to Discord: %s", e)
+        raise HTTPException(
+            status_code=500, detail="Failed to send webhook to Discord"
+        ) from e
+
+
+coalescer = EventCoalescer(
+    send_discord_webhook,
+    window=config.GITHUB_COALESCE_WINDOW,
+    concurrency=config.GITHUB_DELIVERY_CONCURRENCY,
+    max_retries=config.GITHUB_DELIVERY_RETRIES,
+)
+
+
+event_spool = EventSpool(
+    config.GITHUB_SPOOL_PATH, max_attempts=config.GITHUB_SPOOL_MAX_ATTEMPTS
+)
+
+
+def event_targets(event: QueuedEvent, repo: str) -> List[str]:
+    """Return the URLs a GitHub event should be posted to."""
+    branch = event_branch(event.event_type, event.payload)
+    targets = [
+        channel_messages_url(subscription.channel_id)
+        for subscription in get_subscriptions().match(repo, event.event_type, branch)
+    ]
+    if config.DISCORD_WEBHOOK_URL:
+        targets.append(config.DISCORD_WEBHOOK_URL)
+    return list(dict.fromkeys(targets))
+
+
+def ack_when_delivered(
+    count: int, spool_id: Optional[int], event: Optional[QueuedEvent] = None
+) -> Callable[[], None]:
+    """Return a callback that acks the spooled event after ``count`` calls.
+
+    When ``event`` is given, its ingest-to-delivery latency is recorded once
+    every target has received it.
+    """
+    remaining = count
+
+    def delivered():
+        nonlocal remaining
+        remaining -= 1
+        if remaining == 0:
+            event_spool.ack(spool_id)
+            if event is not None:
+                github_delivery_seconds.observe(
+                    time.monotonic() - event.enqueued_at, event.event_type or ""
+                )
+
+    return delivered
+
+
+async def process_queued_event(event: QueuedEvent):
+    """Process a GitHub event taken off the ingestion queue."""
+    repo = (event.payload.get("repository") or {}).get("full_name", "unknown")
+    targets = event_targets(event, repo)
+    if not targets:
+        logger.info("No subscriptions for %s on %s, dropping", event.event_type, repo)
+        event_spool.ack(event.spool_id)
+        return
+
+    lines = format_event_lines(event.event_type, event.payload)
+    on_delivered = ack_when_delivered(len(targets), event.spool_id, event)
+    coalescer.add(repo, targets, lines, on_delivered=on_delivered)
+    logger.debug(
+        "Queued %s line(s) from %s for %s to %s target(s)",
+        len(lines),
+        event.event_type,
+        repo,
+        len(targets),
+    )
+
+
+def dead_letter_event(event: QueuedEvent, error: Exception) -> None:
+    """Move an event that failed processing out of the spool's replay set."""
+    event_spool.dead_letter(event.spool_id, f"{type(error).__name__}: {error}")
+
+
+webhook_queue = WebhookQueue(
+    process_queued_event,
+    maxsize=config.GITHUB_QUEUE_SIZE,
+    workers=config.GITHUB_QUEUE_WORKERS,
+    on_error=dead_letter_event,
+)
+
+
+delivery_dedup = DeliveryDeduplicator(
+    maxsize=config.GITHUB_DEDUP_CACHE_SIZE,
+    ttl=config.GITHUB_DEDUP_TTL,
+    shared=shared_state,
+)
+
+
+# Set by ``src.main.serve`` so every web worker agrees on when the server started
+SERVER_STARTED_AT_ENV = "SERVER_STARTED_AT"
+
+SPOOL_NAMESPACE = "github_spool"
+
+
+async def claim_replay(started_at: float) -> bool:
+    """Return True if this worker should replay the spool for this start.
+
+    Workers share the spool file, so only the first of them to start replays
+    what the previous run left behind.
+    """
+    if shared_state is None:
+        return True
+    try:
+        return await shared_state.add(
+            SPOOL_NAMESPACE, f"replay:{started_at!r}", config.GITHUB_DEDUP_TTL
+        )
     except Exception as e:
-        logger.error(f"Error sending webhook to Discord: {e}")
-        raise HTTPException(status_code=500, detail="Failed to send webhook to Discord")
+        logger.warning("Shared replay claim failed, replaying anyway: %s", e)
+        return True
 
 
-async def handle_github_webhook(event_type: str, payload: dict):
-    """Handle incoming GitHub webhook events."""
+async def replay_spooled_events(started_at: Optional[float] = None):
+    """Queue events that were accepted before a restart but not delivered.
+
+    Only events received before ``started_at`` are replayed; later ones
+    belong to sibling workers that are still delivering them.
+    """
+    if started_at is None:
+        started_at = time.time()
+    if not await claim_replay(started_at):
+        logger.info("Spool replay for this start is handled by another worker")
+        return
+    for spooled in await event_spool.replay(before=started_at):
+        try:
+            payload = decode_json(spooled.body)
+        except ValueError:
+            logger.error("Discarding unreadable spooled event %s", spooled.spool_id)
+            event_spool.ack(spooled.spool_id)
+            continue
+        await webhook_queue.put(
+            QueuedEvent(
+                event_type=spooled.event_type,
+                payload=payload,
+                delivery_id=spooled.delivery_id,
+                spool_id=spooled.spool_id,
+            )
+        )
+
+
+async def resume_ingestion(started_at: float):
+    """Load subscriptions and replay undelivered events."""
     try:
-        # TODO: Implement webhook URL configuration and sending
-        logger.info(f"Processed GitHub webhook event: {event_type}")
-        return format_github_event(event_type, payload)
+        await asyncio.to_thread(get_subscriptions().load)
+        await replay_spooled_events(started_at)
     except Exception as e:
-        logger.error(f"Error processing GitHub webhook: {e}")
-        raise HTTPException(status_code=500, detail="Failed to process GitHub webhook")
+        logger.error("Failed to resume GitHub ingestion: %s", e, exc_info=True)
+
+
+# Started by start_ingestion; held so it is not garbage collected
+resume_task: Optional[asyncio.Task] = None
+
+
+async def start_ingestion():
+    """Open the spool and start the workers.
+
+    Loading subscriptions and replaying the spool run in the background, so
+    the server answers its first request without waiting for them.
+    """
+    global resume_task
+    started_at = float(os.environ.get(SERVER_STARTED_AT_ENV) or time.time())
+    await event_spool.open()
+    await webhook_queue.start()
+    resume_task = asyncio.create_task(
+        resume_ingestion(started_at), name="resume-ingestion"
+    )
+
 
+async def stop_ingestion():
+    """Stop resuming ingestion if it is still running."""
+    if resume_task is not None and not resume_task.done():
+        resume_task.cancel()
+        await asyncio.gather(resume_task, return_exceptions=True)
 
-@router.post("/github")
-async def github_webhook(request: Request, _: HTTPBearer = Depends(security)):
-    """Handle GitHub webhook events."""
-    await verify_signature(request)
+
+@router.post("/github", status_code=202)
+async def github_webhook(request: Request):
+    """Verify a GitHub webhook and queue it for processing."""
+    delivery_id = request.headers.get("X-GitHub-Delivery")
+    request_id.set(delivery_id or "-")
+    verify_started = time.perf_counter()
+    body = await verify_signature(request)
+    github_verify_seconds.observe(time.perf_counter() - verify_started)
     event_type = request.headers.get("X-GitHub-Event")
-    payload = await request.json()
+    if not await delivery_dedup.check(delivery_id):
+        logger.info("Ignoring duplicate GitHub delivery %s", delivery_id)
+        return {"status": "duplicate"}
+
+    parse_started = time.perf_counter()
+    try:
+        payload = decode_json(body)
+    except ValueError:
+        payload = None
+    if not isinstance(payload, dict):
+        await delivery_dedup.forget(delivery_id)
+        raise HTTPException(status_code=400, detail="Invalid JSON payload")
+    github_parse_seconds.observe(time.perf_counter() - parse_started)
+
+    try:
+        spool_id = await event_spool.append(event_type or "", body, delivery_id)
+    except Exception as e:
+        logger.error("Failed to spool %s event: %s", event_type, e)
+        await delivery_dedup.forget(delivery_id)
+        raise HTTPException(status_code=503, detail="Failed to store webhook")
+
+    event = QueuedEvent(
+        event_type=event_type,
+        payload=payload,
+        delivery_id=delivery_id,
+        spool_id=spool_id,
+    )
 
-    await handle_github_webhook(event_type, payload)
-    # TODO: Send formatted message to Discord channel
+    if not webhook_queue.submit(event):
+        event_spool.ack(spool_id)
+        await delivery_dedup.forget(delivery_id)
+        raise HTTPException(status_code=503, detail="Webhook queue is full")
 
-    return {"status": "success"}
+    github_events.inc(event_type or "")
+    return {"status": "accepted"}
@@ -0,0 +1,208 @@
+import asyncio
+import logging
+import math
+import re
+from typing import Any, Dict, Optional
+
+from config import config
+from src.utils.dispatch import PING, CommandOption, InteractionRegistry, option_values
+from src.utils.responses import StaticResponse
+from src.utils.subscriptions import Subscription, get_subscriptions, parse_filter
+
+logger = logging.getLogger(__name__)
+
+RESPONSE_TYPES = {
+    "PONG": 1,
+    "CHANNEL_MESSAGE": 4,
+    "DEFERRED_CHANNEL_MESSAGE": 5,
+    "DEFERRED_UPDATE_MESSAGE": 6,
+    "UPDATE_MESSAGE": 7,
+    "APPLICATION_COMMAND_AUTOCOMPLETE_RESULT": 8,
+    "MODAL": 9,
+    "PREMIUM_REQUIRED": 10,
+}
+
+EPHEMERAL = 64
+
+REPOSITORY_PATTERN = re.compile(r"^[\w.-]+/[\w.-]+$")
+
+# Discord permission bits allowed to change a channel's subscriptions
+ADMINISTRATOR = 1 << 3
+MANAGE_CHANNELS = 1 << 4
+
+registry = InteractionRegistry()
+
+# Immutable replies, rendered to bytes by build_static_responses()
+static_responses: Dict[str, StaticResponse] = {}
+
+
+def ephemeral_message(content: str) -> Dict[str, Any]:
+    """Build an ephemeral channel message response."""
+    return {
+        "type": RESPONSE_TYPES["CHANNEL_MESSAGE"],
+        "data": {"content": content, "flags": EPHEMERAL},
+    }
+
+
+@registry.on(PING)
+def handle_ping(interaction: Dict[str, Any], client: Any) -> Dict[str, Any]:
+    """Answer Discord's PING with a PONG."""
+    return static_responses["pong"]
+
+
+@registry.command("ping", description="Check bot latency")
+def ping_command(interaction: Dict[str, Any], client: Any) -> Dict[str, Any]:
+    """Check bot latency."""
+    try:
+        latency = client.latency
+        latency_ms = 0 if math.isnan(latency) else round(latency * 1000)
+        message = f"Pong! 🏓 (Latency: {latency_ms}ms)"
+    except (AttributeError, ValueError, TypeError):
+        message = "Pong! 🏓 (Latency unavailable)"
+    return ephemeral_message(message)
+
+
+@registry.command("help", description="Show available commands")
+def help_command(interaction: Dict[str, Any], client: Any) -> Dict[str, Any]:
+    """Show available commands."""
+    return static_responses["help"]
+
+
+def interaction_channel(interaction: Dict[str, Any]) -> Optional[str]:
+    """Return the ID of the channel an interaction was sent from."""
+    channel_id = interaction.get("channel_id") or (
+        interaction.get("channel") or {}
+    ).get("id")
+    return str(channel_id) if channel_id else None
+
+
+def can_manage_subscriptions(interaction: Dict[str, Any]) -> bool:
+    """Return whether the invoking user may change channel subscriptions.
+
+    Members need Manage Channels (or Administrator) in the channel, as
+    resolved by Discord in ``member.permissions``; ``ADMIN_USER_IDS`` are
+    always allowed.
+    """
+    member = interaction.get("member") or {}
+    user = member.get("user") or interaction.get("user") or {}
+    if str(user.get("id")) in {str(id_) for id_ in config.ADMIN_USER_IDS}:
+        return True
+    try:
+        permissions = int(member.get("permissions") or 0)
+    except (TypeError, ValueError):
+        return False
+    return bool(permissions & (ADMINISTRATOR | MANAGE_CHANNELS))
+
+
+@registry.command(
+    "githubsub",
+    description="Subscribe to GitHub notifications",
+    options=(
+        CommandOption("repository", "Repository as owner/name"),
+        CommandOption(
+            "events", "Comma-separated event types, e.g. push,release", False
+        ),
+        CommandOption("branches", "Comma-separated branches to include", False),
+    ),
+    default_member_permissions=MANAGE_CHANNELS,
+)
+def githubsub_command(interaction: Dict[str, Any], client: Any) -> Any:
+    """Subscribe to GitHub notifications.
+
+    Bad input is answered at once; the write runs in a thread behind a
+    deferred response so SQLite stays off the event loop.
+    """
+    values = option_values(interaction)
+    repository = (values.get("repository") or "").strip()
+    channel_id = interaction_channel(interaction)
+    if not channel_id:
+        return static_responses["channel_required"]
+    if not can_manage_subscriptions(interaction):
+        return static_responses["permission_required"]
+    if not REPOSITORY_PATTERN.match(repository):
+        return ephemeral_message(f"❌ `{repository}` is not an owner/name repository.")
+
+    return store_subscription(
+        Subscription(
+            channel_id=channel_id,
+            repository=repository,
+            guild_id=interaction.get("guild_id"),
+            events=parse_filter(values.get("events")),
+            branches=parse_filter(values.get("branches")),
+        )
+    )
+
+
+async def store_subscription(subscription: Subscription) -> Dict[str, Any]:
+    """Save a subscription and confirm it."""
+    subscription = await asyncio.to_thread(get_subscriptions().subscribe, subscription)
+    channel_id, repository = subscription.channel_id, subscription.repository
+    events = ", ".join(subscription.events) or "all events"
+    branches = ", ".join(subscription.branches) or "all branches"
+    return ephemeral_message(
+        f"✅ Subscribed <#{channel_id}> to **{repository}** ({events}; {branches})"
+    )
+
+
+@registry.command(
+    "githubunsub",
+    description="Unsubscribe from GitHub notifications",
+    options=(CommandOption("repository", "Repository as owner/name"),),
+    default_member_permissions=MANAGE_CHANNELS,
+)
+def githubunsub_command(interaction: Dict[str, Any], client: Any) -> Any:
+    """Unsubscribe from GitHub notifications."""
+    repository = (option_values(interaction).get("repository") or "").strip()
+    channel_id = interaction_channel(interaction)
+    if not channel_id:
+        return static_responses["channel_required"]
+    if not can_manage_subscriptions(interaction):
+        return static_responses["permission_required"]
+    return remove_subscription(channel_id, repository)
+
+
+async def remove_subscription(channel_id: str, repository: str) -> Dict[str, Any]:
+    """Delete a channel's subscription and confirm it."""
+    store = get_subscriptions()
+    if not await asyncio.to_thread(store.unsubscribe, channel_id, repository):
+        return ephemeral_message(f"<#{channel_id}> is not subscribed to {repository}.")
+    return ephemeral_message(f"Unsubscribed <#{channel_id}> from **{repository}**")
+
+
+def build_static_responses() -> Dict[str, StaticResponse]:
+    """Render the replies that never change between requests."""
+    commands_list = [
+        f"`/{name}` - {description}" for name, description in registry.commands()
+    ]
+    static_responses.update(
+        {
+            "pong": StaticResponse({"type": RESPONSE_TYPES["PONG"]}),
+            "help": StaticResponse(
+                ephemeral_message(
+                    "**Available Commands:**\n" + "\n".join(commands_list)
+                )
+            ),
+            "deferred_ephemeral": StaticResponse(
+                {
+                    "type": RESPONSE_TYPES["DEFERRED_CHANNEL_MESSAGE"],
+                    "data": {"flags": EPHEMERAL},
+                }
+            ),
+            "channel_required": StaticResponse(
+                ephemeral_message("❌ This command must be used in a server channel.")
+            ),
+            "permission_required": StaticResponse(
+                ephemeral_message(
+                    "❌ You need the Manage Channels permission to change "
+                    "subscriptions."
+                )
+            ),
+            "error": StaticResponse(
+                ephemeral_message("An error occurred while processing the command.")
+            ),
+        }
+    )
+    return static_responses
+
+
+build_static_responses()
@@ -0,0 +1,145 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from src.utils.log import request_id
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class QueuedEvent:
+    """A verified GitHub event waiting for a worker."""
+
+    event_type: str
+    payload: Dict[str, Any]
+    delivery_id: Optional[str] = None
+    enqueued_at: float = field(default_factory=time.monotonic)
+    spool_id: Optional[int] = None
+
+
+EventHandler = Callable[[QueuedEvent], Awaitable[Any]]
+ErrorHandler = Callable[[QueuedEvent, Exception], Any]
+
+
+class WebhookQueue:
+    """Bounded asyncio queue drained by a pool of worker tasks.
+
+    ``submit`` never blocks: when the queue is full the event is shed and
+    the caller is expected to answer with 503 so GitHub sees the failure.
+    Events whose handler raises are passed to ``on_error``.
+    """
+
+    def __init__(
+        self,
+        handler: EventHandler,
+        maxsize: int = 1000,
+        workers: int = 4,
+        on_error: Optional[ErrorHandler] = None,
+    ):
+        self.handler = handler
+        self.on_error = on_error
+        self.maxsize = maxsize
+        self.worker_count = workers
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self.enqueued = 0
+        self.processed = 0
+        self.failed = 0
+        self.dropped = 0
+        self.total_wait_time = 0.0
+        self.max_wait_time = 0.0
+
+    @property
+    def queue(self) -> asyncio.Queue:
+        """Return the underlying queue, creating it on first use."""
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.maxsize)
+        return self._queue
+
+    @property
+    def running(self) -> bool:
+        """Return True while worker tasks are running."""
+        return bool(self._workers)
+
+    def submit(self, event: QueuedEvent) -> bool:
+        """Enqueue an event; return False if the queue is full."""
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.dropped += 1
+            logger.warning(
+                "Webhook queue full (%s), dropping %s event",
+                self.maxsize,
+                event.event_type,
+            )
+            return False
+        self.enqueued += 1
+        return True
+
+    async def put(self, event: QueuedEvent) -> None:
+        """Enqueue an event, waiting for space instead of shedding it."""
+        await self.queue.put(event)
+        self.enqueued += 1
+
+    async def start(self) -> None:
+        """Start the worker tasks."""
+        if self._workers:
+            return
+        self._workers = [
+            asyncio.create_task(self._worker(i), name=f"github-webhook-worker-{i}")
+            for i in range(self.worker_count)
+        ]
+        logger.info("Started %s GitHub webhook workers", self.worker_count)
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """Drain queued events, then cancel the worker tasks."""
+        if not self._workers:
+            return
+        try:
+            await asyncio.wait_for(self.queue.join(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(
+                "Stopping with %s GitHub events still queued", self.queue.qsize()
+            )
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        logger.info("Stopped GitHub webhook workers")
+
+    async def _worker(self, number: int) -> None:
+        while True:
+            event = await self.queue.get()
+            request_id.set(event.delivery_id or "-")
+            wait_time = time.monotonic() - event.enqueued_at
+            self.total_wait_time += wait_time
+            self.max_wait_time = max(self.max_wait_time, wait_time)
+            try:
+                await self.handler(event)
+                self.processed += 1
+            except Exception as e:
+                self.failed += 1
+                logger.error("Worker %s failed on %s: %s", number, event.event_type, e)
+                if self.on_error is not None:
+                    self.on_error(event, e)
+            finally:
+                self.queue.task_done()
+
+    def stats(self) -> dict:
+        """Return queue depth, throughput and time-in-queue statistics."""
+        dequeued = self.processed + self.failed
+        average = self.total_wait_time / dequeued if dequeued else 0
+        return {
+            "depth": self.queue.qsize(),
+            "maxsize": self.maxsize,
+            "workers": len(self._workers),
+            "enqueued": self.enqueued,
+            "processed": self.processed,
+            "failed": self.failed,
+            "dropped": self.dropped,
+            "avg_wait_ms": average * 1000,
+            "max_wait_ms": self.max_wait_time * 1000,
+        }
@@ -2,130 +2,126 @@ import asyncio
 import logging
 import os
 import time
+from typing import Optional
 
 import uvicorn
-from discord.interactions import InteractionType
 from dotenv import load_dotenv
-from fastapi import Request
 
-from app import app
-from bot.bot import FlexRPLBot
+from config import config as app_config
+from src.container import container
+from src.handlers.github_webhook import SERVER_STARTED_AT_ENV
+from src.handlers.interactions import registry as interactions
+from src.utils.command_sync import command_sync
+from src.utils.discord_api import sync_commands
+from src.utils.log import configure_logging, stop_logging
 
 # Load environment variables
 load_dotenv()
 
-# Create bot instance
-bot = FlexRPLBot()
+# The one web app and bot for this process, owned by the container
+app = container.app
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-)
 logger = logging.getLogger(__name__)
 
-# Add rate limiting control
-last_sync_time = 0
-SYNC_COOLDOWN = 300  # 5 minutes between syncs
+# Where workers share state when serve() starts several and none is configured
+WORKER_SHARED_STATE_PATH = "data/shared_state.db"
 
+# Seconds between checks for the server to start before the bot is built
+SERVER_START_POLL_INTERVAL = 0.05
 
-async def should_sync_commands():
-    """Control command syncing across replicas"""
-    global last_sync_time
-    current_time = time.time()
 
-    if current_time - last_sync_time >= SYNC_COOLDOWN:
-        last_sync_time = current_time
-        return True
-    return False
+def create_server() -> uvicorn.Server:
+    """Create the uvicorn server for the FastAPI app."""
+    config = uvicorn.Config(app, host="0.0.0.0", port=int(os.getenv("PORT", "8000")))
+    return uvicorn.Server(config)
+
 
+async def start_bot(server: Optional[uvicorn.Server] = None):
+    """Start the Discord bot, once ``server`` is accepting requests.
 
-async def start_bot():
-    """Start the Discord bot."""
+    Importing discord.py and building the bot takes long enough to delay
+    the first request, so it waits until the server has started.
+    """
+    while server is not None and not server.started:
+        if server.should_exit:
+            return
+        await asyncio.sleep(SERVER_START_POLL_INTERVAL)
     try:
-        await bot.start(os.getenv("DISCORD_BOT_TOKEN"))
+        await container.bot.start(os.getenv("DISCORD_BOT_TOKEN"))
     except Exception as e:
         print(f"Failed to start bot: {e}")
         raise
 
 
-async def start_server():
+async def start_server(server: Optional[uvicorn.Server] = None):
     """Start the FastAPI server."""
-    config = uvicorn.Config(app, host="0.0.0.0", port=int(os.getenv("PORT", "8000")))
-    server = uvicorn.Server(config)
-    await server.serve()
+    await (server or create_server()).serve()
 
 
 async def run_all():
-    """Run both the bot and the server."""
-    await asyncio.gather(start_bot(), start_server())
-
-
-async def verify_discord_interaction(request: Request):
-    # Implement or import this function as needed
-    pass
-
-
-@app.post("/discord-interaction")
-async def handle_discord_interaction(request: Request):
-    """Handle Discord interactions with proper verification."""
+    """Run the server, plus the gateway bot unless running HTTP-only."""
+    if app_config.http_only:
+        logger.info("HTTP-only mode: serving interactions without a gateway bot")
+        await start_server()
+        return
+    server = create_server()
+    await asyncio.gather(start_server(server), start_bot(server))
+
+
+def serve():
+    """Run the app, with one uvicorn worker per CPU in HTTP-only mode.
+
+    The gateway bot holds a single connection, so gateway mode stays in one
+    process. Workers share the spool, subscriptions and ``SHARED_STATE_PATH``
+    on local disk, which keeps de-duplication, rate limits and the command
+    sync lease consistent between them. A single process keeps that state in
+    memory, so ``SHARED_STATE_PATH`` defaults to a file only for workers.
+
+    Logging is configured first, so lines logged before the app's startup
+    handler runs, and everything the multi-worker parent logs, are kept.
+    """
+    configure_logging()
     try:
-        # Log the incoming request
-        logger.info("Received Discord interaction")
-
-        # Get and log the request body
-        body = await request.json()
-        logger.info(f"Interaction type: {body.get('type')}")
-
-        # Handle PING
-        if body["type"] == InteractionType.ping.value:
-            logger.info("Responding to PING with PONG")
-            return {"type": InteractionType.pong.value}
-
-        # Handle commands
-        if body["type"] == InteractionType.application_command.value:
-            command_name = body["data"]["name"]
-            logger.info(f"Handling command: {command_name}")
-
-            response_data = {
-                "type": 4,  # InteractionResponseType.channel_message.value
-                "data": {"content": "Processing command..."},
-            }
-
-            if command_name == "ping":
-                response_data["data"]["content"] = "Pong! 🏓"
-            elif command_name == "githubsub":
-                response_data["data"]["content"] = (
-                    "GitHub subscription command received!\n"
-                    "This feature is coming soon. Stay tuned! 🚀"
-                )
-            elif command_name == "help":
-                response_data["data"]["content"] = (
-                    "Available commands:\n"
-                    "- /ping: Check bot latency\n"
-                    "- /githubsub: Subscribe to GitHub notifications\n"
-                    "- /help: Show this message"
-                )
-
-            logger.info(f"Sending response: {response_data}")
-            return response_data
-
+        workers = app_config.WEB_CONCURRENCY if app_config.http_only else 1
+        if workers == 1:
+            asyncio.run(run_all())
+            return
+        os.environ[SERVER_STARTED_AT_ENV] = repr(time.time())
+        os.environ.setdefault("SHARED_STATE_PATH", WORKER_SHARED_STATE_PATH)
+        uvicorn.run(
+            "src.main:app",
+            host="0.0.0.0",
+            port=int(os.getenv("PORT", "8000")),
+            workers=workers,
+        )
+    finally:
+        stop_logging()
+
+
+async def sync_http_commands():
+    """Sync commands over REST if they changed since the last sync."""
+    commands = interactions.command_payloads()
+    try:
+        await command_sync.sync_if_changed(commands, lambda: sync_commands(commands))
     except Exception as e:
-        logger.error(f"Error handling interaction: {str(e)}", exc_info=True)
-        return {
-            "type": 4,
-            "data": {"content": "An error occurred processing your command."},
-        }
+        logger.error("Failed to sync commands: %s", e)
+
+
+# Started by startup_event; held so it is not garbage collected
+command_sync_task: Optional[asyncio.Task] = None
 
 
 async def startup_event():
-    """Handle startup tasks with rate limiting"""
-    if await should_sync_commands():
-        try:
-            await asyncio.sleep(5)  # Add small delay before sync
-            await bot.tree.sync()
-            logger.info("Commands synced successfully")
-        except Exception as e:
-            logger.error(f"Failed to sync commands: {e}")
+    """Start syncing commands over REST in HTTP-only mode.
+
+    The sync waits on Discord, so it runs in the background rather than
+    holding back the first request. In gateway mode the bot syncs its
+    command tree from ``setup_hook`` once it has logged in.
+    """
+    global command_sync_task
+    if not app_config.http_only:
+        return
+    command_sync_task = asyncio.create_task(sync_http_commands(), name="command-sync")
 
 
 # Register startup event
@@ -149,4 +145,4 @@ async def test():
 
 
 if __name__ == "__main__":
-    asyncio.run(run_all())
+    serve()
@@ -1,170 +1,176 @@
-import json
+import asyncio
+import inspect
 import logging
-import math
+import time
+from typing import Any, Awaitable, Dict, Set
 
-from discord import InteractionType
 from fastapi import APIRouter, Request, Response
-from nacl.exceptions import ValueError as NaclValueError
-from nacl.signing import VerifyKey
 
 from config import config
-from src.bot.bot import bot
+from src.container import container
+from src.handlers.interactions import registry as interactions
+from src.handlers.interactions import static_responses
+from src.utils.discord_api import send_followup
+from src.utils.log import request_id
+from src.utils.metrics import (
+    interaction_dispatch_seconds,
+    interaction_handler_seconds,
+    interaction_parse_seconds,
+    interaction_requests,
+    interaction_verify_seconds,
+)
+from src.utils.replay import ReplayGuard
+from src.utils.responses import decode_json, render_response
+from src.utils.shared_state import shared_state
+from src.utils.verification import InteractionVerifier
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
-RESPONSE_TYPES = {
-    "PONG": 1,
-    "CHANNEL_MESSAGE": 4,
-    "DEFERRED_CHANNEL_MESSAGE": 5,
-    "DEFERRED_UPDATE_MESSAGE": 6,
-    "UPDATE_MESSAGE": 7,
-    "APPLICATION_COMMAND_AUTOCOMPLETE_RESULT": 8,
-    "MODAL": 9,
-    "PREMIUM_REQUIRED": 10,
+# Built once at startup, so switching keys takes a restart with the old key in
+# DISCORD_PREVIOUS_PUBLIC_KEY until DISCORD_PREVIOUS_PUBLIC_KEY_EXPIRES_AT
+verifier = InteractionVerifier(
+    config.DISCORD_PUBLIC_KEY,
+    previous_public_key=config.DISCORD_PREVIOUS_PUBLIC_KEY,
+    previous_key_expires_at=config.DISCORD_PREVIOUS_PUBLIC_KEY_EXPIRES_AT,
+)
+
+
+replay_guard = ReplayGuard(
+    tolerance=config.DISCORD_TIMESTAMP_TOLERANCE,
+    maxsize=config.DISCORD_REPLAY_CACHE_SIZE,
+    shared=shared_state,
+)
+
+
+# Follow-ups still running; held so they are not garbage collected
+followup_tasks: Set[asyncio.Task] = set()
+
+
+async def complete_deferred(
+    interaction: Dict[str, Any], pending: Awaitable[Dict[str, Any]]
+) -> None:
+    """Finish a deferred interaction and post its result as a follow-up."""
+    try:
+        response_data = await pending
+    except Exception as e:
+        logger.error("Error completing deferred interaction: %s", e, exc_info=True)
+        response_data = static_responses["error"]
+    try:
+        await send_followup(interaction, dict(response_data.get("data") or {}))
+    except Exception as e:
+        logger.error("Failed to send interaction follow-up: %s", e)
+
+
+def defer(interaction: Dict[str, Any], pending: Awaitable[Dict[str, Any]]):
+    """Answer now with a deferral and finish the handler in the background."""
+    task = asyncio.create_task(complete_deferred(interaction, pending))
+    followup_tasks.add(task)
+    task.add_done_callback(followup_tasks.discard)
+    return static_responses["deferred_ephemeral"]
+
+
+# Label values for raw interaction types
+INTERACTION_TYPE_NAMES = {
+    1: "ping",
+    2: "application_command",
+    3: "message_component",
+    4: "autocomplete",
+    5: "modal_submit",
 }
 
 
+def command_label(interaction: Dict[str, Any]) -> str:
+    """Return the metrics label for the command an interaction invokes."""
+    name = (interaction.get("data") or {}).get("name")
+    if name is not None:
+        return str(name)
+    return INTERACTION_TYPE_NAMES.get(interaction.get("type"), "unknown")
+
+
+def get_verifier() -> InteractionVerifier:
+    """Get the cached Discord interaction verifier."""
+    return verifier
+
+
 def get_verify_key():
-    """Get the Discord verification key."""
-    try:
-        return VerifyKey(bytes.fromhex(config.DISCORD_PUBLIC_KEY))
-    except (ValueError, NaclValueError) as e:
-        logger.error(f"Invalid Discord public key: {e}")
-        return None
+    """Get the current Discord verification key."""
+    return verifier.primary_key
 
 
 @router.post("/discord-interaction")
 async def discord_interaction(request: Request) -> Response:
     """Handle Discord interactions."""
+    started = time.perf_counter()
+    command = "unparsed"
     try:
         # Verify the request
-        verify_key = get_verify_key()
+        interaction_verifier = get_verifier()
         signature = request.headers.get("X-Signature-Ed25519")
         timestamp = request.headers.get("X-Signature-Timestamp")
 
-        if not verify_key or not signature or not timestamp:
+        if not interaction_verifier.ready or not signature or not timestamp:
             logger.error("Missing verification requirements")
             return Response(status_code=401)
 
+        if not replay_guard.check_timestamp(timestamp):
+            logger.warning("Rejected interaction with stale timestamp: %s", timestamp)
+            return Response(status_code=401)
+
         body = await request.body()
-        body_str = body.decode()
-
-        try:
-            verify_key.verify(
-                f"{timestamp}{body_str}".encode(), bytes.fromhex(signature)
-            )
-        except Exception as e:
-            logger.error(f"Verification failed: {e}")
+
+        verify_started = time.perf_counter()
+        verified = interaction_verifier.verify_request(timestamp, body, signature)
+        interaction_verify_seconds.observe(time.perf_counter() - verify_started)
+        if not verified:
+            logger.error("Verification failed: invalid request signature")
             return Response(status_code=401)
 
+        # Checked before parsing so replays never reach the handlers
+        if not replay_guard.check_signature(signature):
+            logger.warning("Rejected replayed interaction request")
+            return Response(status_code=409)
+
         # Parse and handle the interaction
-        interaction_data = json.loads(body_str)
+        parse_started = time.perf_counter()
+        interaction_data = decode_json(body)
+        interaction_parse_seconds.observe(time.perf_counter() - parse_started)
+        if not isinstance(interaction_data, dict):
+            logger.warning("Rejected interaction that is not a JSON object")
+            return Response(status_code=400)
         interaction_type = interaction_data.get("type")
+        interaction_requests.inc(
+            INTERACTION_TYPE_NAMES.get(interaction_type, "unknown")
+        )
+        command = command_label(interaction_data)
+        request_id.set(str(interaction_data.get("id") or "-"))
+
+        interaction_id = interaction_data.get("id")
+        duplicate = not replay_guard.check_interaction(interaction_id)
+        # Pings have no side effects, so they skip the cross-worker claim
+        if not duplicate and interaction_type != 1:
+            duplicate = not await replay_guard.claim_interaction(interaction_id)
+        if duplicate:
+            logger.warning("Rejected duplicate interaction: %s", interaction_id)
+            return Response(status_code=409)
+
+        logger.debug("Processing interaction type %s", interaction_type)
+
+        dispatch_started = time.perf_counter()
+        response_data = interactions.dispatch(interaction_data, container.existing_bot)
+        interaction_dispatch_seconds.observe(
+            time.perf_counter() - dispatch_started, command
+        )
+        if inspect.isawaitable(response_data):
+            return render_response(defer(interaction_data, response_data))
+        if response_data is not None:
+            return render_response(response_data)
 
-        logger.info("Received Discord interaction")
-        logger.info(f"Processing interaction type: {interaction_type}")
-
-        # Handle PING
-        if interaction_type == InteractionType.ping.value:
-            logger.info("Handling PING interaction")
-            return Response(content='{"type":1}', media_type="application/json")
-
-        # Handle APPLICATION_COMMAND
-        if interaction_type == InteractionType.application_command.value:
-            command_name = interaction_data.get("data", {}).get("name")
-            logger.info(f"Handling command: {command_name}")
-
-            if command_name == "ping":
-                try:
-                    latency = (
-                        round(bot.latency * 1000) if not math.isnan(bot.latency) else 0
-                    )
-                    message = f"Pong! 🏓 (Latency: {latency}ms)"
-                except (ValueError, TypeError):
-                    message = "Pong! 🏓 (Latency unavailable)"
-
-                return Response(
-                    content=json.dumps(
-                        {
-                            "type": RESPONSE_TYPES["CHANNEL_MESSAGE"],
-                            "data": {"content": message, "flags": 64},
-                        }
-                    ),
-                    media_type="application/json",
-                )
-            elif command_name == "help":
-                try:
-                    commands = list(bot.tree.get_commands())
-                    logger.info(f"Found {len(commands)} commands")
-
-                    # Fallback to bot's command list if tree is empty
-                    if not commands:
-                        commands = [
-                            {"name": "ping", "description": "Check bot latency"},
-                            {"name": "help", "description": "Show available commands"},
-                            {
-                                "name": "githubsub",
-                                "description": "Subscribe to GitHub notifications",
-                            },
-                        ]
-
-                    commands_list = [
-                        f"`/{cmd['name']}` - {cmd['description']}" for cmd in commands
-                    ]
-
-                    return Response(
-                        content=json.dumps(
-                            {
-                                "type": RESPONSE_TYPES["CHANNEL_MESSAGE"],
-                                "data": {
-                                    "content": "**Available Commands:**\n"
-                                    + "\n".join(commands_list),
-                                    "flags": 64,
-                                },
-                            }
-                        ),
-                        media_type="application/json",
-                    )
-                except Exception as e:
-                    logger.error(f"Error getting commands: {e}")
-                    return Response(
-                        content=json.dumps(
-                            {
-                                "type": RESPONSE_TYPES["CHANNEL_MESSAGE"],
-                                "data": {
-                                    "content": "❌ Error retrieving commands.",
-                                    "flags": 64,
-                                },
-                            }
-                        ),
-                        media_type="application/json",
-                    )
-            elif command_name == "githubsub":
-                return Response(
-                    content=json.dumps(
-                        {
-                            "type": RESPONSE_TYPES["DEFERRED_CHANNEL_MESSAGE"],
-                            "data": {"flags": 64},  # Ephemeral flag
-                        }
-                    ),
-                    media_type="application/json",
-                )
-
-        logger.warning(f"Unhandled interaction type: {interaction_type}")
-        return Response(content='{"type":1}', media_type="application/json")
+        logger.warning("Unhandled interaction type: %s", interaction_type)
+        return render_response(static_responses["pong"])
 
     except Exception as e:
-        logger.error(f"Error processing interaction: {e}", exc_info=True)
-        return Response(
-            content=json.dumps(
-                {
-                    "type": 4,
-                    "data": {
-                        "content": "An error occurred while processing the command.",
-                        "flags": 64,
-                    },
-                }
-            ),
-            media_type="application/json",
-        )
+        logger.error("Error processing interaction: %s", e, exc_info=True)
+        return render_response(static_responses["error"])
+    finally:
+        interaction_handler_seconds.observe(time.perf_counter() - started, command)
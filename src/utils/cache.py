@@ -0,0 +1,58 @@
+import time
+from collections import OrderedDict
+from typing import Callable, Hashable
+
+
+class TTLCache:
+    """Bounded set of recently seen keys with per-entry expiry.
+
+    Entries are kept in insertion order, so expired keys are evicted from the
+    front in O(1) per entry and the oldest key is dropped when full.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, float]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        self._evict_expired(self._clock())
+        return key in self._entries
+
+    def add(self, key: Hashable) -> bool:
+        """Record ``key``; return False if it was already present."""
+        now = self._clock()
+        self._evict_expired(now)
+        if key in self._entries:
+            return False
+        self._entries[key] = now + self.ttl
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        return True
+
+    def discard(self, key: Hashable) -> None:
+        """Forget ``key`` if present."""
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Forget every key."""
+        self._entries.clear()
+
+    def _evict_expired(self, now: float) -> None:
+        entries = self._entries
+        while entries:
+            key, expires_at = next(iter(entries.items()))
+            if expires_at > now:
+                break
+            del entries[key]
@@ -0,0 +1,89 @@
+import hashlib
+import json
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from config import config
+from src.utils.shared_state import SharedState, create_shared_state, shared_state
+
+logger = logging.getLogger(__name__)
+
+NAMESPACE = "command_sync"
+HASH_KEY = "hash"
+LEASE_KEY = "lease"
+
+
+def command_hash(commands: List[Dict[str, Any]]) -> str:
+    """Return a stable hash of serialized application commands."""
+    ordered = sorted(
+        commands, key=lambda command: (command.get("type", 1), command["name"])
+    )
+    encoded = json.dumps(ordered, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+def tree_payloads(tree) -> List[Dict[str, Any]]:
+    """Serialize a CommandTree's global commands the way ``tree.sync`` sends them."""
+    return [command.to_dict(tree) for command in tree.get_commands()]
+
+
+class CommandSync:
+    """Sync application commands only when they change, from one replica.
+
+    The hash of the last synced command list lives in shared state next to
+    a short lease. A replica whose commands match the stored hash skips the
+    sync; otherwise the one that takes the lease syncs and records the new
+    hash, and the others leave it to that replica.
+    """
+
+    def __init__(self, state: Optional[SharedState], lease_ttl: float = 60.0):
+        self.state = state
+        self.lease_ttl = lease_ttl
+        self.synced = 0
+        self.skipped = 0
+
+    async def sync_if_changed(
+        self, commands: List[Dict[str, Any]], sync: Callable[[], Awaitable[Any]]
+    ) -> bool:
+        """Run ``sync`` unless ``commands`` were already synced; return True if run."""
+        digest = command_hash(commands)
+        if self.state is None:
+            await sync()
+            self.synced += 1
+            return True
+        try:
+            if await self.state.get(NAMESPACE, HASH_KEY) == digest:
+                logger.info("Application commands unchanged, skipping sync")
+                self.skipped += 1
+                return False
+            leased = await self.state.add(NAMESPACE, LEASE_KEY, self.lease_ttl)
+        except Exception as e:
+            logger.warning("Command sync state unavailable, syncing anyway: %s", e)
+            await sync()
+            self.synced += 1
+            return True
+
+        if not leased:
+            logger.info("Another replica is syncing application commands")
+            self.skipped += 1
+            return False
+        try:
+            if await self.state.get(NAMESPACE, HASH_KEY) == digest:
+                self.skipped += 1
+                return False
+            await sync()
+            await self.state.set(NAMESPACE, HASH_KEY, digest)
+            self.synced += 1
+            logger.info(
+                "Synced %s application command(s) (%s)", len(commands), digest[:12]
+            )
+            return True
+        finally:
+            await self.state.discard(NAMESPACE, LEASE_KEY)
+
+
+# Workers reuse their shared state; a single process keeps the hash on its own
+command_sync = CommandSync(
+    shared_state or create_shared_state(config.COMMAND_SYNC_PATH),
+    lease_ttl=config.COMMAND_SYNC_LEASE_TTL,
+)
@@ -0,0 +1,81 @@
+import logging
+import time
+from typing import Callable, Optional
+
+from src.utils.cache import TTLCache
+from src.utils.shared_state import SharedState
+
+logger = logging.getLogger(__name__)
+
+
+class DeliveryDeduplicator:
+    """Drop GitHub redeliveries that share an ``X-GitHub-Delivery`` ID.
+
+    Delivery IDs are remembered in a bounded in-process TTL cache. With a
+    ``shared`` backend, first sightings are also claimed there so replicas
+    behind a load balancer only process each delivery once.
+    """
+
+    NAMESPACE = "github_delivery"
+
+    def __init__(
+        self,
+        maxsize: int = 10000,
+        ttl: float = 86400,
+        shared: Optional[SharedState] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ttl = ttl
+        self.shared = shared
+        self._seen = TTLCache(maxsize, ttl, clock)
+        self.hits = 0
+        self.misses = 0
+        self.shared_hits = 0
+
+    async def check(self, delivery_id: Optional[str]) -> bool:
+        """Return True the first time ``delivery_id`` is seen."""
+        if not delivery_id:
+            return True
+        if not self._seen.add(delivery_id):
+            self.hits += 1
+            return False
+        if self.shared is not None:
+            try:
+                claimed = await self.shared.add(self.NAMESPACE, delivery_id, self.ttl)
+            except Exception as e:
+                logger.warning("Shared delivery check failed, using local only: %s", e)
+                claimed = True
+            if not claimed:
+                # The owning replica may still release it, so only it caches
+                self._seen.discard(delivery_id)
+                self.hits += 1
+                self.shared_hits += 1
+                return False
+        self.misses += 1
+        return True
+
+    async def forget(self, delivery_id: Optional[str]) -> None:
+        """Forget a delivery that was not processed so a retry is accepted."""
+        if not delivery_id:
+            return
+        self._seen.discard(delivery_id)
+        if self.shared is not None:
+            try:
+                await self.shared.discard(self.NAMESPACE, delivery_id)
+            except Exception as e:
+                logger.warning("Failed to release delivery %s: %s", delivery_id, e)
+
+    def clear(self) -> None:
+        """Forget every locally seen delivery and reset the counters."""
+        self._seen.clear()
+        self.hits = self.misses = self.shared_hits = 0
+
+    def stats(self) -> dict:
+        """Return hit/miss counters and cache size."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "shared_hits": self.shared_hits,
+            "cached": len(self._seen),
+            "shared": self.shared is not None,
+        }
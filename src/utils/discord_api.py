@@ -0,0 +1,52 @@
+import logging
+from typing import Any, Dict, List
+
+from config import config
+from src.utils.ratelimit import rate_limiter
+
+logger = logging.getLogger(__name__)
+
+# Base URL of the Discord REST API
+API_BASE = "https://discord.com/api/v10"
+
+
+def channel_messages_url(channel_id: str) -> str:
+    """Return the REST endpoint for posting messages to a channel."""
+    return f"{API_BASE}/channels/{channel_id}/messages"
+
+
+def bot_headers() -> Dict[str, str]:
+    """Return the headers that authenticate REST calls as the bot."""
+    return {"Authorization": f"Bot {config.DISCORD_BOT_TOKEN}"}
+
+
+def needs_bot_auth(url: str) -> bool:
+    """Return True for Discord API URLs that require the bot token."""
+    return url.startswith(API_BASE) and "/webhooks/" not in url
+
+
+def application_commands_url(application_id: str) -> str:
+    """Return the REST endpoint for an application's global commands."""
+    return f"{API_BASE}/applications/{application_id}/commands"
+
+
+def followup_url(application_id: str, interaction_token: str) -> str:
+    """Return the webhook endpoint for follow-ups to an interaction."""
+    return f"{API_BASE}/webhooks/{application_id}/{interaction_token}"
+
+
+async def sync_commands(commands: List[Dict[str, Any]]) -> None:
+    """Overwrite the application's global slash commands over REST."""
+    await rate_limiter.send(
+        application_commands_url(config.DISCORD_APPLICATION_ID),
+        commands,
+        headers=bot_headers(),
+        method="PUT",
+    )
+    logger.info("Synced %s command(s) over REST", len(commands))
+
+
+async def send_followup(interaction: Dict[str, Any], data: Dict[str, Any]) -> None:
+    """Send a follow-up message for an interaction over REST."""
+    application_id = interaction.get("application_id") or config.DISCORD_APPLICATION_ID
+    await rate_limiter.send(followup_url(application_id, interaction["token"]), data)
@@ -0,0 +1,169 @@
+import logging
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Raw Discord interaction type values
+PING = 1
+APPLICATION_COMMAND = 2
+MESSAGE_COMPONENT = 3
+APPLICATION_COMMAND_AUTOCOMPLETE = 4
+MODAL_SUBMIT = 5
+
+# Option types that nest further options under a command
+SUB_COMMAND = 1
+SUB_COMMAND_GROUP = 2
+STRING_OPTION = 3
+
+Handler = Callable[[Dict[str, Any], Any], Any]
+HandlerKey = Tuple[Any, ...]
+
+
+class CommandOption(NamedTuple):
+    """A string option accepted by a slash command."""
+
+    name: str
+    description: str
+    required: bool = True
+
+
+def interaction_path(interaction: Dict[str, Any]) -> Tuple[str, ...]:
+    """Return the routing path of an interaction.
+
+    Commands and autocomplete resolve to the command name followed by any
+    subcommand group/subcommand names. Components and modals resolve to
+    their ``custom_id``.
+    """
+    interaction_type = interaction.get("type")
+    data = interaction.get("data") or {}
+
+    if interaction_type in (APPLICATION_COMMAND, APPLICATION_COMMAND_AUTOCOMPLETE):
+        name = data.get("name")
+        if name is None:
+            return ()
+        path = [name]
+        options = data.get("options") or []
+        while options:
+            option = options[0]
+            if option.get("type") not in (SUB_COMMAND, SUB_COMMAND_GROUP):
+                break
+            path.append(option.get("name"))
+            options = option.get("options") or []
+        return tuple(path)
+
+    if interaction_type in (MESSAGE_COMPONENT, MODAL_SUBMIT):
+        custom_id = data.get("custom_id")
+        return (custom_id,) if custom_id is not None else ()
+
+    return ()
+
+
+def option_values(interaction: Dict[str, Any]) -> Dict[str, Any]:
+    """Return the leaf option values of a command interaction by name."""
+    options = (interaction.get("data") or {}).get("options") or []
+    while options and options[0].get("type") in (SUB_COMMAND, SUB_COMMAND_GROUP):
+        options = options[0].get("options") or []
+    return {option.get("name"): option.get("value") for option in options}
+
+
+class InteractionRegistry:
+    """Map interaction type and command path to a handler.
+
+    Handlers are called as ``handler(interaction, client)`` and return the
+    interaction response payload. Lookup is a dictionary hit per path level,
+    so the cost does not grow with the number of registered commands.
+    """
+
+    def __init__(self):
+        self._handlers: Dict[HandlerKey, Handler] = {}
+        self._descriptions: Dict[str, str] = {}
+        self._options: Dict[str, Tuple[CommandOption, ...]] = {}
+        self._permissions: Dict[str, int] = {}
+
+    def register(self, interaction_type: int, *path: str, handler: Handler) -> None:
+        """Register ``handler`` for an interaction type and path."""
+        key = (interaction_type, *path)
+        if key in self._handlers:
+            raise ValueError(f"Handler already registered for {key}")
+        self._handlers[key] = handler
+
+    def on(self, interaction_type: int, *path: str) -> Callable[[Handler], Handler]:
+        """Register the decorated function for an interaction type and path."""
+
+        def decorator(func: Handler) -> Handler:
+            self.register(interaction_type, *path, handler=func)
+            return func
+
+        return decorator
+
+    def command(
+        self,
+        *path: str,
+        description: str = "",
+        options: Sequence[CommandOption] = (),
+        default_member_permissions: Optional[int] = None,
+    ) -> Callable:
+        """Register the decorated function as a slash command handler.
+
+        ``default_member_permissions`` is the permission bitfield Discord
+        requires before showing the command to a member.
+        """
+        if len(path) == 1:
+            self._descriptions[path[0]] = description
+            self._options[path[0]] = tuple(options)
+            if default_member_permissions is not None:
+                self._permissions[path[0]] = default_member_permissions
+        return self.on(APPLICATION_COMMAND, *path)
+
+    def resolve(self, interaction: Dict[str, Any]) -> Optional[Handler]:
+        """Return the most specific handler for an interaction, if any."""
+        interaction_type = interaction.get("type")
+        path = interaction_path(interaction)
+        for depth in range(len(path), -1, -1):
+            handler = self._handlers.get((interaction_type, *path[:depth]))
+            if handler is not None:
+                return handler
+        return None
+
+    def dispatch(self, interaction: Dict[str, Any], client: Any = None) -> Any:
+        """Run the handler for an interaction and return its response."""
+        handler = self.resolve(interaction)
+        if handler is None:
+            return None
+        return handler(interaction, client)
+
+    def commands(self) -> List[Tuple[str, str]]:
+        """Return registered top-level commands as (name, description) pairs."""
+        return list(self._descriptions.items())
+
+    def command_options(self, name: str) -> Tuple[CommandOption, ...]:
+        """Return the options declared for a top-level command."""
+        return self._options.get(name, ())
+
+    def command_permissions(self, name: str) -> Optional[int]:
+        """Return the default member permissions of a top-level command."""
+        return self._permissions.get(name)
+
+    def command_payloads(self) -> List[Dict[str, Any]]:
+        """Return top-level commands in Discord's application command format."""
+        payloads = []
+        for name, description in self.commands():
+            payload = {
+                "name": name,
+                "description": description,
+                "type": 1,
+                "options": [
+                    {
+                        "type": STRING_OPTION,
+                        "name": option.name,
+                        "description": option.description,
+                        "required": option.required,
+                    }
+                    for option in self.command_options(name)
+                ],
+            }
+            permissions = self.command_permissions(name)
+            if permissions is not None:
+                payload["default_member_permissions"] = str(permissions)
+            payloads.append(payload)
+        return payloads
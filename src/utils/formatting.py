@@ -1,62 +1,232 @@
 import logging
-from typing import Any, Dict
+from string import Formatter
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+EventFormatter = Callable[[Dict[str, Any]], str]
+
+# Formatters keyed by (event, action); action None matches any action
+FORMATTERS: Dict[Tuple[str, Optional[str]], EventFormatter] = {}
+
+
+class MessageTemplate:
+    """A message template compiled once into literals and field lookups.
+
+    Fields are dotted paths into the payload, e.g. ``{pull_request.title}``.
+    Missing or null fields render as their entry in ``defaults`` (or
+    ``default``), so formatting never raises on partial payloads.
+    """
+
+    def __init__(
+        self,
+        template: str,
+        defaults: Optional[Dict[str, Any]] = None,
+        default: str = "Unknown",
+    ):
+        defaults = defaults or {}
+        self.template = template
+        self._parts: List[Tuple[str, Tuple[str, ...], str]] = []
+        for literal, field_name, _, _ in Formatter().parse(template):
+            if field_name is None:
+                self._parts.append((literal, (), ""))
+            else:
+                fallback = str(defaults.get(field_name, default))
+                self._parts.append((literal, tuple(field_name.split(".")), fallback))
+
+    def __call__(self, payload: Dict[str, Any]) -> str:
+        return self.render(payload)
+
+    def render(self, payload: Dict[str, Any]) -> str:
+        """Render the template against a webhook payload."""
+        out = []
+        for literal, path, fallback in self._parts:
+            out.append(literal)
+            if not path:
+                continue
+            value: Any = payload
+            for key in path:
+                value = value.get(key) if isinstance(value, dict) else None
+                if value is None:
+                    break
+            out.append(fallback if value is None else str(value))
+        return "".join(out)
+
+
+def register_formatter(
+    event: str, action: Optional[str] = None, formatter: EventFormatter = None
+):
+    """Register a formatter for an event, optionally for a single action."""
+    if formatter is not None:
+        FORMATTERS[(event, action)] = formatter
+        return formatter
+
+    def decorator(func: EventFormatter) -> EventFormatter:
+        FORMATTERS[(event, action)] = func
+        return func
+
+    return decorator
+
 
 def format_commit_message(commit: dict) -> str:
     """Format a commit message for Discord."""
-    author = commit.get("author", {}).get("name", "Unknown")
+    author = (commit.get("author") or {}).get("name", "Unknown")
     message = commit.get("message", "No message provided")
     url = commit.get("url", "")
     return f"• {author}: {message}\n  {url}"
 
 
+PULL_REQUEST_TEMPLATE = MessageTemplate(
+    "Pull Request #{pull_request.number} {action} by {pull_request.user.login}\n"
+    "Title: {pull_request.title}\n"
+    "URL: {pull_request.html_url}",
+    defaults={
+        "pull_request.number": "0",
+        "action": "unknown",
+        "pull_request.title": "No title",
+        "pull_request.html_url": "",
+    },
+)
+
+ISSUE_TEMPLATE = MessageTemplate(
+    "Issue #{issue.number} {action} by {issue.user.login}\n"
+    "Title: {issue.title}\n"
+    "URL: {issue.html_url}",
+    defaults={
+        "issue.number": "0",
+        "action": "unknown",
+        "issue.title": "No title",
+        "issue.html_url": "",
+    },
+)
+
+
+@register_formatter("pull_request")
 def format_pull_request_message(payload: dict) -> str:
     """Format a pull request message for Discord."""
-    action = payload.get("action", "unknown")
-    pr = payload.get("pull_request", {})
-    title = pr.get("title", "No title")
-    number = pr.get("number", "0")
-    url = pr.get("html_url", "")
-    user = pr.get("user", {}).get("login", "Unknown")
-
-    return (
-        f"Pull Request #{number} {action} by {user}\n" f"Title: {title}\n" f"URL: {url}"
-    )
+    return PULL_REQUEST_TEMPLATE.render(payload)
 
 
+@register_formatter("issues")
 def format_issue_message(payload: dict) -> str:
     """Format an issue message for Discord."""
-    action = payload.get("action", "unknown")
-    issue = payload.get("issue", {})
-    title = issue.get("title", "No title")
-    number = issue.get("number", "0")
-    url = issue.get("html_url", "")
-    user = issue.get("user", {}).get("login", "Unknown")
+    return ISSUE_TEMPLATE.render(payload)
+
+
+MERGED_PULL_REQUEST_TEMPLATE = MessageTemplate(
+    "Pull Request #{pull_request.number} merged by {pull_request.merged_by.login}\n"
+    "Title: {pull_request.title}\n"
+    "URL: {pull_request.html_url}",
+    defaults={"pull_request.number": "0", "pull_request.title": "No title"},
+    default="",
+)
+
+
+@register_formatter("pull_request", "closed")
+def format_closed_pull_request(payload: dict) -> str:
+    """Format a closed pull request, calling out merges."""
+    if (payload.get("pull_request") or {}).get("merged"):
+        return MERGED_PULL_REQUEST_TEMPLATE.render(payload)
+    return PULL_REQUEST_TEMPLATE.render(payload)
+
+
+PUSH_TEMPLATE = MessageTemplate(
+    "🔨 {pusher.name} pushed {count} commit(s) to {repository.full_name}:{branch}\n"
+    "Compare: {compare}",
+    defaults={"compare": ""},
+)
 
-    return f"Issue #{number} {action} by {user}\n" f"Title: {title}\n" f"URL: {url}"
+
+@register_formatter("push")
+def format_push_message(payload: dict) -> str:
+    """Format a push summary for Discord.
+
+    Branch pushes show the branch name, which may contain slashes; other refs
+    such as tags are shown in full so they are not mistaken for branches.
+    """
+    ref = payload.get("ref") or ""
+    if ref.startswith("refs/heads/"):
+        ref = ref[len("refs/heads/") :]
+    return PUSH_TEMPLATE.render(
+        {**payload, "count": len(payload.get("commits") or []), "branch": ref}
+    )
+
+
+EVENT_TEMPLATES = {
+    ("release", None): (
+        "🚀 Release {release.tag_name} {action} by {sender.login}\n"
+        "Name: {release.name}\n"
+        "URL: {release.html_url}"
+    ),
+    ("workflow_run", "completed"): (
+        "⚙️ Workflow {workflow_run.name} finished: {workflow_run.conclusion} "
+        "on {workflow_run.head_branch}\n"
+        "URL: {workflow_run.html_url}"
+    ),
+    ("workflow_run", None): (
+        "⚙️ Workflow {workflow_run.name} {action} on {workflow_run.head_branch}\n"
+        "URL: {workflow_run.html_url}"
+    ),
+    ("check_suite", None): (
+        "✅ Check suite {action}: {check_suite.conclusion} "
+        "on {check_suite.head_branch} in {repository.full_name}"
+    ),
+    ("issue_comment", None): (
+        "💬 {comment.user.login} commented on #{issue.number}: {issue.title}\n"
+        "URL: {comment.html_url}"
+    ),
+    ("pull_request_review", None): (
+        "👀 {review.user.login} {review.state} Pull Request #{pull_request.number}: "
+        "{pull_request.title}\n"
+        "URL: {review.html_url}"
+    ),
+    ("create", None): (
+        "🌱 {sender.login} created {ref_type} {ref} in {repository.full_name}"
+    ),
+    ("delete", None): (
+        "🗑️ {sender.login} deleted {ref_type} {ref} in {repository.full_name}"
+    ),
+    ("star", "created"): (
+        "⭐ {sender.login} starred {repository.full_name} "
+        "({repository.stargazers_count} stars)"
+    ),
+    ("star", "deleted"): (
+        "{sender.login} unstarred {repository.full_name} "
+        "({repository.stargazers_count} stars)"
+    ),
+}
+
+FORMATTERS.update(
+    {key: MessageTemplate(template) for key, template in EVENT_TEMPLATES.items()}
+)
 
 
 def format_github_event(event_type: str, payload: Dict[str, Any]) -> str:
     """Format GitHub event for Discord message."""
-    if event_type == "pull_request":
-        return format_pull_request_message(payload)
-    elif event_type == "issues":
-        return format_issue_message(payload)
-    else:
-        logger.warning(f"Unsupported event type: {event_type}")
+    formatter = FORMATTERS.get((event_type, payload.get("action")))
+    if formatter is None:
+        formatter = FORMATTERS.get((event_type, None))
+    if formatter is None:
+        logger.warning("Unsupported event type: %s", event_type)
         return f"Received {event_type} event"
+    return formatter(payload)
+
+
+def format_event_lines(event_type: str, payload: Dict[str, Any]) -> List[str]:
+    """Format a GitHub event as lines that can be batched into one message."""
+    if event_type == "push" and payload.get("commits"):
+        return [format_commit_message(commit) for commit in payload["commits"]]
+    return [format_github_event(event_type, payload)]
 
 
 def format_pr_event(payload: Dict[Any, Any]) -> str:
     """Format pull request event message."""
     action = payload.get("action", "unknown")
-    pr = payload.get("pull_request", {})
+    pr = payload.get("pull_request") or {}
 
     return (
         f"🔍 Pull Request {action}: {pr.get('title')}\n"
-        f"Repository: {payload.get('repository', {}).get('full_name')}\n"
-        f"Author: {pr.get('user', {}).get('login')}\n"
+        f"Repository: {(payload.get('repository') or {}).get('full_name')}\n"
+        f"Author: {(pr.get('user') or {}).get('login')}\n"
         f"URL: {pr.get('html_url')}"
     )
@@ -0,0 +1,72 @@
+import logging
+from typing import TYPE_CHECKING, Optional
+
+from config import config
+
+if TYPE_CHECKING:
+    import aiohttp
+
+logger = logging.getLogger(__name__)
+
+
+class HTTPSessionManager:
+    """Own one pooled aiohttp session for the lifetime of the app.
+
+    The session is created lazily inside the running event loop and shared
+    by every outbound call, so connections, TLS sessions and DNS lookups
+    are reused instead of being set up per message. aiohttp itself is only
+    imported then, keeping it off the cold start path.
+    """
+
+    def __init__(
+        self,
+        limit: int = 100,
+        limit_per_host: int = 20,
+        keepalive_timeout: float = 30.0,
+        dns_cache_ttl: int = 300,
+        timeout: float = 10.0,
+    ):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.dns_cache_ttl = dns_cache_ttl
+        self.timeout = timeout
+        self._session: Optional["aiohttp.ClientSession"] = None
+
+    @property
+    def closed(self) -> bool:
+        """Return True if there is no open session."""
+        return self._session is None or self._session.closed
+
+    def get_session(self) -> "aiohttp.ClientSession":
+        """Return the shared session, creating it on first use."""
+        if self.closed:
+            import aiohttp
+
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+                ttl_dns_cache=self.dns_cache_ttl,
+                use_dns_cache=True,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+            logger.info("Created shared HTTP session")
+        return self._session
+
+    async def close(self) -> None:
+        """Close the shared session and its connection pool."""
+        if not self.closed:
+            await self._session.close()
+            logger.info("Closed shared HTTP session")
+        self._session = None
+
+
+http_sessions = HTTPSessionManager(
+    limit=config.HTTP_POOL_SIZE,
+    limit_per_host=config.HTTP_POOL_SIZE_PER_HOST,
+    keepalive_timeout=config.HTTP_KEEPALIVE_TIMEOUT,
+)
@@ -0,0 +1,124 @@
+import atexit
+import copy
+import json
+import logging
+import queue
+import sys
+import time
+from contextvars import ContextVar
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional, TextIO
+
+from config import config
+
+logger = logging.getLogger(__name__)
+
+# Correlation ID of the interaction or webhook delivery being handled
+request_id: ContextVar[str] = ContextVar("request_id", default="-")
+
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - [%(request_id)s] %(message)s"
+
+# LogRecord attributes that are not user-supplied ``extra`` fields
+RESERVED_ATTRS = frozenset(
+    vars(logging.LogRecord("", 0, "", 0, "", (), None)).keys()
+    | {"message", "asctime", "request_id"}
+)
+
+_listener: Optional[QueueListener] = None
+
+
+class RequestIdFilter(logging.Filter):
+    """Stamp records with the current request ID."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id.get()
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """Render each record as one JSON object per line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(record.created))
+            + f".{int(record.msecs):03d}Z",
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "request_id": getattr(record, "request_id", "-"),
+        }
+        for key, value in vars(record).items():
+            if key not in RESERVED_ATTRS:
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc_info"] = record.exc_text
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class LogQueueHandler(QueueHandler):
+    """Queue records for the listener thread without formatting them.
+
+    The message is merged with its arguments on the calling thread so
+    mutable arguments are captured as they were, but rendering and writing
+    happen on the listener thread.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def configure_logging(
+    level: str = config.LOG_LEVEL,
+    fmt: str = config.LOG_FORMAT,
+    stream: Optional[TextIO] = None,
+) -> QueueListener:
+    """Route the root logger through a background writer thread.
+
+    Records are filtered by ``level`` and stamped with the request ID on the
+    calling thread, then handed to a :class:`QueueListener` that formats
+    them as JSON (or text when ``fmt`` is ``"text"``) and writes them to
+    ``stream``, stderr by default. Calling it again replaces the previous
+    setup.
+    """
+    global _listener
+    stop_logging()
+
+    output = logging.StreamHandler(stream or sys.stderr)
+    output.setFormatter(
+        logging.Formatter(TEXT_FORMAT) if fmt == "text" else JsonFormatter()
+    )
+    records: queue.SimpleQueue = queue.SimpleQueue()
+    handler = LogQueueHandler(records)
+    handler.addFilter(RequestIdFilter())
+
+    root = logging.getLogger()
+    root.addHandler(handler)
+    root.setLevel(level.upper())
+
+    _listener = QueueListener(records, output, respect_handler_level=True)
+    _listener.start()
+    logger.debug("Logging configured at %s (%s)", level.upper(), fmt)
+    return _listener
+
+
+def stop_logging() -> None:
+    """Detach the queue handler, flush queued records and stop the writer."""
+    global _listener
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        if isinstance(handler, LogQueueHandler):
+            root.removeHandler(handler)
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(stop_logging)
@@ -0,0 +1,316 @@
+import logging
+import math
+import re
+from bisect import bisect_left
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; in-process hot paths sit in the sub-millisecond buckets
+LATENCY_BUCKETS = (
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+# Seconds; end-to-end delivery includes the coalescing window and retries
+DELIVERY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.0, 2.5, 3.0, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+LabelValues = Tuple[str, ...]
+
+INVALID_NAME_CHARS = re.compile(r"[^a-zA-Z0-9_:]")
+
+
+def metric_name(name: str) -> str:
+    """Replace characters Prometheus does not allow in a metric name."""
+    name = INVALID_NAME_CHARS.sub("_", name)
+    return name if name and not name[0].isdigit() else f"_{name}"
+
+
+def escape_label(value: str) -> str:
+    """Escape a label value for the Prometheus text format."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    """Render ``{name="value",...}``, or an empty string without labels."""
+    pairs = [
+        f'{name}="{escape_label(str(value))}"' for name, value in zip(names, values)
+    ]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def format_value(value: float) -> str:
+    """Render a sample value the way Prometheus parses it."""
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if math.isnan(value):
+        return "NaN"
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class Counter:
+    """A monotonically increasing count per label set."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        """Add ``amount`` to the count for ``labels``."""
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, *labels: str) -> float:
+        """Return the current count for ``labels``."""
+        return self._values.get(labels, 0.0)
+
+    def samples(self) -> Iterator[str]:
+        for labels, value in sorted(self._values.items()):
+            yield (
+                f"{self.name}{format_labels(self.labelnames, labels)} "
+                f"{format_value(value)}"
+            )
+
+
+class Histogram:
+    """Observations counted into fixed buckets per label set.
+
+    ``observe`` is a bisect plus two additions; cumulative bucket counts are
+    only computed when the metrics are scraped.
+    """
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [per-bucket counts (last is +Inf), sum]
+        self._series: Dict[LabelValues, Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        """Record one observation for ``labels``."""
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = ([0] * (len(self.buckets) + 1), [0.0])
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1][0] += value
+
+    def count(self, *labels: str) -> int:
+        """Return how many observations were recorded for ``labels``."""
+        series = self._series.get(labels)
+        return sum(series[0]) if series else 0
+
+    def samples(self) -> Iterator[str]:
+        for labels, (counts, total) in sorted(self._series.items()):
+            cumulative = 0
+            bounds = [format_value(bound) for bound in self.buckets] + ["+Inf"]
+            for bound, count in zip(bounds, counts):
+                cumulative += count
+                label_text = format_labels(self.labelnames, labels, f'le="{bound}"')
+                yield f"{self.name}_bucket{label_text} {cumulative}"
+            label_text = format_labels(self.labelnames, labels)
+            yield f"{self.name}_sum{label_text} {format_value(total[0])}"
+            yield f"{self.name}_count{label_text} {cumulative}"
+
+
+class Gauge:
+    """A value read from a callback when the metrics are scraped.
+
+    The callback returns None when there is nothing to report.
+    """
+
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, func: Callable[[], Optional[float]]):
+        self.name = name
+        self.help = help
+        self.func = func
+
+    def samples(self) -> Iterator[str]:
+        try:
+            value = self.func()
+        except Exception as e:
+            logger.warning("Failed to read gauge %s: %s", self.name, e)
+            return
+        if value is not None:
+            yield f"{self.name} {format_value(value)}"
+
+
+def is_number(value: Any) -> bool:
+    """Return True for ints and floats, but not bools."""
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def flatten_stats(
+    prefix: str, stats: dict, labels: Optional[Dict[str, str]] = None
+) -> Iterator[Tuple[str, str, float]]:
+    """Yield ``(name, labels, value)`` for numeric entries of a ``stats()`` dict.
+
+    A dict under a key named in ``labels`` holds one entry per label value,
+    such as per-bucket counters or per-reason counts; each of its fields (or
+    the entry itself, if it is a number) becomes one metric labelled with the
+    entry's key, rather than one metric name per entry.
+    """
+    labels = labels or {}
+    for key, value in stats.items():
+        name = f"{prefix}_{key}"
+        if isinstance(value, dict) and key in labels:
+            for label_value, entry in value.items():
+                rendered = format_labels([labels[key]], [label_value])
+                if isinstance(entry, dict):
+                    for field, _, number in flatten_stats(name, entry):
+                        yield field, rendered, number
+                elif is_number(entry):
+                    yield metric_name(name), rendered, entry
+        elif isinstance(value, dict):
+            yield from flatten_stats(name, value, labels)
+        elif is_number(value):
+            yield metric_name(name), "", value
+
+
+class MetricsRegistry:
+    """Metrics rendered in the Prometheus text exposition format.
+
+    Besides counters, histograms and gauges, components that already keep
+    counters behind a ``stats()`` method are exported as untyped samples, so
+    their numbers are scraped without adding anything to their hot paths.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+        self._stats: Dict[str, Tuple[Callable[[], dict], Dict[str, str]]] = {}
+
+    def _add(self, metric):
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric already registered: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        """Register and return a counter."""
+        return self._add(Counter(name, help, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> Histogram:
+        """Register and return a histogram."""
+        return self._add(Histogram(name, help, labelnames, buckets))
+
+    def gauge(self, name: str, help: str, func: Callable[[], Optional[float]]) -> Gauge:
+        """Register and return a gauge read from ``func``."""
+        return self._add(Gauge(name, help, func))
+
+    def register_stats(
+        self,
+        prefix: str,
+        stats: Callable[[], dict],
+        labels: Optional[Dict[str, str]] = None,
+    ) -> None:
+        """Export the numeric values of a component's ``stats()``.
+
+        ``labels`` maps keys of per-item dicts to the label their items are
+        exported under; see :func:`flatten_stats`.
+        """
+        self._stats[prefix] = (stats, labels or {})
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text format."""
+        lines = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        for prefix, (stats, labels) in self._stats.items():
+            try:
+                values = list(flatten_stats(prefix, stats(), labels))
+            except Exception as e:
+                logger.warning("Failed to read %s stats: %s", prefix, e)
+                continue
+            families: Dict[str, List[str]] = {}
+            for name, rendered, value in values:
+                families.setdefault(name, []).append(
+                    f"{name}{rendered} {format_value(value)}"
+                )
+            for name, samples in families.items():
+                lines.append(f"# TYPE {name} untyped")
+                lines.extend(samples)
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
+
+interaction_requests = metrics.counter(
+    "discord_interactions_total",
+    "Discord interactions received, by interaction type.",
+    ["type"],
+)
+interaction_verify_seconds = metrics.histogram(
+    "discord_interaction_verify_seconds",
+    "Time spent verifying Discord interaction signatures.",
+)
+interaction_parse_seconds = metrics.histogram(
+    "discord_interaction_parse_seconds",
+    "Time spent parsing Discord interaction JSON.",
+)
+interaction_dispatch_seconds = metrics.histogram(
+    "discord_interaction_dispatch_seconds",
+    "Time spent in the interaction handler, by command.",
+    ["command"],
+)
+interaction_handler_seconds = metrics.histogram(
+    "discord_interaction_handler_seconds",
+    "Total time to answer a Discord interaction, by command.",
+    ["command"],
+)
+github_events = metrics.counter(
+    "github_webhook_events_total",
+    "GitHub webhook deliveries accepted, by event type.",
+    ["event"],
+)
+github_verify_seconds = metrics.histogram(
+    "github_webhook_verify_seconds",
+    "Time spent reading and verifying GitHub webhook bodies.",
+)
+github_parse_seconds = metrics.histogram(
+    "github_webhook_parse_seconds",
+    "Time spent parsing GitHub webhook JSON.",
+)
+github_delivery_seconds = metrics.histogram(
+    "github_ingest_to_delivery_seconds",
+    "Time from accepting a GitHub event to delivering it to every target.",
+    ["event"],
+    buckets=DELIVERY_BUCKETS,
+)
@@ -0,0 +1,235 @@
+import asyncio
+import hashlib
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from src.utils.http import HTTPSessionManager, http_sessions
+from src.utils.shared_state import SharedState, shared_state
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimitExceeded(Exception):
+    """Raised when a request is still rate limited after all retries."""
+
+
+@dataclass
+class RateLimitBucket:
+    """Rate limit state Discord reported for one route."""
+
+    name: str
+    limit: Optional[int] = None
+    remaining: Optional[int] = None
+    reset_at: float = 0.0
+    bucket_id: Optional[str] = None
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock, repr=False)
+    sent: int = 0
+    queued: int = 0
+    rate_limited: int = 0
+    wait_time: float = 0.0
+    in_use: int = field(default=0, repr=False)
+
+    def idle(self, now: float) -> bool:
+        """Return whether nothing uses the bucket and its limit has reset."""
+        return self.in_use == 0 and self.reset_at <= now
+
+    def stats(self) -> dict:
+        """Return the bucket's counters."""
+        return {
+            "bucket_id": self.bucket_id,
+            "limit": self.limit,
+            "remaining": self.remaining,
+            "sent": self.sent,
+            "queued": self.queued,
+            "rate_limited": self.rate_limited,
+            "wait_ms": self.wait_time * 1000,
+        }
+
+
+def bucket_name(url: str) -> str:
+    """Return a name for a URL's bucket that does not reveal webhook tokens.
+
+    The token is replaced by a short hash rather than dropped, so each
+    webhook and interaction follow-up keeps its own rate limit and stats.
+    """
+    if "/webhooks/" not in url:
+        return url
+    base, token = url.rsplit("/", 1)
+    return f"{base}/{hashlib.sha256(token.encode()).hexdigest()[:12]}"
+
+
+class RateLimitScheduler:
+    """Send Discord requests while honouring per-route and global limits.
+
+    Requests to the same URL are serialized through that URL's bucket. When
+    Discord reports the bucket as exhausted, later sends wait for the reset
+    instead of being rejected, and 429 responses are retried after
+    ``retry_after``.
+
+    Buckets are dropped once idle and past their reset, so one-off URLs such
+    as interaction follow-up webhooks do not accumulate.
+
+    With a ``shared`` backend, exhausted buckets and global limits are also
+    published there as wall clock reset times, so every worker sending with
+    the same token waits them out instead of spending its own 429s.
+    """
+
+    NAMESPACE = "discord_ratelimit"
+    GLOBAL_KEY = "global"
+
+    def __init__(
+        self,
+        sessions: HTTPSessionManager,
+        max_retries: int = 3,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[Any]] = asyncio.sleep,
+        shared: Optional[SharedState] = None,
+        wall_clock: Callable[[], float] = time.time,
+    ):
+        self.sessions = sessions
+        self.max_retries = max_retries
+        self.shared = shared
+        self._clock = clock
+        self._wall_clock = wall_clock
+        self._sleep = sleep
+        self._buckets: Dict[str, RateLimitBucket] = {}
+        self.global_reset_at = 0.0
+        self.global_rate_limited = 0
+
+    def bucket(self, url: str) -> RateLimitBucket:
+        """Return the bucket for ``url``, creating it on first use."""
+        bucket = self._buckets.get(url)
+        if bucket is None:
+            self._evict_idle()
+            bucket = self._buckets[url] = RateLimitBucket(bucket_name(url))
+        return bucket
+
+    def _evict_idle(self) -> None:
+        """Drop buckets that no send holds and whose limit has reset."""
+        now = self._clock()
+        for url in [u for u, b in self._buckets.items() if b.idle(now)]:
+            del self._buckets[url]
+
+    async def send(
+        self,
+        url: str,
+        payload: Any,
+        headers: Optional[dict] = None,
+        method: str = "POST",
+    ) -> int:
+        """Send ``payload`` as JSON to ``url`` and return the response status."""
+        bucket = self.bucket(url)
+        if bucket.lock.locked():
+            bucket.queued += 1
+
+        bucket.in_use += 1
+        try:
+            async with bucket.lock:
+                for _ in range(self.max_retries + 1):
+                    await self._wait_for_capacity(bucket)
+                    session = self.sessions.get_session()
+                    async with session.request(
+                        method, url, json=payload, headers=headers
+                    ) as resp:
+                        self._update_bucket(bucket, resp.headers)
+                        if bucket.remaining == 0 and resp.status != 429:
+                            await self._share_reset(bucket.name, bucket.reset_at)
+                        if resp.status != 429:
+                            resp.raise_for_status()
+                            bucket.sent += 1
+                            return resp.status
+                        await self._handle_rate_limit(bucket, resp)
+        finally:
+            bucket.in_use -= 1
+
+        raise RateLimitExceeded(f"Still rate limited after {self.max_retries} retries")
+
+    async def _wait_for_capacity(self, bucket: RateLimitBucket) -> None:
+        now = self._clock()
+        delay = max(self.global_reset_at - now, 0.0)
+        if bucket.remaining == 0:
+            delay = max(delay, bucket.reset_at - now)
+        if self.shared is not None:
+            delay = max(delay, await self._shared_delay(bucket))
+        if delay > 0:
+            bucket.wait_time += delay
+            logger.debug("Waiting %.3fs for rate limit on %s", delay, bucket.name)
+            await self._sleep(delay)
+            if bucket.remaining == 0:
+                bucket.remaining = None
+
+    async def _shared_delay(self, bucket: RateLimitBucket) -> float:
+        """Return how long other workers reported this route as blocked."""
+        try:
+            resets = [
+                await self.shared.get(self.NAMESPACE, key)
+                for key in (self.GLOBAL_KEY, bucket.name)
+            ]
+        except Exception as e:
+            logger.warning("Shared rate limit check failed, using local only: %s", e)
+            return 0.0
+        now = self._wall_clock()
+        return max((float(reset) - now for reset in resets if reset), default=0.0)
+
+    async def _share_reset(self, key: str, reset_at: float) -> None:
+        """Publish a local reset time to the other workers."""
+        if self.shared is None:
+            return
+        reset = self._wall_clock() + reset_at - self._clock()
+        try:
+            await self.shared.set(self.NAMESPACE, key, repr(reset))
+        except Exception as e:
+            logger.warning("Failed to share rate limit on %s: %s", key, e)
+
+    def _update_bucket(self, bucket: RateLimitBucket, headers) -> None:
+        if "X-RateLimit-Bucket" in headers:
+            bucket.bucket_id = headers["X-RateLimit-Bucket"]
+        if "X-RateLimit-Limit" in headers:
+            bucket.limit = int(headers["X-RateLimit-Limit"])
+        if "X-RateLimit-Remaining" in headers:
+            bucket.remaining = int(headers["X-RateLimit-Remaining"])
+        if "X-RateLimit-Reset-After" in headers:
+            reset_after = float(headers["X-RateLimit-Reset-After"])
+            bucket.reset_at = self._clock() + reset_after
+
+    async def _handle_rate_limit(self, bucket: RateLimitBucket, resp) -> None:
+        try:
+            data = await resp.json(content_type=None)
+        except ValueError:
+            data = None
+        if not isinstance(data, dict):
+            data = {}
+        retry_after = float(
+            data.get("retry_after") or resp.headers.get("Retry-After") or 1.0
+        )
+        reset_at = self._clock() + retry_after
+
+        if data.get("global") or resp.headers.get("X-RateLimit-Global"):
+            self.global_rate_limited += 1
+            self.global_reset_at = reset_at
+            logger.warning("Global rate limit hit, retrying in %ss", retry_after)
+            await self._share_reset(self.GLOBAL_KEY, reset_at)
+        else:
+            bucket.remaining = 0
+            bucket.reset_at = reset_at
+            logger.warning(
+                "Rate limited on %s, retrying in %ss", bucket.name, retry_after
+            )
+            await self._share_reset(bucket.name, reset_at)
+        bucket.rate_limited += 1
+
+    def stats(self) -> dict:
+        """Return global and per-bucket rate limit statistics."""
+        return {
+            "global_rate_limited": self.global_rate_limited,
+            "global_wait_s": max(self.global_reset_at - self._clock(), 0.0),
+            "shared": self.shared is not None,
+            "buckets": {
+                bucket.name: bucket.stats() for bucket in self._buckets.values()
+            },
+        }
+
+
+rate_limiter = RateLimitScheduler(http_sessions, shared=shared_state)
@@ -0,0 +1,102 @@
+import logging
+import time
+from collections import Counter
+from typing import Callable, Optional
+
+from src.utils.cache import TTLCache
+from src.utils.shared_state import SharedState
+
+logger = logging.getLogger(__name__)
+
+
+class ReplayGuard:
+    """Reject stale and duplicate Discord interaction requests.
+
+    Timestamps outside ``tolerance`` seconds of the local clock are refused
+    before the signature is checked. Verified signatures and interaction IDs
+    are remembered long enough to cover the whole accepted window, so a
+    request can only be processed once. With a ``shared`` backend, interaction
+    IDs are also claimed there so a replay sent to another worker is refused.
+    """
+
+    NAMESPACE = "discord_interaction"
+
+    def __init__(
+        self,
+        tolerance: float = 300,
+        maxsize: int = 10000,
+        clock: Callable[[], float] = time.time,
+        shared: Optional[SharedState] = None,
+    ):
+        self.tolerance = tolerance
+        self.shared = shared
+        self._clock = clock
+        ttl = tolerance * 2
+        self._signatures = TTLCache(maxsize, ttl)
+        self._interaction_ids = TTLCache(maxsize, ttl)
+        self.rejections: Counter = Counter()
+
+    def check_timestamp(self, timestamp: str) -> bool:
+        """Return True if ``timestamp`` is within the allowed clock skew."""
+        try:
+            sent_at = int(timestamp)
+        except (TypeError, ValueError):
+            self.rejections["invalid_timestamp"] += 1
+            return False
+        if abs(self._clock() - sent_at) > self.tolerance:
+            self.rejections["stale_timestamp"] += 1
+            return False
+        return True
+
+    def check_signature(self, signature: str) -> bool:
+        """Return True the first time a verified signature is seen.
+
+        Signatures are compared as bytes, so re-sending one in a different
+        hex case or spacing is still caught before the body is parsed.
+        """
+        try:
+            key = bytes.fromhex(signature)
+        except ValueError:
+            key = signature.lower()
+        if not self._signatures.add(key):
+            self.rejections["replayed_signature"] += 1
+            return False
+        return True
+
+    def check_interaction(self, interaction_id: Optional[str]) -> bool:
+        """Return True the first time an interaction ID is seen."""
+        if interaction_id is None:
+            return True
+        if not self._interaction_ids.add(interaction_id):
+            self.rejections["duplicate_interaction"] += 1
+            return False
+        return True
+
+    async def claim_interaction(self, interaction_id: Optional[str]) -> bool:
+        """Return True unless another worker already claimed the interaction."""
+        if interaction_id is None or self.shared is None:
+            return True
+        try:
+            claimed = await self.shared.add(
+                self.NAMESPACE, str(interaction_id), self.tolerance * 2
+            )
+        except Exception as e:
+            logger.warning("Shared interaction check failed, using local only: %s", e)
+            return True
+        if not claimed:
+            self.rejections["duplicate_interaction"] += 1
+        return claimed
+
+    def reset(self) -> None:
+        """Forget seen requests and rejection counts."""
+        self._signatures.clear()
+        self._interaction_ids.clear()
+        self.rejections.clear()
+
+    def stats(self) -> dict:
+        """Return rejection counters and cache sizes."""
+        return {
+            "rejections": dict(self.rejections),
+            "seen_signatures": len(self._signatures),
+            "seen_interactions": len(self._interaction_ids),
+        }
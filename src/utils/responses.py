@@ -0,0 +1,58 @@
+import json
+import logging
+from typing import Any
+
+from fastapi import Response
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+JSON_MEDIA_TYPE = "application/json"
+
+
+def decode_json(data: bytes) -> Any:
+    """Parse a JSON request body straight from bytes."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def encode_json(data: Any) -> bytes:
+    """Encode a response payload to compact JSON bytes.
+
+    Uses orjson when it is installed and falls back to the standard library.
+    """
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+class StaticResponse(dict):
+    """Interaction response whose JSON body is rendered once.
+
+    Behaves like the payload dict it wraps, so gateway code and tests can
+    inspect it, while the HTTP route sends the pre-serialized ``body``.
+    """
+
+    def __init__(self, payload: dict):
+        super().__init__(payload)
+        self.body = encode_json(payload)
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("StaticResponse is immutable")
+
+    __setitem__ = __delitem__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+
+def render_response(response_data: Any) -> Response:
+    """Build an HTTP response, reusing the cached body of static responses."""
+    if isinstance(response_data, StaticResponse):
+        body = response_data.body
+    else:
+        body = encode_json(response_data)
+    return Response(content=body, media_type=JSON_MEDIA_TYPE)
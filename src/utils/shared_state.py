@@ -0,0 +1,186 @@
+import asyncio
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+from config import config
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS seen_keys (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    expires_at REAL NOT NULL,
+    PRIMARY KEY (namespace, key)
+)
+"""
+
+VALUES_SCHEMA = """
+CREATE TABLE IF NOT EXISTS shared_values (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (namespace, key)
+)
+"""
+
+
+class SharedState:
+    """Small key/expiry store shared by every process using the same file.
+
+    Workers and replicas on one host (or on a shared volume) point ``path``
+    at the same SQLite database, so a key claimed by one process is seen by
+    all of them; SQLite's file locks serialize the writers. Calls run in a
+    worker thread so the event loop is never blocked on the database lock.
+
+    This is the default backend. Others only need the same coroutine
+    methods (``add``, ``discard``, ``get``, ``set``, ``purge_expired``) and
+    ``close``, and are plugged in with :func:`register_backend`.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        busy_timeout: float = 5.0,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.path = path
+        self.busy_timeout = busy_timeout
+        self._clock = clock
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._adds = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(
+                self.path,
+                timeout=self.busy_timeout,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(SCHEMA)
+            conn.execute(VALUES_SCHEMA)
+            self._conn = conn
+            logger.info("Opened shared state at %s", self.path)
+        return self._conn
+
+    def _add(self, namespace: str, key: str, ttl: float) -> bool:
+        now = self._clock()
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute(
+                    "DELETE FROM seen_keys WHERE namespace = ? AND key = ? "
+                    "AND expires_at <= ?",
+                    (namespace, key, now),
+                )
+                cursor = conn.execute(
+                    "INSERT OR IGNORE INTO seen_keys VALUES (?, ?, ?)",
+                    (namespace, key, now + ttl),
+                )
+                self._adds += 1
+                if self._adds % 1000 == 0:
+                    conn.execute("DELETE FROM seen_keys WHERE expires_at <= ?", (now,))
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return cursor.rowcount == 1
+
+    def _discard(self, namespace: str, key: str) -> None:
+        with self._lock:
+            self._connection().execute(
+                "DELETE FROM seen_keys WHERE namespace = ? AND key = ?",
+                (namespace, key),
+            )
+
+    def _purge(self) -> int:
+        with self._lock:
+            cursor = self._connection().execute(
+                "DELETE FROM seen_keys WHERE expires_at <= ?", (self._clock(),)
+            )
+        return cursor.rowcount
+
+    def _get(self, namespace: str, key: str) -> Optional[str]:
+        with self._lock:
+            row = (
+                self._connection()
+                .execute(
+                    "SELECT value FROM shared_values WHERE namespace = ? AND key = ?",
+                    (namespace, key),
+                )
+                .fetchone()
+            )
+        return row[0] if row else None
+
+    def _set(self, namespace: str, key: str, value: str) -> None:
+        with self._lock:
+            self._connection().execute(
+                "INSERT OR REPLACE INTO shared_values VALUES (?, ?, ?)",
+                (namespace, key, value),
+            )
+
+    async def add(self, namespace: str, key: str, ttl: float) -> bool:
+        """Claim ``key``; return False if another process already holds it."""
+        return await asyncio.to_thread(self._add, namespace, key, ttl)
+
+    async def discard(self, namespace: str, key: str) -> None:
+        """Release ``key`` so it can be claimed again."""
+        await asyncio.to_thread(self._discard, namespace, key)
+
+    async def get(self, namespace: str, key: str) -> Optional[str]:
+        """Return the stored value for ``key``, or None if unset."""
+        return await asyncio.to_thread(self._get, namespace, key)
+
+    async def set(self, namespace: str, key: str, value: str) -> None:
+        """Store ``value`` for ``key``, replacing any previous value."""
+        await asyncio.to_thread(self._set, namespace, key, value)
+
+    async def purge_expired(self) -> int:
+        """Delete expired keys and return how many were removed."""
+        return await asyncio.to_thread(self._purge)
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+# Backend factories by URL scheme; a plain path uses the SQLite backend
+BACKENDS: Dict[str, Callable[[str], SharedState]] = {"sqlite": SharedState}
+
+
+def register_backend(scheme: str, factory: Callable[[str], SharedState]) -> None:
+    """Make ``scheme://...`` locations create their store with ``factory``."""
+    BACKENDS[scheme] = factory
+
+
+def create_shared_state(location: str) -> Optional[SharedState]:
+    """Return a shared state store for ``location``, or None if it is unset.
+
+    ``location`` is a file path for the SQLite backend, or a
+    ``scheme://rest`` URL whose scheme picks a registered backend, which is
+    given ``rest``.
+    """
+    if not location:
+        return None
+    scheme, separator, rest = location.partition("://")
+    if not separator:
+        return SharedState(location)
+    if scheme not in BACKENDS:
+        raise ValueError(f"Unknown shared state backend: {scheme}")
+    return BACKENDS[scheme](rest)
+
+
+shared_state = create_shared_state(config.SHARED_STATE_PATH)
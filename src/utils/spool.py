@@ -0,0 +1,312 @@
+import asyncio
+import logging
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    event_type TEXT NOT NULL,
+    delivery_id TEXT,
+    body BLOB NOT NULL,
+    received_at REAL NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0
+)
+"""
+
+DEAD_LETTER_SCHEMA = """
+CREATE TABLE IF NOT EXISTS dead_letters (
+    id INTEGER PRIMARY KEY,
+    event_type TEXT NOT NULL,
+    delivery_id TEXT,
+    body BLOB NOT NULL,
+    received_at REAL NOT NULL,
+    attempts INTEGER NOT NULL,
+    reason TEXT NOT NULL,
+    failed_at REAL NOT NULL
+)
+"""
+
+MOVE_TO_DEAD_LETTERS = """
+INSERT OR REPLACE INTO dead_letters
+SELECT id, event_type, delivery_id, body, received_at, attempts, ?, ?
+FROM events WHERE id = ?
+"""
+
+
+@dataclass
+class SpooledEvent:
+    """An accepted event read back from the spool."""
+
+    spool_id: int
+    event_type: str
+    delivery_id: Optional[str]
+    body: bytes
+
+
+PendingWrite = Tuple[Tuple[str, Optional[str], bytes, float], asyncio.Future]
+
+
+class EventSpool:
+    """Append-only SQLite spool of accepted GitHub events.
+
+    The database runs in WAL mode, so appends are sequential writes to the
+    log, and checkpoints fold it back into the main file once it reaches
+    ``checkpoint_pages``. Appends are group-committed: callers that arrive
+    within ``flush_interval`` share one transaction and one fsync. All
+    database work runs on a single background thread.
+
+    Events that fail processing are moved to a ``dead_letters`` table, and
+    so are events already replayed ``max_attempts`` times without being
+    acked, so a payload that can never be delivered is not retried on every
+    restart.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        flush_interval: float = 0.002,
+        batch_size: int = 256,
+        checkpoint_pages: int = 1000,
+        max_attempts: int = 3,
+    ):
+        self.path = path
+        self.max_attempts = max_attempts
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.checkpoint_pages = checkpoint_pages
+        self._conn: Optional[sqlite3.Connection] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._writes: List[PendingWrite] = []
+        self._acks: Set[int] = set()
+        self._dead: Dict[int, str] = {}
+        self._flusher: Optional[asyncio.Task] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._closing = False
+        self.appended = 0
+        self.acked = 0
+        self.dead_lettered = 0
+        self.batches = 0
+        self.total_commit_time = 0.0
+        self.last_commit_time = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        """Return True if the spool has been opened."""
+        return self._conn is not None
+
+    async def open(self) -> None:
+        """Open the database and start the group-commit task."""
+        if self.enabled or not self.path:
+            return
+        self._executor = ThreadPoolExecutor(1, thread_name_prefix="event-spool")
+        self._conn = await self._run(self._connect)
+        self._wake = asyncio.Event()
+        self._closing = False
+        self._flusher = asyncio.create_task(self._flush_loop(), name="event-spool")
+        logger.info("Opened GitHub event spool at %s", self.path)
+
+    def _connect(self) -> sqlite3.Connection:
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=FULL")
+        conn.execute(f"PRAGMA wal_autocheckpoint={self.checkpoint_pages}")
+        conn.execute("PRAGMA journal_size_limit=67108864")
+        conn.execute(SCHEMA)
+        columns = [row[1] for row in conn.execute("PRAGMA table_info(events)")]
+        if "attempts" not in columns:
+            conn.execute(
+                "ALTER TABLE events ADD COLUMN attempts INTEGER NOT NULL DEFAULT 0"
+            )
+        conn.execute(DEAD_LETTER_SCHEMA)
+        return conn
+
+    async def _run(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    async def append(
+        self, event_type: str, body: bytes, delivery_id: Optional[str] = None
+    ) -> Optional[int]:
+        """Durably store an event and return its spool id.
+
+        Returns None without writing anything when the spool is not open.
+        """
+        if not self.enabled:
+            return None
+        future = asyncio.get_running_loop().create_future()
+        record = (event_type, delivery_id, bytes(body), time.time())
+        self._writes.append((record, future))
+        self._wake.set()
+        return await future
+
+    def ack(self, spool_id: Optional[int]) -> None:
+        """Mark an event as delivered; it is removed with the next commit."""
+        if spool_id is None or not self.enabled:
+            return
+        self._acks.add(spool_id)
+        self._wake.set()
+
+    def dead_letter(self, spool_id: Optional[int], reason: str) -> None:
+        """Move an event that cannot be processed out of the replay set."""
+        if spool_id is None or not self.enabled:
+            return
+        self._dead[spool_id] = reason
+        self._wake.set()
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await self._wake.wait()
+            if not self._closing and len(self._writes) < self.batch_size:
+                # Give concurrent appends a moment to join this commit
+                await asyncio.sleep(self.flush_interval)
+            self._wake.clear()
+            await self._flush()
+            if self._closing and not (self._writes or self._acks or self._dead):
+                return
+
+    async def _flush(self) -> None:
+        writes = self._writes[: self.batch_size]
+        del self._writes[: self.batch_size]
+        acks, self._acks = self._acks, set()
+        dead, self._dead = self._dead, {}
+        if not writes and not acks and not dead:
+            return
+        try:
+            ids = await self._run(self._commit, [r for r, _ in writes], acks, dead)
+        except Exception as e:
+            logger.error("Failed to write GitHub event spool: %s", e)
+            if not self._closing:
+                self._acks |= acks
+                self._dead.update(dead)
+            for _, future in writes:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), spool_id in zip(writes, ids):
+            if not future.done():
+                future.set_result(spool_id)
+        self.appended += len(writes)
+        self.acked += len(acks)
+        self.dead_lettered += len(dead)
+        if self._writes:
+            self._wake.set()
+
+    def _commit(self, records: list, acks: Set[int], dead: Dict[int, str]) -> List[int]:
+        start = time.perf_counter()
+        conn = self._conn
+        ids = []
+        conn.execute("BEGIN")
+        try:
+            for record in records:
+                cursor = conn.execute(
+                    "INSERT INTO events (event_type, delivery_id, body, received_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    record,
+                )
+                ids.append(cursor.lastrowid)
+            if acks:
+                conn.executemany(
+                    "DELETE FROM events WHERE id = ?", [(i,) for i in acks]
+                )
+            self._move_to_dead_letters(dead)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        self.batches += 1
+        self.last_commit_time = time.perf_counter() - start
+        self.total_commit_time += self.last_commit_time
+        return ids
+
+    async def replay(self, before: Optional[float] = None) -> List[SpooledEvent]:
+        """Return every event that was accepted but not yet delivered.
+
+        With ``before``, only events received before that UNIX time are
+        returned. Each replay counts as an attempt; events already replayed
+        ``max_attempts`` times are dead-lettered instead.
+        """
+        if not self.enabled:
+            return []
+        rows = await self._run(self._take_replay, before)
+        if rows:
+            logger.info("Replaying %s spooled GitHub event(s)", len(rows))
+        return [SpooledEvent(*row) for row in rows]
+
+    def _move_to_dead_letters(self, dead: Dict[int, str]) -> None:
+        now = time.time()
+        for spool_id, reason in dead.items():
+            self._conn.execute(MOVE_TO_DEAD_LETTERS, (reason, now, spool_id))
+            self._conn.execute("DELETE FROM events WHERE id = ?", (spool_id,))
+
+    def _take_replay(self, before: Optional[float]) -> Iterable[tuple]:
+        conn = self._conn
+        cutoff = float("inf") if before is None else before
+        conn.execute("BEGIN")
+        try:
+            exhausted = conn.execute(
+                "SELECT id FROM events WHERE received_at < ? AND attempts >= ?",
+                (cutoff, self.max_attempts),
+            ).fetchall()
+            reason = f"not delivered after {self.max_attempts} replays"
+            self._move_to_dead_letters({row[0]: reason for row in exhausted})
+            rows = conn.execute(
+                "SELECT id, event_type, delivery_id, body FROM events "
+                "WHERE received_at < ? ORDER BY id",
+                (cutoff,),
+            ).fetchall()
+            conn.execute(
+                "UPDATE events SET attempts = attempts + 1 WHERE received_at < ?",
+                (cutoff,),
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        if exhausted:
+            logger.warning(
+                "Dead-lettered %s spooled GitHub event(s) after %s replays",
+                len(exhausted),
+                self.max_attempts,
+            )
+        self.dead_lettered += len(exhausted)
+        return rows
+
+    async def close(self) -> None:
+        """Commit outstanding work, checkpoint the log and close the database."""
+        if not self.enabled:
+            return
+        self._closing = True
+        self._wake.set()
+        await self._flusher
+        await self._run(self._close)
+        self._executor.shutdown(wait=True)
+        self._conn = None
+        self._executor = None
+        self._flusher = None
+        logger.info("Closed GitHub event spool")
+
+    def _close(self) -> None:
+        self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        self._conn.close()
+
+    def stats(self) -> dict:
+        """Return spool throughput and commit latency statistics."""
+        average = self.total_commit_time / self.batches if self.batches else 0
+        return {
+            "enabled": self.enabled,
+            "appended": self.appended,
+            "acked": self.acked,
+            "dead_lettered": self.dead_lettered,
+            "batches": self.batches,
+            "avg_batch_size": self.appended / self.batches if self.batches else 0,
+            "avg_commit_ms": average * 1000,
+            "last_commit_ms": self.last_commit_time * 1000,
+        }
@@ -0,0 +1,258 @@
+import logging
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from config import config
+
+logger = logging.getLogger(__name__)
+
+# Index key for subscriptions that want every event type
+ALL_EVENTS = "*"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS subscriptions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    guild_id TEXT,
+    channel_id TEXT NOT NULL,
+    repository TEXT NOT NULL,
+    events TEXT NOT NULL DEFAULT '',
+    branches TEXT NOT NULL DEFAULT '',
+    UNIQUE (channel_id, repository)
+)
+"""
+
+
+@dataclass(frozen=True)
+class Subscription:
+    """A Discord channel subscribed to a GitHub repository."""
+
+    channel_id: str
+    repository: str
+    guild_id: Optional[str] = None
+    events: Tuple[str, ...] = ()
+    branches: Tuple[str, ...] = ()
+    id: Optional[int] = None
+
+    def matches_branch(self, branch: Optional[str]) -> bool:
+        """Return True if ``branch`` passes this subscription's filter."""
+        return not self.branches or branch in self.branches
+
+
+def parse_filter(value: Optional[str]) -> Tuple[str, ...]:
+    """Split a comma-separated filter option into a normalized tuple."""
+    if not value:
+        return ()
+    return tuple(sorted({part.strip() for part in value.split(",") if part.strip()}))
+
+
+def event_branch(event_type: str, payload: Dict[str, Any]) -> Optional[str]:
+    """Return the branch a GitHub event applies to, if it has one."""
+    if event_type == "push":
+        ref = payload.get("ref") or ""
+        return ref[len("refs/heads/") :] if ref.startswith("refs/heads/") else None
+    if event_type in ("pull_request", "pull_request_review"):
+        return ((payload.get("pull_request") or {}).get("base") or {}).get("ref")
+    if event_type in ("workflow_run", "check_suite"):
+        return (payload.get(event_type) or {}).get("head_branch")
+    if event_type in ("create", "delete") and payload.get("ref_type") == "branch":
+        return payload.get("ref")
+    return None
+
+
+class SubscriptionStore:
+    """SQLite-backed subscriptions with an in-memory routing index.
+
+    The index maps ``(repository, event type)`` to the subscriptions that
+    want it, with :data:`ALL_EVENTS` for unfiltered ones, so routing a
+    webhook is two dictionary lookups plus the branch filter on the hits.
+    Rows are read on first use rather than at import, and read again when
+    SQLite's ``data_version`` shows another process (such as a sibling web
+    worker) has changed them. That check runs at most once per
+    ``refresh_interval`` seconds, so routing an event rarely touches SQLite.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        refresh_interval: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.path = path
+        self.refresh_interval = refresh_interval
+        self._clock = clock
+        self._checked_at = 0.0
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._index: Optional[Dict[Tuple[str, str], List[Subscription]]] = None
+        self._data_version: Optional[int] = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            if self.path != ":memory:":
+                Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    @property
+    def loaded(self) -> bool:
+        """Return True once the index has been built."""
+        return self._index is not None
+
+    def _read_data_version(self) -> int:
+        return self._connection().execute("PRAGMA data_version").fetchone()[0]
+
+    def load(self) -> int:
+        """Build the routing index from the database and return its size."""
+        with self._lock:
+            self._checked_at = self._clock()
+            self._data_version = self._read_data_version()
+            rows = (
+                self._connection()
+                .execute(
+                    "SELECT id, guild_id, channel_id, repository, events, branches "
+                    "FROM subscriptions"
+                )
+                .fetchall()
+            )
+            self._index = {}
+            for id_, guild_id, channel_id, repository, events, branches in rows:
+                self._insert(
+                    Subscription(
+                        channel_id=channel_id,
+                        repository=repository,
+                        guild_id=guild_id,
+                        events=parse_filter(events),
+                        branches=parse_filter(branches),
+                        id=id_,
+                    )
+                )
+        logger.info("Loaded %s GitHub subscription(s)", len(rows))
+        return len(rows)
+
+    def _ensure_loaded(self) -> Dict[Tuple[str, str], List[Subscription]]:
+        if self._index is None or self._changed_elsewhere():
+            self.load()
+        return self._index
+
+    def _changed_elsewhere(self) -> bool:
+        now = self._clock()
+        if now - self._checked_at < self.refresh_interval:
+            return False
+        with self._lock:
+            self._checked_at = now
+            return self._read_data_version() != self._data_version
+
+    def _insert(self, subscription: Subscription) -> None:
+        repo = subscription.repository.lower()
+        for event in subscription.events or (ALL_EVENTS,):
+            self._index.setdefault((repo, event), []).append(subscription)
+
+    def _remove(self, channel_id: str, repository: str) -> Optional[Subscription]:
+        repo = repository.lower()
+        removed = None
+        for key in [key for key in self._index if key[0] == repo]:
+            remaining = []
+            for subscription in self._index[key]:
+                if subscription.channel_id == channel_id:
+                    removed = subscription
+                else:
+                    remaining.append(subscription)
+            if remaining:
+                self._index[key] = remaining
+            else:
+                del self._index[key]
+        return removed
+
+    def subscribe(self, subscription: Subscription) -> Subscription:
+        """Create or replace the subscription of a channel to a repository."""
+        self._ensure_loaded()
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.execute(
+                    "DELETE FROM subscriptions WHERE channel_id = ? "
+                    "AND repository = ? COLLATE NOCASE",
+                    (subscription.channel_id, subscription.repository),
+                )
+                cursor = conn.execute(
+                    "INSERT INTO subscriptions "
+                    "(guild_id, channel_id, repository, events, branches) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (
+                        subscription.guild_id,
+                        subscription.channel_id,
+                        subscription.repository,
+                        ",".join(subscription.events),
+                        ",".join(subscription.branches),
+                    ),
+                )
+            stored = Subscription(
+                channel_id=subscription.channel_id,
+                repository=subscription.repository,
+                guild_id=subscription.guild_id,
+                events=subscription.events,
+                branches=subscription.branches,
+                id=cursor.lastrowid,
+            )
+            self._remove(stored.channel_id, stored.repository)
+            self._insert(stored)
+        return stored
+
+    def unsubscribe(self, channel_id: str, repository: str) -> bool:
+        """Remove a channel's subscription; return False if there was none."""
+        self._ensure_loaded()
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.execute(
+                    "DELETE FROM subscriptions WHERE channel_id = ? "
+                    "AND repository = ? COLLATE NOCASE",
+                    (channel_id, repository),
+                )
+            return self._remove(channel_id, repository) is not None
+
+    def match(
+        self, repository: str, event_type: str, branch: Optional[str] = None
+    ) -> List[Subscription]:
+        """Return the subscriptions a GitHub event should be delivered to."""
+        index = self._ensure_loaded()
+        repo = repository.lower()
+        candidates = index.get((repo, event_type), []) + index.get(
+            (repo, ALL_EVENTS), []
+        )
+        return [sub for sub in candidates if sub.matches_branch(branch)]
+
+    def for_channel(self, channel_id: str) -> List[Subscription]:
+        """Return every subscription of a channel."""
+        index = self._ensure_loaded()
+        seen = {}
+        for subscriptions in index.values():
+            for subscription in subscriptions:
+                if subscription.channel_id == channel_id:
+                    seen[subscription.id] = subscription
+        return list(seen.values())
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+                self._index = None
+
+
+subscriptions = SubscriptionStore(
+    config.SUBSCRIPTIONS_PATH, refresh_interval=config.SUBSCRIPTIONS_REFRESH_INTERVAL
+)
+
+
+def get_subscriptions() -> SubscriptionStore:
+    """Get the subscription store."""
+    return subscriptions
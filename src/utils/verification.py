@@ -0,0 +1,233 @@
+import hashlib
+import hmac
+import logging
+import time
+from typing import List, Optional, Tuple
+
+from nacl.bindings import crypto_sign_BYTES, crypto_sign_open
+from nacl.exceptions import BadSignatureError
+from nacl.exceptions import ValueError as NaclValueError
+from nacl.signing import VerifyKey
+
+logger = logging.getLogger(__name__)
+
+
+def load_verify_key(public_key: str) -> Optional[VerifyKey]:
+    """Build a VerifyKey from a hex encoded Discord public key."""
+    try:
+        return VerifyKey(bytes.fromhex(public_key))
+    except (ValueError, NaclValueError) as e:
+        logger.error("Invalid Discord public key: %s", e)
+        return None
+
+
+class InteractionVerifier:
+    """Verify Discord interaction signatures against cached public keys.
+
+    Keys are decoded once at startup and reused for every request, so
+    rotating a key takes a restart. A previous key is accepted until
+    ``previous_key_expires_at``, a UNIX time, so restarting does not extend it.
+    """
+
+    def __init__(
+        self,
+        public_key: str = "",
+        previous_public_key: str = "",
+        previous_key_expires_at: float = 0.0,
+    ):
+        self._primary: Optional[VerifyKey] = None
+        # (key, expires_at) pairs still accepted after a rotation, in UNIX time
+        self._retired: List[Tuple[VerifyKey, float]] = []
+        self.verify_count = 0
+        self.verify_failures = 0
+        self.total_verify_time = 0.0
+        self.last_verify_time = 0.0
+        if public_key:
+            self._primary = load_verify_key(public_key)
+        if previous_public_key and previous_key_expires_at <= time.time():
+            logger.warning("Ignoring previous Discord public key: no future expiry")
+        elif previous_public_key:
+            previous = load_verify_key(previous_public_key)
+            if previous is not None:
+                self._retired.append((previous, previous_key_expires_at))
+
+    @property
+    def ready(self) -> bool:
+        """Return True when at least one key is available."""
+        return self._primary is not None
+
+    @property
+    def primary_key(self) -> Optional[VerifyKey]:
+        """Return the current primary key."""
+        return self._primary
+
+    def active_keys(self) -> List[VerifyKey]:
+        """Return the keys currently accepted, primary first."""
+        if self._retired:
+            now = time.time()
+            self._retired = [(k, exp) for k, exp in self._retired if exp > now]
+        keys = [self._primary] if self._primary is not None else []
+        keys.extend(k for k, _ in self._retired)
+        return keys
+
+    def verify(self, message: bytes, signature: str) -> bool:
+        """Return True if ``signature`` matches ``message`` for an active key."""
+        return self._timed_verify(signature, (message,))
+
+    def verify_request(self, timestamp: str, body: bytes, signature: str) -> bool:
+        """Verify an interaction request without decoding its body.
+
+        The signed message is ``timestamp + body``; it is joined directly
+        behind the signature, the layout libsodium verifies, so the body is
+        never decoded, formatted or re-encoded. It is still copied twice: once
+        by that join and once into the message ``crypto_sign_open`` returns.
+        """
+        return self._timed_verify(signature, (timestamp.encode(), body))
+
+    def _timed_verify(self, signature: str, parts: Tuple[bytes, ...]) -> bool:
+        start = time.perf_counter()
+        verified = self._verify(signature, parts)
+        elapsed = time.perf_counter() - start
+
+        self.verify_count += 1
+        self.total_verify_time += elapsed
+        self.last_verify_time = elapsed
+        if not verified:
+            self.verify_failures += 1
+        logger.debug("Signature verification took %.3fms", elapsed * 1000)
+        return verified
+
+    def _verify(self, signature: str, parts: Tuple[bytes, ...]) -> bool:
+        try:
+            signature_bytes = bytes.fromhex(signature)
+        except ValueError:
+            return False
+        if len(signature_bytes) != crypto_sign_BYTES:
+            return False
+
+        signed = b"".join((signature_bytes, *parts))
+        for key in self.active_keys():
+            try:
+                crypto_sign_open(signed, bytes(key))
+                return True
+            except (BadSignatureError, NaclValueError):
+                continue
+        return False
+
+    def stats(self) -> dict:
+        """Return verification timing statistics."""
+        average = self.total_verify_time / self.verify_count if self.verify_count else 0
+        return {
+            "verify_count": self.verify_count,
+            "verify_failures": self.verify_failures,
+            "last_verify_ms": self.last_verify_time * 1000,
+            "avg_verify_ms": average * 1000,
+            "active_keys": len(self.active_keys()),
+        }
+
+
+# GitHub signature headers, preferred first, and the digest each one uses
+GITHUB_SIGNATURE_HEADERS = (
+    ("X-Hub-Signature-256", "sha256", hashlib.sha256),
+    ("X-Hub-Signature", "sha1", hashlib.sha1),
+)
+
+
+class GitHubSignatureCheck:
+    """HMAC state for one webhook request, fed as the body streams in."""
+
+    def __init__(self, verifier: "GitHubSignatureVerifier", prefix: str, macs):
+        self._verifier = verifier
+        self._prefix = prefix
+        self._macs = macs
+        self._elapsed = 0.0
+
+    def update(self, chunk: bytes) -> None:
+        """Feed a chunk of the request body to every active secret."""
+        start = time.perf_counter()
+        for mac in self._macs:
+            mac.update(chunk)
+        self._elapsed += time.perf_counter() - start
+
+    def matches(self, signature: str) -> bool:
+        """Return True if ``signature`` matches any active secret."""
+        start = time.perf_counter()
+        verified = False
+        prefix, _, digest = signature.partition("=")
+        if prefix == self._prefix:
+            for mac in self._macs:
+                if hmac.compare_digest(digest, mac.hexdigest()):
+                    verified = True
+                    break
+        self._elapsed += time.perf_counter() - start
+        self._verifier.record(self._elapsed, verified)
+        return verified
+
+
+class GitHubSignatureVerifier:
+    """Verify GitHub webhook HMACs from precomputed keyed state.
+
+    Each secret's HMAC is keyed once per digest at startup; requests start
+    from a ``.copy()`` of that state instead of re-encoding the secret and
+    re-running the key schedule. Several secrets can be active at once so
+    a new secret can be rolled out before the old one is removed.
+    """
+
+    def __init__(self, secrets: List[str]):
+        secrets = [secret for secret in secrets if secret]
+        self._keyed = {
+            name: [hmac.new(secret.encode(), digestmod=digest) for secret in secrets]
+            for _, name, digest in GITHUB_SIGNATURE_HEADERS
+        }
+        self.secret_count = len(secrets)
+        self.verify_count = 0
+        self.verify_failures = 0
+        self.total_verify_time = 0.0
+        self.last_verify_time = 0.0
+
+    def signature_from_headers(self, headers) -> Optional[Tuple[str, str]]:
+        """Return the (algorithm, signature) of the strongest signature header."""
+        for header, name, _ in GITHUB_SIGNATURE_HEADERS:
+            signature = headers.get(header)
+            if signature:
+                return name, signature
+        return None
+
+    def start(self, algorithm: str) -> GitHubSignatureCheck:
+        """Begin verifying a request signed with ``algorithm``."""
+        macs = [mac.copy() for mac in self._keyed[algorithm]]
+        return GitHubSignatureCheck(self, algorithm, macs)
+
+    def verify(self, body: bytes, algorithm: str, signature: str) -> bool:
+        """Verify a fully buffered body."""
+        start = time.perf_counter()
+        prefix, _, digest = signature.partition("=")
+        verified = False
+        if prefix == algorithm:
+            for keyed in self._keyed[algorithm]:
+                mac = keyed.copy()
+                mac.update(body)
+                if hmac.compare_digest(digest, mac.hexdigest()):
+                    verified = True
+                    break
+        self.record(time.perf_counter() - start, verified)
+        return verified
+
+    def record(self, elapsed: float, verified: bool) -> None:
+        """Record the time spent verifying one request."""
+        self.verify_count += 1
+        self.total_verify_time += elapsed
+        self.last_verify_time = elapsed
+        if not verified:
+            self.verify_failures += 1
+
+    def stats(self) -> dict:
+        """Return verification timing statistics."""
+        average = self.total_verify_time / self.verify_count if self.verify_count else 0
+        return {
+            "verify_count": self.verify_count,
+            "verify_failures": self.verify_failures,
+            "last_verify_ms": self.last_verify_time * 1000,
+            "avg_verify_ms": average * 1000,
+            "active_secrets": self.secret_count,
+        }
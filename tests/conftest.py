@@ -5,3 +5,61 @@ from pathlib import Path
 # Add the project root directory to Python path
 root_dir = Path(__file__).parent.parent
 sys.path.insert(0, str(root_dir))
+
+from aiohttp import web
+from src.handlers.github_webhook import delivery_dedup
+from src.routes.discord import replay_guard
+from src.utils.command_sync import command_sync as command_sync_instance
+from src.utils.ratelimit import rate_limiter
+from src.utils.shared_state import SharedState
+from src.utils.subscriptions import SubscriptionStore
+
+
+@pytest.fixture(autouse=True)
+def subscription_store(monkeypatch):
+    """Keep subscriptions in memory so tests never touch data/."""
+    store = SubscriptionStore(":memory:")
+    monkeypatch.setattr("src.utils.subscriptions.subscriptions", store)
+    yield store
+    store.close()
+
+
+@pytest.fixture(autouse=True)
+def command_sync(monkeypatch, tmp_path):
+    """Keep the command sync hash in a per-test database."""
+    state = SharedState(str(tmp_path / "command_sync.db"))
+    monkeypatch.setattr(command_sync_instance, "state", state)
+    yield command_sync_instance
+    state.close()
+
+
+@pytest.fixture(autouse=True)
+def shared_state(monkeypatch, tmp_path):
+    """Keep state shared between web workers in a per-test database."""
+    state = SharedState(str(tmp_path / "shared_state.db"))
+    monkeypatch.setattr("src.handlers.github_webhook.shared_state", state)
+    for component in (delivery_dedup, replay_guard, rate_limiter):
+        monkeypatch.setattr(component, "shared", state)
+    yield state
+    state.close()
+
+
+@pytest.fixture
+async def stub_server():
+    """Start local aiohttp servers that stand in for Discord."""
+    runners = []
+
+    async def start(handler):
+        app = web.Application()
+        app.router.add_route("*", "/{tail:.*}", handler)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        runners.append(runner)
+        port = site._server.sockets[0].getsockname()[1]
+        return f"http://127.0.0.1:{port}"
+
+    yield start
+    for runner in runners:
+        await runner.cleanup()
@@ -63,7 +63,35 @@ async def test_bot_initialization():
     """Test bot initialization."""
     bot = FlexRPLBot()
     assert isinstance(bot, commands.Bot)
-    assert bot.intents.message_content is True
+    assert bot.intents == discord.Intents(guilds=True)
+    assert bot._connection.max_messages is None
+    assert bot._connection.member_cache_flags.value == 0
+    assert bot._connection._chunk_guilds is False
+
+def test_build_intents():
+    """Test that only the named intents are enabled."""
+    from src.bot.bot import build_intents
+    intents = build_intents(["guilds", "guild_messages"])
+    assert intents.guilds and intents.guild_messages
+    assert not intents.message_content and not intents.members
+    with pytest.raises(ValueError):
+        build_intents(["guilds", "everything"])
+
+def test_cache_policy_configurable(monkeypatch):
+    """Test that caches and chunking can be turned back on."""
+    from config import config
+    from src.bot.bot import cache_policy
+    monkeypatch.setattr(config, "DISCORD_INTENTS", ["guilds", "members"])
+    monkeypatch.setattr(config, "DISCORD_MAX_MESSAGES", 100)
+    monkeypatch.setattr(config, "DISCORD_MEMBER_CACHE", True)
+    monkeypatch.setattr(config, "DISCORD_CHUNK_GUILDS", True)
+    policy = cache_policy()
+    assert policy["max_messages"] == 100
+    assert policy["member_cache_flags"].joined is True
+    assert policy["chunk_guilds_at_startup"] is True
+
+    monkeypatch.setattr(config, "DISCORD_INTENTS", ["guilds"])
+    assert cache_policy()["chunk_guilds_at_startup"] is False
 
 @pytest.mark.asyncio
 async def test_setup_hook_success(bot):
@@ -0,0 +1,53 @@
+import pytest
+from src.utils.cache import TTLCache
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def test_add_and_duplicate():
+    """Test that a key is only added once."""
+    cache = TTLCache(maxsize=10, ttl=60)
+    assert cache.add("a") is True
+    assert cache.add("a") is False
+    assert "a" in cache
+    assert len(cache) == 1
+
+def test_entries_expire():
+    """Test that keys are forgotten after their TTL."""
+    clock = FakeClock()
+    cache = TTLCache(maxsize=10, ttl=60, clock=clock)
+    cache.add("a")
+    clock.now = 30
+    cache.add("b")
+    clock.now = 61
+    assert "a" not in cache
+    assert "b" in cache
+    assert cache.add("a") is True
+
+def test_bounded_size():
+    """Test that the oldest key is evicted when the cache is full."""
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.add("a")
+    cache.add("b")
+    cache.add("c")
+    assert len(cache) == 2
+    assert "a" not in cache
+    assert "c" in cache
+
+def test_invalid_maxsize():
+    """Test that an empty cache size is rejected."""
+    with pytest.raises(ValueError):
+        TTLCache(maxsize=0, ttl=1)
+
+def test_discard():
+    """Test that a discarded key can be added again."""
+    cache = TTLCache(maxsize=10, ttl=60)
+    cache.add("a")
+    cache.discard("a")
+    cache.discard("missing")
+    assert "a" not in cache
+    assert cache.add("a") is True
@@ -0,0 +1,158 @@
+import asyncio
+import aiohttp
+import pytest
+from src.handlers.coalescer import EventCoalescer, pack_lines
+
+def test_pack_lines_single_message():
+    """Test that short lines share one message."""
+    assert pack_lines("**repo**", ["a", "b"]) == ["**repo**\na\nb"]
+
+def test_pack_lines_respects_limit():
+    """Test that messages are split at the length limit."""
+    lines = ["x" * 40 for _ in range(10)]
+    messages = pack_lines("H", lines, limit=100)
+    assert all(len(message) <= 100 for message in messages)
+    assert all(message.startswith("H\n") for message in messages)
+    assert sum(message.count("x" * 40) for message in messages) == 10
+    assert len(messages) == 5
+
+def test_pack_lines_truncates_long_line():
+    """Test that a single oversized line is truncated."""
+    messages = pack_lines("H", ["y" * 500], limit=100)
+    assert len(messages) == 1
+    assert len(messages[0]) == 100
+    assert messages[0].endswith("…")
+
+def test_pack_lines_empty():
+    """Test that no lines produce no messages."""
+    assert pack_lines("H", []) == []
+
+@pytest.mark.asyncio
+async def test_coalesces_within_window():
+    """Test that events inside the window become one message per target."""
+    sent = []
+
+    async def send(target, content):
+        sent.append((target, content))
+
+    coalescer = EventCoalescer(send, window=0.05)
+    coalescer.add("org/repo", "hook-a", ["one"])
+    coalescer.add("org/repo", "hook-a", ["two", "three"])
+    coalescer.add("org/other", "hook-a", ["four"])
+    assert coalescer.pending == 4
+
+    await asyncio.sleep(0.1)
+    assert sorted(sent) == [
+        ("hook-a", "**org/other**\nfour"),
+        ("hook-a", "**org/repo**\none\ntwo\nthree"),
+    ]
+    stats = coalescer.stats()
+    assert stats.pop("delivery")["sent"] == 2
+    assert stats == {
+        "events": 3, "messages_sent": 2, "failures": 0, "pending_lines": 0
+    }
+
+@pytest.mark.asyncio
+async def test_flush_all_sends_immediately():
+    """Test that shutdown flushes pending lines without waiting."""
+    sent = []
+
+    async def send(target, content):
+        sent.append(content)
+
+    coalescer = EventCoalescer(send, window=60)
+    coalescer.add("org/repo", "hook", ["one"])
+    await coalescer.flush_all()
+    assert sent == ["**org/repo**\none"]
+    assert coalescer.pending == 0
+
+@pytest.mark.asyncio
+async def test_send_failure_counted():
+    """Test that a failed send is logged and counted."""
+    async def send(target, content):
+        raise RuntimeError("discord down")
+
+    coalescer = EventCoalescer(send, window=60)
+    coalescer.add("org/repo", "hook", ["one"])
+    await coalescer.flush_all()
+    assert coalescer.failures == 1
+
+@pytest.mark.asyncio
+async def test_on_delivered_runs_after_send():
+    """Test that delivery callbacks run once their batch was sent."""
+    delivered = []
+
+    async def send(target, content):
+        pass
+
+    coalescer = EventCoalescer(send, window=60)
+    coalescer.add("org/repo", "hook", ["one"], on_delivered=lambda: delivered.append(1))
+    coalescer.add("org/repo", "hook", ["two"], on_delivered=lambda: delivered.append(2))
+    assert delivered == []
+    await coalescer.flush_all()
+    assert delivered == [1, 2]
+
+@pytest.mark.asyncio
+async def test_on_delivered_skipped_on_failure():
+    """Test that failed batches are not reported as delivered."""
+    delivered = []
+
+    async def send(target, content):
+        raise RuntimeError("discord down")
+
+    coalescer = EventCoalescer(send, window=60)
+    coalescer.add("org/repo", "hook", ["one"], on_delivered=lambda: delivered.append(1))
+    await coalescer.flush_all()
+    assert delivered == []
+
+@pytest.mark.asyncio
+async def test_fan_out_renders_once_per_line_set():
+    """Test that targets receiving the same lines get the same message."""
+    sent = []
+
+    async def send(target, content):
+        sent.append((target, content))
+
+    coalescer = EventCoalescer(send, window=60)
+    coalescer.add("org/repo", ["a", "b", "c"], ["one"])
+    coalescer.add("org/repo", ["c"], ["two"])
+    await coalescer.flush_all()
+    assert sorted(sent) == [
+        ("a", "**org/repo**\none"),
+        ("b", "**org/repo**\none"),
+        ("c", "**org/repo**\none\ntwo"),
+    ]
+    assert coalescer.messages_sent == 3
+
+@pytest.mark.asyncio
+async def test_fan_out_partial_failure_callbacks():
+    """Test that callbacks only count targets that received everything."""
+    delivered = []
+
+    async def send(target, content):
+        if target == "bad":
+            raise RuntimeError("discord down")
+
+    coalescer = EventCoalescer(send, window=60)
+    coalescer.add("org/repo", ["good", "bad"], ["one"], on_delivered=lambda: delivered.append(1))
+    await coalescer.flush_all()
+    assert delivered == [1]
+    assert coalescer.failures == 1
+
+@pytest.mark.asyncio
+async def test_permanent_failure_does_not_hold_back_callbacks():
+    """Test that a target rejecting the message counts as settled, unlike a transient failure."""
+    delivered = []
+
+    async def send(target, content):
+        if target == "deleted":
+            raise RuntimeError("Unknown Channel") from aiohttp.ClientResponseError(None, (), status=404)
+        if target == "down":
+            raise RuntimeError("discord down")
+
+    coalescer = EventCoalescer(send, window=60)
+    coalescer.add("org/repo", ["good", "deleted"], ["one"], on_delivered=lambda: delivered.append(1))
+    coalescer.add("org/repo", ["down"], ["two"], on_delivered=lambda: delivered.append(2))
+    await coalescer.flush_all()
+    assert delivered == [1, 1]
+    assert coalescer.failures == 2
@@ -0,0 +1,88 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, patch
+from src.utils.command_sync import CommandSync, command_hash, tree_payloads
+from src.utils.shared_state import SharedState
+
+COMMANDS = [{"name": "ping", "description": "Ping"}, {"name": "help", "description": "Help"}]
+
+def test_command_hash_ignores_order():
+    """Test that the hash depends on command content, not order."""
+    assert command_hash(COMMANDS) == command_hash(list(reversed(COMMANDS)))
+    changed = [{"name": "ping", "description": "Pong"}, COMMANDS[1]]
+    assert command_hash(changed) != command_hash(COMMANDS)
+
+@pytest.mark.asyncio
+async def test_sync_only_on_change(tmp_path):
+    """Test that unchanged commands are not synced again."""
+    sync = AsyncMock()
+    syncer = CommandSync(SharedState(str(tmp_path / "state.db")))
+    assert await syncer.sync_if_changed(COMMANDS, sync) is True
+    assert await syncer.sync_if_changed(COMMANDS, sync) is False
+    assert await syncer.sync_if_changed(COMMANDS[:1], sync) is True
+    assert sync.await_count == 2
+    syncer.state.close()
+
+@pytest.mark.asyncio
+async def test_one_replica_syncs(tmp_path):
+    """Test that replicas sharing state sync a new tree exactly once."""
+    path = str(tmp_path / "state.db")
+    replicas = [CommandSync(SharedState(path)) for _ in range(4)]
+    calls = []
+
+    async def sync():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+
+    results = await asyncio.gather(
+        *(replica.sync_if_changed(COMMANDS, sync) for replica in replicas)
+    )
+    assert len(calls) == 1
+    assert results.count(True) == 1
+    # A replica restarting later sees the stored hash
+    assert await CommandSync(SharedState(path)).sync_if_changed(COMMANDS, sync) is False
+    for replica in replicas:
+        replica.state.close()
+
+@pytest.mark.asyncio
+async def test_failed_sync_is_retried(tmp_path):
+    """Test that a failed sync releases the lease and records no hash."""
+    syncer = CommandSync(SharedState(str(tmp_path / "state.db")))
+    with pytest.raises(RuntimeError):
+        await syncer.sync_if_changed(COMMANDS, AsyncMock(side_effect=RuntimeError("429")))
+    sync = AsyncMock()
+    assert await syncer.sync_if_changed(COMMANDS, sync) is True
+    sync.assert_awaited_once()
+    syncer.state.close()
+
+@pytest.mark.asyncio
+async def test_state_failure_still_syncs(tmp_path):
+    """Test that an unavailable state store falls back to syncing."""
+    syncer = CommandSync(SharedState(str(tmp_path / "state.db")))
+    sync = AsyncMock()
+    with patch.object(syncer.state, "get", AsyncMock(side_effect=OSError("locked"))):
+        assert await syncer.sync_if_changed(COMMANDS, sync) is True
+    sync.assert_awaited_once()
+
+@pytest.mark.asyncio
+async def test_setup_hook_syncs_changed_tree_once(command_sync):
+    """Test that a restarted bot does not resync an unchanged command tree."""
+    from src.bot.bot import FlexRPLBot
+    syncs = []
+    for _ in range(2):
+        bot = FlexRPLBot()
+        with patch.object(bot.tree, "sync", AsyncMock()) as sync:
+            await bot.setup_hook()
+        syncs.append(sync.await_count)
+    assert syncs == [1, 0]
+    names = {command["name"] for command in tree_payloads(bot.tree)}
+    assert "githubsub" in names
+
+@pytest.mark.asyncio
+async def test_sync_without_state():
+    """Test that commands are always synced when no state is configured."""
+    sync = AsyncMock()
+    syncer = CommandSync(None)
+    assert await syncer.sync_if_changed(COMMANDS, sync) is True
+    assert await syncer.sync_if_changed(COMMANDS, sync) is True
+    assert sync.await_count == 2
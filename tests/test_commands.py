@@ -1,4 +1,5 @@
 import pytest
+import discord
 from unittest.mock import AsyncMock, MagicMock
 from discord.ext import commands
 
@@ -36,7 +37,81 @@ async def test_githubsub_command(bot):
 
     # Test the command
     interaction = AsyncMock()
-    await githubsub(interaction)
+    interaction.channel_id = 123
+    interaction.guild_id = 999
+    interaction.user.id = 42
+    interaction.permissions = discord.Permissions(manage_channels=True)
+    interaction.data = {
+        "name": "githubsub",
+        "options": [{"type": 3, "name": "repository", "value": "owner/repo"}],
+    }
+    await githubsub(interaction, repository="owner/repo")
 
-    # Verify defer was called with ephemeral=True
+    # Verify the subscription was deferred and confirmed ephemerally
     interaction.response.defer.assert_called_once_with(ephemeral=True)
+    interaction.followup.send.assert_called_once_with(
+        "✅ Subscribed <#123> to **owner/repo** (all events; all branches)",
+        ephemeral=True,
+    )
+
+
+@pytest.mark.asyncio
+async def test_ping_command_dispatches_through_registry(bot):
+    """Test the gateway ping command uses the shared registry handler."""
+    from src.bot.commands import setup_commands
+
+    commands = {}
+    def command_decorator(*args, **kwargs):
+        def inner(func):
+            commands[kwargs["name"]] = func
+            return func
+        return inner
+    bot.tree.command = command_decorator
+
+    await setup_commands(bot)
+    assert set(commands) == {"ping", "help", "githubsub", "githubunsub"}
+
+    interaction = AsyncMock()
+    await commands["ping"](interaction)
+    interaction.response.send_message.assert_called_once_with(
+        "Pong! 🏓 (Latency: 100ms)", ephemeral=True
+    )
+
+
+@pytest.mark.asyncio
+async def test_setup_commands_registers_on_real_tree():
+    """Test that registry commands are accepted by a real CommandTree."""
+    from src.bot.bot import FlexRPLBot
+    from src.bot.commands import setup_commands
+
+    real_bot = FlexRPLBot()
+    await setup_commands(real_bot)
+    names = {cmd.name for cmd in real_bot.tree.get_commands()}
+    assert names == {"ping", "help", "githubsub", "githubunsub"}
+    githubsub = real_bot.tree.get_command("githubsub")
+    assert [(p.name, p.required) for p in githubsub.parameters] == [
+        ("repository", True), ("events", False), ("branches", False)
+    ]
+    assert githubsub.get_parameter("repository").description == "Repository as owner/name"
+    assert githubsub.default_permissions.manage_channels is True
+    assert real_bot.tree.get_command("ping").default_permissions is None
+
+
+@pytest.mark.asyncio
+async def test_async_handler_deferred_on_gateway(bot, monkeypatch):
+    """Test that async registry handlers are deferred and followed up."""
+    from src.bot.commands import make_command_callback
+    from src.utils.dispatch import InteractionRegistry
+
+    test_registry = InteractionRegistry()
+
+    @test_registry.command("slow", description="Slow")
+    async def slow(interaction, client):
+        return {"type": 4, "data": {"content": "finished", "flags": 64}}
+
+    monkeypatch.setattr("src.bot.commands.interactions", test_registry)
+    interaction = AsyncMock()
+    interaction.data = {"name": "slow"}
+    await make_command_callback(bot, "slow")(interaction)
+    interaction.response.defer.assert_called_once_with(ephemeral=True)
+    interaction.followup.send.assert_called_once_with("finished", ephemeral=True)
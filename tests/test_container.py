@@ -0,0 +1,40 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from src.container import AppContainer, container
+
+def test_bot_created_once_on_first_use():
+    """Test that the container builds exactly one bot, lazily."""
+    factory = MagicMock(side_effect=lambda: MagicMock())
+    test_container = AppContainer(bot_factory=factory)
+    assert test_container.existing_bot is None
+    factory.assert_not_called()
+
+    bot = test_container.bot
+    assert test_container.bot is bot
+    assert test_container.existing_bot is bot
+    factory.assert_called_once()
+
+def test_app_is_the_shared_fastapi_app():
+    """Test that the container hands out the one FastAPI app."""
+    from app import app
+    assert AppContainer().app is app
+    assert container.app is app
+
+def test_importing_entry_points_creates_no_bot():
+    """Test that importing the app and main does not build a Discord client."""
+    import app  # noqa: F401
+    assert container.existing_bot is None
+
+@pytest.mark.asyncio
+async def test_close_shuts_down_bot_and_sessions():
+    """Test that close releases the bot connection and HTTP session."""
+    sessions = MagicMock(close=AsyncMock())
+    bot = MagicMock(close=AsyncMock(), is_closed=MagicMock(return_value=False))
+    test_container = AppContainer(bot_factory=lambda: bot, sessions=sessions)
+    await test_container.close()
+    bot.close.assert_not_called()
+    sessions.close.assert_awaited_once()
+
+    test_container.bot
+    await test_container.close()
+    bot.close.assert_awaited_once()
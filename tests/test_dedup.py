@@ -0,0 +1,98 @@
+import pytest
+from src.utils.dedup import DeliveryDeduplicator
+from src.utils.shared_state import SharedState
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+@pytest.mark.asyncio
+async def test_duplicate_delivery_rejected():
+    """Test that a delivery ID is only accepted once."""
+    dedup = DeliveryDeduplicator()
+    assert await dedup.check("abc") is True
+    assert await dedup.check("abc") is False
+    assert await dedup.check("def") is True
+    assert dedup.stats() == {
+        "hits": 1, "misses": 2, "shared_hits": 0, "cached": 2, "shared": False
+    }
+
+@pytest.mark.asyncio
+async def test_missing_delivery_id_allowed():
+    """Test that requests without a delivery ID are never deduplicated."""
+    dedup = DeliveryDeduplicator()
+    assert await dedup.check(None) is True
+    assert await dedup.check(None) is True
+    assert dedup.stats()["cached"] == 0
+
+@pytest.mark.asyncio
+async def test_delivery_expires_after_ttl():
+    """Test that delivery IDs are forgotten after the TTL."""
+    clock = FakeClock()
+    dedup = DeliveryDeduplicator(ttl=60, clock=clock)
+    await dedup.check("abc")
+    clock.now = 61
+    assert await dedup.check("abc") is True
+
+@pytest.mark.asyncio
+async def test_cache_is_bounded():
+    """Test that the oldest delivery is evicted once the cache is full."""
+    dedup = DeliveryDeduplicator(maxsize=2)
+    for delivery in ("a", "b", "c"):
+        await dedup.check(delivery)
+    assert dedup.stats()["cached"] == 2
+    assert await dedup.check("a") is True
+
+@pytest.mark.asyncio
+async def test_forget_allows_retry():
+    """Test that a forgotten delivery is accepted again."""
+    dedup = DeliveryDeduplicator()
+    await dedup.check("abc")
+    await dedup.forget("abc")
+    assert await dedup.check("abc") is True
+
+@pytest.mark.asyncio
+async def test_shared_backend_across_replicas(tmp_path):
+    """Test that replicas sharing a backend deduplicate together."""
+    path = str(tmp_path / "shared.db")
+    first = DeliveryDeduplicator(shared=SharedState(path))
+    second = DeliveryDeduplicator(shared=SharedState(path))
+
+    assert await first.check("abc") is True
+    assert await second.check("abc") is False
+    assert second.stats()["shared_hits"] == 1
+
+    await first.forget("abc")
+    assert await second.check("abc") is True
+    first.shared.close()
+    second.shared.close()
+
+@pytest.mark.asyncio
+async def test_shared_backend_expiry(tmp_path):
+    """Test that expired shared keys can be claimed again."""
+    clock = FakeClock()
+    state = SharedState(str(tmp_path / "shared.db"), clock=clock)
+    assert await state.add("ns", "key", 60) is True
+    assert await state.add("ns", "key", 60) is False
+    assert await state.add("other", "key", 60) is True
+    clock.now = 61
+    assert await state.add("ns", "key", 60) is True
+    clock.now = 200
+    assert await state.purge_expired() == 2
+    state.close()
+
+@pytest.mark.asyncio
+async def test_shared_backend_failure_falls_back(monkeypatch, tmp_path):
+    """Test that a broken shared backend does not block deliveries."""
+    state = SharedState(str(tmp_path / "shared.db"))
+
+    async def broken(*args):
+        raise RuntimeError("database is locked")
+
+    monkeypatch.setattr(state, "add", broken)
+    dedup = DeliveryDeduplicator(shared=state)
+    assert await dedup.check("abc") is True
+    assert await dedup.check("abc") is False
@@ -0,0 +1,86 @@
+import asyncio
+import aiohttp
+import pytest
+from fastapi import HTTPException
+from src.handlers.delivery import FanOutDelivery, is_retryable
+
+async def no_sleep(delay):
+    pass
+
+def response_error(status):
+    return aiohttp.ClientResponseError(None, (), status=status)
+
+@pytest.mark.asyncio
+async def test_sends_to_all_targets_concurrently():
+    """Test that targets are sent in parallel up to the concurrency limit."""
+    active = 0
+    peak = 0
+
+    async def send(target, content):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+
+    delivery = FanOutDelivery(send, concurrency=4)
+    targets = [f"t{i}" for i in range(10)]
+    results = await delivery.deliver(targets, "hello")
+    assert results == {target: True for target in targets}
+    assert peak == 4
+    assert delivery.stats()["max_in_flight"] == 4
+    assert delivery.stats()["sent"] == 10
+
+@pytest.mark.asyncio
+async def test_failure_is_isolated_per_target():
+    """Test that one failing target does not affect the others."""
+    async def send(target, content):
+        if target == "bad":
+            raise RuntimeError("boom")
+
+    delivery = FanOutDelivery(send, max_retries=2, sleep=no_sleep)
+    results = await delivery.deliver(["good", "bad", "also-good"], "hi")
+    assert results == {"good": True, "bad": False, "also-good": True}
+    assert delivery.stats()["retries"] == 2
+    assert delivery.stats()["failed"] == 1
+
+@pytest.mark.asyncio
+async def test_retry_with_backoff_then_success():
+    """Test that transient failures are retried with exponential backoff."""
+    attempts = []
+    delays = []
+
+    async def send(target, content):
+        attempts.append(target)
+        if len(attempts) < 3:
+            raise HTTPException(status_code=500) from response_error(502)
+
+    async def sleep(delay):
+        delays.append(delay)
+
+    delivery = FanOutDelivery(send, max_retries=3, retry_delay=0.5, sleep=sleep)
+    assert await delivery.deliver(["t"], "hi") == {"t": True}
+    assert delays == [0.5, 1.0]
+
+@pytest.mark.asyncio
+async def test_client_errors_not_retried():
+    """Test that 4xx responses such as a deleted channel are not retried."""
+    attempts = 0
+
+    async def send(target, content):
+        nonlocal attempts
+        attempts += 1
+        raise HTTPException(status_code=500) from response_error(404)
+
+    delivery = FanOutDelivery(send, max_retries=3, sleep=no_sleep)
+    rejected = set()
+    assert await delivery.deliver(["t"], "hi", rejected) == {"t": False}
+    assert attempts == 1
+    assert rejected == {"t"}
+
+def test_is_retryable():
+    """Test classification of delivery errors."""
+    assert is_retryable(RuntimeError("network"))
+    assert is_retryable(response_error(503))
+    assert is_retryable(response_error(429))
+    assert not is_retryable(response_error(403))
@@ -0,0 +1,50 @@
+import pytest
+from config import config
+from src.utils import discord_api
+
+@pytest.fixture
+def sent(monkeypatch):
+    calls = []
+
+    async def fake_send(url, payload, headers=None, method="POST"):
+        calls.append((method, url, payload, headers))
+        return 200
+
+    monkeypatch.setattr("src.utils.discord_api.rate_limiter.send", fake_send)
+    monkeypatch.setattr(config, "DISCORD_BOT_TOKEN", "bot-token")
+    monkeypatch.setattr(config, "DISCORD_APPLICATION_ID", "42")
+    return calls
+
+@pytest.mark.asyncio
+async def test_sync_commands_puts_global_commands(sent):
+    """Test that commands are bulk-overwritten with the bot token."""
+    await discord_api.sync_commands([{"name": "ping"}])
+    assert sent == [(
+        "PUT",
+        "https://discord.com/api/v10/applications/42/commands",
+        [{"name": "ping"}],
+        {"Authorization": "Bot bot-token"},
+    )]
+
+@pytest.mark.asyncio
+async def test_send_followup_uses_interaction_token(sent):
+    """Test that follow-ups go to the interaction webhook without the bot token."""
+    await discord_api.send_followup(
+        {"application_id": "7", "token": "tok"}, {"content": "done"}
+    )
+    assert sent == [(
+        "POST", "https://discord.com/api/v10/webhooks/7/tok", {"content": "done"}, None
+    )]
+
+def test_needs_bot_auth():
+    """Test which Discord URLs are authenticated as the bot."""
+    assert discord_api.needs_bot_auth(discord_api.channel_messages_url("1"))
+    assert not discord_api.needs_bot_auth(discord_api.followup_url("1", "t"))
+    assert not discord_api.needs_bot_auth("https://example.com/hook")
+
+def test_http_only_flag(monkeypatch):
+    """Test the DISCORD_MODE switch."""
+    monkeypatch.setattr(config, "DISCORD_MODE", "gateway")
+    assert config.http_only is False
+    monkeypatch.setattr(config, "DISCORD_MODE", " HTTP ")
+    assert config.http_only is True
@@ -2,7 +2,10 @@ import pytest
 from fastapi.testclient import TestClient
 from nacl.signing import SigningKey
 import json
-from src.routes.discord import router, get_verify_key
+import time
+from unittest.mock import AsyncMock
+from src.routes.discord import router, get_verify_key, replay_guard
+from src.utils.verification import InteractionVerifier
 from fastapi import FastAPI
 from config import config
 from discord import InteractionType, InteractionResponseType
@@ -15,15 +18,24 @@ client = TestClient(app)
 # Create a signing key pair for testing
 signing_key = SigningKey.generate()
 verify_key = signing_key.verify_key
+test_verifier = InteractionVerifier(verify_key.encode().hex())
 
-def create_signed_headers(body: str, timestamp: str = "1234567890"):
+def create_signed_headers(body: str, timestamp: str = None):
     """Create signed headers for Discord interaction testing."""
+    if timestamp is None:
+        timestamp = str(int(time.time()))
     signature = signing_key.sign(f"{timestamp}{body}".encode()).signature.hex()
     return {
         "X-Signature-Ed25519": signature,
         "X-Signature-Timestamp": timestamp
     }
 
+@pytest.fixture(autouse=True)
+def reset_replay_guard():
+    replay_guard.reset()
+    yield
+    replay_guard.reset()
+
 @pytest.fixture
 def ping_payload():
     return json.dumps({"type": 1})
@@ -59,7 +71,7 @@ def command_payload():
 def test_ping_interaction(ping_payload, monkeypatch):
     """Test handling of Discord ping interaction."""
     # Mock the verify key
-    monkeypatch.setattr("src.routes.discord.get_verify_key", lambda: verify_key)
+    monkeypatch.setattr("src.routes.discord.get_verifier", lambda: test_verifier)
     
     headers = create_signed_headers(ping_payload)
     response = client.post(
@@ -74,7 +86,7 @@ def test_ping_interaction(ping_payload, monkeypatch):
 def test_invalid_signature(ping_payload, monkeypatch):
     """Test handling of invalid signatures."""
     # Mock the verify key
-    monkeypatch.setattr("src.routes.discord.get_verify_key", lambda: verify_key)
+    monkeypatch.setattr("src.routes.discord.get_verifier", lambda: test_verifier)
     
     headers = {
         "X-Signature-Ed25519": "invalid",
@@ -101,11 +113,14 @@ def test_missing_headers(ping_payload):
 async def test_command_interaction(command_payload, monkeypatch):
     """Test handling of Discord command interaction."""
     # Mock the verify key
-    monkeypatch.setattr("src.routes.discord.get_verify_key", lambda: verify_key)
+    monkeypatch.setattr("src.routes.discord.get_verifier", lambda: test_verifier)
+    monkeypatch.setattr("src.routes.discord.send_followup", AsyncMock())
 
     # Create a test payload with a specific command
     payload = json.loads(command_payload)
     payload["type"] = InteractionType.application_command.value
+    payload["channel_id"] = "123"
+    payload["member"] = {"user": {"id": "42"}, "permissions": "16"}
     payload["data"] = {"name": "githubsub", "options": [{"name": "repository", "value": "owner/repo"}]}
     command_payload = json.dumps(payload)
 
@@ -122,10 +137,7 @@ async def test_command_interaction(command_payload, monkeypatch):
     # Check response based on command type
     command_name = payload["data"]["name"]
     if command_name == "githubsub":
-        assert response_data == {
-            "type": 5,  # Use the raw value instead of enum
-            "data": {"flags": 64}
-        }
+        assert response_data == {"type": 5, "data": {"flags": 64}}  # Deferred write
     elif command_name == "ping":
         assert response_data["type"] == 4  # Immediate response
         assert "Pong!" in response_data["data"]["content"]
@@ -136,4 +148,165 @@ async def test_command_interaction(command_payload, monkeypatch):
         assert response_data == {
             "type": 4,
             "data": {"content": "Unknown command", "flags": 64}
-        }
\ No newline at end of file
+        }
+
+def test_non_object_interaction_rejected(monkeypatch):
+    """Test that signed JSON other than an object is a client error."""
+    monkeypatch.setattr("src.routes.discord.get_verifier", lambda: test_verifier)
+    for body in ("[1, 2]", "null"):
+        response = client.post(
+            "/discord-interaction", headers=create_signed_headers(body), content=body
+        )
+        assert response.status_code == 400
+
+def test_help_command_interaction(command_payload, monkeypatch):
+    """Test that the help command is dispatched through the registry."""
+    monkeypatch.setattr("src.routes.discord.get_verifier", lambda: test_verifier)
+
+    payload = json.loads(command_payload)
+    payload["data"] = {"name": "help"}
+    body = json.dumps(payload)
+
+    response = client.post(
+        "/discord-interaction",
+        headers=create_signed_headers(body),
+        content=body
+    )
+
+    assert response.status_code == 200
+    assert response.json()["type"] == 4
+    assert "`/ping` - Check bot latency" in response.json()["data"]["content"]
+
+
+
+def test_stale_timestamp_rejected(ping_payload, monkeypatch):
+    """Test that requests outside the clock-skew window are rejected."""
+    monkeypatch.setattr("src.routes.discord.get_verifier", lambda: test_verifier)
+
+    stale = str(int(time.time()) - replay_guard.tolerance - 10)
+    response = client.post(
+        "/discord-interaction",
+        headers=create_signed_headers(ping_payload, stale),
+        content=ping_payload
+    )
+
+    assert response.status_code == 401
+    assert replay_guard.rejections["stale_timestamp"] == 1
+
+
+def test_replayed_request_rejected(ping_payload, monkeypatch):
+    """Test that the exact same signed request is only processed once."""
+    monkeypatch.setattr("src.routes.discord.get_verifier", lambda: test_verifier)
+
+    headers = create_signed_headers(ping_payload)
+    first = client.post("/discord-interaction", headers=headers, content=ping_payload)
+    second = client.post("/discord-interaction", headers=headers, content=ping_payload)
+
+    assert first.status_code == 200
+    assert second.status_code == 409
+    assert replay_guard.rejections["replayed_signature"] == 1
+
+
+def test_duplicate_interaction_id_rejected(command_payload, monkeypatch):
+    """Test that a re-signed retry of the same interaction is dropped."""
+    monkeypatch.setattr("src.routes.discord.get_verifier", lambda: test_verifier)
+
+    now = int(time.time())
+    first = client.post(
+        "/discord-interaction",
+        headers=create_signed_headers(command_payload, str(now)),
+        content=command_payload
+    )
+    retry = client.post(
+        "/discord-interaction",
+        headers=create_signed_headers(command_payload, str(now + 1)),
+        content=command_payload
+    )
+
+    assert first.status_code == 200
+    assert retry.status_code == 409
+    assert replay_guard.rejections["duplicate_interaction"] == 1
+
+
+def test_replay_to_another_worker_rejected(command_payload, monkeypatch):
+    """Test that a replay is refused by a worker that has not seen it locally."""
+    monkeypatch.setattr("src.routes.discord.get_verifier", lambda: test_verifier)
+
+    headers = create_signed_headers(command_payload)
+    first = client.post("/discord-interaction", headers=headers, content=command_payload)
+    # A sibling worker shares the claims but not this worker's caches
+    replay_guard.reset()
+    replay = client.post("/discord-interaction", headers=headers, content=command_payload)
+
+    assert first.status_code == 200
+    assert replay.status_code == 409
+    assert replay_guard.rejections["duplicate_interaction"] == 1
+
+
+def test_ping_reports_container_bot_latency(monkeypatch):
+    """Test that /ping reports latency from the container's bot."""
+    from unittest.mock import MagicMock
+    from src.container import container
+
+    monkeypatch.setattr("src.routes.discord.get_verifier", lambda: test_verifier)
+    monkeypatch.setattr(container, "_bot", MagicMock(latency=0.042))
+    payload = json.dumps({"type": 2, "id": "container-ping", "data": {"name": "ping"}})
+    response = client.post(
+        "/discord-interaction", headers=create_signed_headers(payload), content=payload
+    )
+    assert response.json()["data"]["content"] == "Pong! 🏓 (Latency: 42ms)"
+
+@pytest.mark.asyncio
+async def test_async_handler_deferred_with_rest_followup(monkeypatch):
+    """Test that async handlers are deferred and finished by a REST follow-up."""
+    import asyncio
+    import httpx
+    from src.routes import discord as discord_routes
+    from src.utils.dispatch import InteractionRegistry
+
+    test_registry = InteractionRegistry()
+
+    @test_registry.command("slow")
+    async def slow(interaction, client):
+        await asyncio.sleep(0)
+        return {"type": 4, "data": {"content": "finished", "flags": 64}}
+
+    followups = []
+
+    async def fake_followup(interaction, data):
+        followups.append((interaction["token"], data))
+
+    monkeypatch.setattr("src.routes.discord.get_verifier", lambda: test_verifier)
+    monkeypatch.setattr("src.routes.discord.interactions", test_registry)
+    monkeypatch.setattr("src.routes.discord.send_followup", fake_followup)
+
+    payload = json.dumps({"type": 2, "id": "slow-1", "token": "tok", "data": {"name": "slow"}})
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as ac:
+        response = await ac.post(
+            "/discord-interaction", headers=create_signed_headers(payload), content=payload
+        )
+    assert response.json() == {"type": 5, "data": {"flags": 64}}
+
+    await asyncio.gather(*discord_routes.followup_tasks)
+    assert followups == [("tok", {"content": "finished", "flags": 64})]
+
+def test_interaction_metrics_recorded(command_payload, monkeypatch):
+    """Test that an interaction records type, verify, parse and handler metrics."""
+    from src.utils import metrics
+    monkeypatch.setattr("src.routes.discord.get_verifier", lambda: test_verifier)
+    commands = metrics.interaction_requests.value("application_command")
+    verifies = metrics.interaction_verify_seconds.count()
+    handled = metrics.interaction_handler_seconds.count("test_command")
+
+    response = client.post(
+        "/discord-interaction",
+        headers=create_signed_headers(command_payload),
+        content=command_payload
+    )
+
+    assert response.status_code == 200
+    assert metrics.interaction_requests.value("application_command") == commands + 1
+    assert metrics.interaction_verify_seconds.count() == verifies + 1
+    assert metrics.interaction_dispatch_seconds.count("test_command") >= 1
+    assert metrics.interaction_handler_seconds.count("test_command") == handled + 1
@@ -0,0 +1,152 @@
+import pytest
+from src.utils.dispatch import (
+    APPLICATION_COMMAND,
+    APPLICATION_COMMAND_AUTOCOMPLETE,
+    MESSAGE_COMPONENT,
+    MODAL_SUBMIT,
+    PING,
+    CommandOption,
+    InteractionRegistry,
+    interaction_path,
+    option_values,
+)
+
+@pytest.fixture
+def registry():
+    return InteractionRegistry()
+
+def test_interaction_path_command():
+    """Test command path resolution without subcommands."""
+    interaction = {"type": APPLICATION_COMMAND, "data": {"name": "ping"}}
+    assert interaction_path(interaction) == ("ping",)
+
+def test_interaction_path_subcommands():
+    """Test that subcommand groups and subcommands extend the path."""
+    interaction = {
+        "type": APPLICATION_COMMAND,
+        "data": {
+            "name": "repo",
+            "options": [{
+                "type": 2,
+                "name": "webhooks",
+                "options": [{
+                    "type": 1,
+                    "name": "add",
+                    "options": [{"type": 3, "name": "url", "value": "x"}],
+                }],
+            }],
+        },
+    }
+    assert interaction_path(interaction) == ("repo", "webhooks", "add")
+
+def test_interaction_path_plain_options():
+    """Test that value options are not part of the path."""
+    interaction = {
+        "type": APPLICATION_COMMAND,
+        "data": {"name": "githubsub", "options": [{"type": 3, "name": "repository"}]},
+    }
+    assert interaction_path(interaction) == ("githubsub",)
+
+def test_interaction_path_components():
+    """Test that components and modals route on custom_id."""
+    assert interaction_path(
+        {"type": MESSAGE_COMPONENT, "data": {"custom_id": "confirm"}}
+    ) == ("confirm",)
+    assert interaction_path(
+        {"type": MODAL_SUBMIT, "data": {"custom_id": "feedback"}}
+    ) == ("feedback",)
+    assert interaction_path({"type": PING}) == ()
+
+def test_dispatch_by_type_and_name(registry):
+    """Test that handlers are selected by type and name."""
+    registry.on(PING)(lambda interaction, client: "pong")
+    registry.command("ping")(lambda interaction, client: "command")
+    registry.on(APPLICATION_COMMAND_AUTOCOMPLETE, "ping")(
+        lambda interaction, client: "autocomplete"
+    )
+
+    assert registry.dispatch({"type": PING}) == "pong"
+    assert registry.dispatch({"type": APPLICATION_COMMAND, "data": {"name": "ping"}}) == "command"
+    assert registry.dispatch(
+        {"type": APPLICATION_COMMAND_AUTOCOMPLETE, "data": {"name": "ping"}}
+    ) == "autocomplete"
+
+def test_dispatch_most_specific_handler(registry):
+    """Test that subcommand handlers win over the parent command."""
+    registry.command("repo")(lambda interaction, client: "parent")
+    registry.command("repo", "add")(lambda interaction, client: "add")
+
+    def command(sub):
+        return {
+            "type": APPLICATION_COMMAND,
+            "data": {"name": "repo", "options": [{"type": 1, "name": sub}]},
+        }
+
+    assert registry.dispatch(command("add")) == "add"
+    assert registry.dispatch(command("remove")) == "parent"
+
+def test_dispatch_passes_client(registry):
+    """Test that the client is handed to the handler."""
+    registry.command("who")(lambda interaction, client: client)
+    interaction = {"type": APPLICATION_COMMAND, "data": {"name": "who"}}
+    assert registry.dispatch(interaction, "bot") == "bot"
+
+def test_dispatch_unknown(registry):
+    """Test that unknown interactions return None."""
+    assert registry.dispatch({"type": APPLICATION_COMMAND, "data": {"name": "nope"}}) is None
+
+def test_duplicate_registration(registry):
+    """Test that registering the same route twice fails."""
+    registry.command("ping")(lambda interaction, client: None)
+    with pytest.raises(ValueError):
+        registry.command("ping")(lambda interaction, client: None)
+
+def test_commands_listing(registry):
+    """Test that only top-level commands are listed with descriptions."""
+    registry.command("ping", description="Check latency")(lambda i, c: None)
+    registry.command("repo", "add")(lambda i, c: None)
+    assert registry.commands() == [("ping", "Check latency")]
+
+def test_option_values_flattens_subcommands():
+    """Test that leaf option values are returned by name."""
+    interaction = {
+        "type": APPLICATION_COMMAND,
+        "data": {"name": "repo", "options": [{
+            "type": 1, "name": "add",
+            "options": [{"type": 3, "name": "repository", "value": "org/repo"}],
+        }]},
+    }
+    assert option_values(interaction) == {"repository": "org/repo"}
+    assert option_values({"type": APPLICATION_COMMAND, "data": {"name": "x"}}) == {}
+
+def test_command_options_recorded():
+    """Test that declared command options are kept with the command."""
+    registry = InteractionRegistry()
+
+    @registry.command("sub", description="Subscribe",
+                      options=(CommandOption("repository", "Repo"),))
+    def sub(interaction, client):
+        return None
+
+    assert registry.command_options("sub") == (CommandOption("repository", "Repo", True),)
+    assert registry.command_options("missing") == ()
+
+def test_command_payloads():
+    """Test commands are described in Discord's application command format."""
+    registry = InteractionRegistry()
+
+    @registry.command("sub", description="Subscribe",
+                      options=(CommandOption("repository", "Repo"),
+                               CommandOption("events", "Events", False)))
+    def sub(interaction, client):
+        return None
+
+    assert registry.command_payloads() == [{
+        "name": "sub",
+        "description": "Subscribe",
+        "type": 1,
+        "options": [
+            {"type": 3, "name": "repository", "description": "Repo", "required": True},
+            {"type": 3, "name": "events", "description": "Events", "required": False},
+        ],
+    }]
@@ -1,10 +1,16 @@
+import json
 import pytest
+from pathlib import Path
 from src.utils.formatting import (
+    FORMATTERS,
+    MessageTemplate,
+    register_formatter,
     format_commit_message,
     format_pull_request_message,
     format_issue_message,
     format_github_event,
     format_pr_event,
+    format_event_lines,
 )
 
 def test_format_commit_message():
@@ -129,3 +135,86 @@ def test_format_pr_event():
         "URL: None"
     )
     assert format_pr_event(empty_payload) == expected_empty
+
+def test_format_event_lines():
+    """Test that push commits become one line each"""
+    payload = {
+        "commits": [
+            {"author": {"name": "A"}, "message": "first", "url": "u1"},
+            {"author": {"name": "B"}, "message": "second", "url": "u2"},
+        ]
+    }
+    assert format_event_lines("push", payload) == [
+        format_commit_message(payload["commits"][0]),
+        format_commit_message(payload["commits"][1]),
+    ]
+    assert format_event_lines("issues", {}) == [format_github_event("issues", {})]
+
+def test_message_template_paths_and_defaults():
+    """Test dotted field lookups and fallbacks for missing values"""
+    template = MessageTemplate(
+        "{a.b.c} / {a.missing} / {x}", defaults={"a.missing": "n/a"}, default="?"
+    )
+    assert template.render({"a": {"b": {"c": 1}}, "x": None}) == "1 / n/a / ?"
+    assert template({"a": "not a dict"}) == "? / n/a / ?"
+
+def test_formatter_action_specific_lookup():
+    """Test that (event, action) formatters take precedence over the event default"""
+    merged = {
+        "action": "closed",
+        "pull_request": {
+            "number": 5, "title": "T", "html_url": "u",
+            "merged": True, "merged_by": {"login": "maintainer"},
+            "user": {"login": "author"},
+        },
+    }
+    assert format_github_event("pull_request", merged).startswith(
+        "Pull Request #5 merged by maintainer"
+    )
+    merged["pull_request"]["merged"] = False
+    assert format_github_event("pull_request", merged).startswith(
+        "Pull Request #5 closed by author"
+    )
+
+def test_null_objects_in_payload():
+    """Test that null nested objects format instead of raising"""
+    closed = format_github_event("pull_request", {"action": "closed", "pull_request": None})
+    assert closed.startswith("Pull Request #")
+    assert format_commit_message({"author": None, "message": "m"}).startswith("• Unknown: m")
+
+def test_register_formatter():
+    """Test registering a custom formatter"""
+    register_formatter("ping", None, lambda payload: f"zen: {payload['zen']}")
+    try:
+        assert format_github_event("ping", {"zen": "Keep it simple"}) == "zen: Keep it simple"
+    finally:
+        FORMATTERS.pop(("ping", None))
+
+def test_recorded_payload_corpus():
+    """Test every event in the benchmark corpus has a dedicated formatter"""
+    corpus_path = Path(__file__).parent.parent / "benchmarks" / "payloads" / "github_events.json"
+    corpus = json.loads(corpus_path.read_text(encoding="utf-8"))
+    expected = {
+        "push": "🔨 octocat pushed 3 commit(s) to fleXRPL/flexrpl-discord-bot:main",
+        "release": "🚀 Release v1.2.0 published by octocat",
+        "workflow_run": "⚙️ Workflow Deploy fleXRPL Discord Bot finished: success on main",
+        "check_suite": "✅ Check suite completed: failure on feature",
+        "issue_comment": "💬 octocat commented on #7: Bot is slow",
+        "pull_request_review": "👀 octocat approved Pull Request #12: Add coalescing",
+        "create": "🌱 octocat created branch feature",
+        "delete": "🗑️ octocat deleted branch feature",
+        "star": "⭐ octocat starred fleXRPL/flexrpl-discord-bot (42 stars)",
+    }
+    for item in corpus:
+        message = format_github_event(item["event"], item["payload"])
+        assert not message.startswith("Received")
+        if item["event"] in expected:
+            assert message.startswith(expected[item["event"]])
+
+def test_push_message_keeps_full_branch_name():
+    """Test that pushes keep nested branch names and do not show tags as branches"""
+    payload = {"pusher": {"name": "octocat"}, "repository": {"full_name": "org/repo"}}
+    branch = format_github_event("push", {**payload, "ref": "refs/heads/feature/x"})
+    assert branch.startswith("🔨 octocat pushed 0 commit(s) to org/repo:feature/x\n")
+    tag = format_github_event("push", {**payload, "ref": "refs/tags/v1.0"})
+    assert tag.startswith("🔨 octocat pushed 0 commit(s) to org/repo:refs/tags/v1.0\n")
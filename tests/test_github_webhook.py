@@ -0,0 +1,484 @@
+import hashlib
+import hmac
+import json
+import uuid
+import time
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from config import config
+from src.handlers.github_webhook import router
+from src.handlers.webhook_queue import QueuedEvent, WebhookQueue
+from src.utils.dedup import DeliveryDeduplicator
+from src.utils.verification import GitHubSignatureVerifier
+
+app = FastAPI()
+app.include_router(router)
+client = TestClient(app)
+
+SECRET = "test-webhook-secret"
+
+def signed_headers(body: bytes, event: str = "issues", delivery: str = None):
+    digest = hmac.new(SECRET.encode(), body, hashlib.sha256).hexdigest()
+    return {
+        "X-Hub-Signature-256": f"sha256={digest}",
+        "X-GitHub-Event": event,
+        "X-GitHub-Delivery": delivery or str(uuid.uuid4()),
+        "Content-Type": "application/json",
+    }
+
+@pytest.fixture(autouse=True)
+def webhook_secret(monkeypatch):
+    monkeypatch.setattr(
+        "src.handlers.github_webhook.github_verifier",
+        GitHubSignatureVerifier([SECRET]),
+    )
+
+@pytest.fixture(autouse=True)
+def dedup(monkeypatch):
+    deduplicator = DeliveryDeduplicator()
+    monkeypatch.setattr("src.handlers.github_webhook.delivery_dedup", deduplicator)
+    return deduplicator
+
+@pytest.fixture
+def queue(monkeypatch):
+    async def handler(event):
+        pass
+    test_queue = WebhookQueue(handler, maxsize=1, workers=1)
+    monkeypatch.setattr("src.handlers.github_webhook.webhook_queue", test_queue)
+    return test_queue
+
+def test_webhook_accepted_and_queued(queue):
+    """Test that a verified webhook is queued and answered with 202."""
+    body = json.dumps({"action": "opened", "issue": {"number": 1}}).encode()
+    response = client.post(
+        "/github", content=body, headers=signed_headers(body, delivery="delivery-1")
+    )
+
+    assert response.status_code == 202
+    assert response.json() == {"status": "accepted"}
+    event = queue.queue.get_nowait()
+    assert event.event_type == "issues"
+    assert event.delivery_id == "delivery-1"
+    assert event.payload["issue"]["number"] == 1
+
+def test_webhook_queue_full(queue):
+    """Test that a full queue sheds load with 503."""
+    body = b"{}"
+    assert client.post("/github", content=body, headers=signed_headers(body)).status_code == 202
+    response = client.post("/github", content=body, headers=signed_headers(body))
+    assert response.status_code == 503
+    assert queue.dropped == 1
+
+def test_webhook_invalid_signature(queue):
+    """Test that an invalid signature is rejected before queueing."""
+    headers = signed_headers(b"{}")
+    response = client.post("/github", content=b'{"x": 1}', headers=headers)
+    assert response.status_code == 401
+    assert queue.enqueued == 0
+
+def test_webhook_missing_signature(queue):
+    """Test that a missing signature header is rejected."""
+    response = client.post("/github", content=b"{}")
+    assert response.status_code == 400
+
+@pytest.mark.asyncio
+async def test_process_queued_event_coalesces_push(monkeypatch):
+    """Test that queued push events are batched per repository."""
+    from src.handlers.coalescer import EventCoalescer
+    from src.handlers.github_webhook import process_queued_event
+    from src.handlers.webhook_queue import QueuedEvent
+
+    sent = []
+
+    async def send(target, content):
+        sent.append((target, content))
+
+    test_coalescer = EventCoalescer(send, window=60)
+    monkeypatch.setattr("src.handlers.github_webhook.coalescer", test_coalescer)
+    monkeypatch.setattr(config, "DISCORD_WEBHOOK_URL", "https://discord.test/hook")
+
+    payload = {
+        "repository": {"full_name": "org/repo"},
+        "commits": [{"author": {"name": "A"}, "message": "fix", "url": "u"}],
+    }
+    await process_queued_event(QueuedEvent("push", payload))
+    await process_queued_event(QueuedEvent("push", payload))
+    await test_coalescer.flush_all()
+
+    assert sent == [(
+        "https://discord.test/hook",
+        "**org/repo**\n• A: fix\n  u\n• A: fix\n  u",
+    )]
+
+@pytest.mark.asyncio
+async def test_process_queued_event_without_target(monkeypatch):
+    """Test that events are dropped when no webhook is configured."""
+    from src.handlers.github_webhook import coalescer, process_queued_event
+    from src.handlers.webhook_queue import QueuedEvent
+
+    monkeypatch.setattr(config, "DISCORD_WEBHOOK_URL", "")
+    await process_queued_event(QueuedEvent("issues", {}))
+    await process_queued_event(QueuedEvent("issues", {"repository": None}))
+    assert coalescer.pending == 0
+
+def test_webhook_payload_too_large_declared(queue, monkeypatch):
+    """Test that an oversized Content-Length is rejected before reading."""
+    monkeypatch.setattr(config, "GITHUB_MAX_PAYLOAD_BYTES", 10)
+    body = json.dumps({"padding": "x" * 100}).encode()
+    response = client.post("/github", content=body, headers=signed_headers(body))
+    assert response.status_code == 413
+    assert queue.enqueued == 0
+
+def test_webhook_payload_too_large_streamed(queue, monkeypatch):
+    """Test that the cap also applies to chunked bodies without a length."""
+    monkeypatch.setattr(config, "GITHUB_MAX_PAYLOAD_BYTES", 10)
+    body = json.dumps({"padding": "x" * 100}).encode()
+
+    def chunks():
+        yield body[:50]
+        yield body[50:]
+
+    response = client.post("/github", content=chunks(), headers=signed_headers(body))
+    assert response.status_code == 413
+
+def test_webhook_chunked_body_verified(queue):
+    """Test that streamed chunks are verified and parsed once."""
+    body = json.dumps({"action": "opened", "commits": ["c"] * 1000}).encode()
+
+    def chunks():
+        for start in range(0, len(body), 1024):
+            yield body[start:start + 1024]
+
+    response = client.post("/github", content=chunks(), headers=signed_headers(body))
+    assert response.status_code == 202
+    assert len(queue.queue.get_nowait().payload["commits"]) == 1000
+
+def test_webhook_invalid_json(queue):
+    """Test that a signed but malformed body is a client error."""
+    body = b"{not json"
+    response = client.post("/github", content=body, headers=signed_headers(body))
+    assert response.status_code == 400
+
+def test_webhook_non_object_json(queue):
+    """Test that signed JSON other than an object is rejected, not spooled."""
+    for body in (b"[1,2]", b"null"):
+        headers = signed_headers(body, delivery="not-an-object")
+        response = client.post("/github", content=body, headers=headers)
+        assert response.status_code == 400
+    assert queue.enqueued == 0
+
+@pytest.mark.asyncio
+async def test_verify_signature_short_content_length(monkeypatch):
+    """Test a body longer than its declared Content-Length still verifies."""
+    from starlette.requests import Request
+    from src.handlers.github_webhook import verify_signature
+
+    body = b'{"hello": "world"}'
+    headers = signed_headers(body)
+    chunks = [body[:5], body[5:]]
+
+    async def receive():
+        chunk = chunks.pop(0)
+        return {"type": "http.request", "body": chunk, "more_body": bool(chunks)}
+
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "headers": [
+            (b"x-hub-signature-256", headers["X-Hub-Signature-256"].encode()),
+            (b"content-length", b"8"),
+        ],
+    }
+    assert await verify_signature(Request(scope, receive)) == bytearray(body)
+
+
+def test_webhook_sha1_signature(queue):
+    """Test that the legacy X-Hub-Signature header is accepted."""
+    body = b'{"zen": "Keep it logically awesome."}'
+    digest = hmac.new(SECRET.encode(), body, hashlib.sha1).hexdigest()
+    response = client.post(
+        "/github",
+        content=body,
+        headers={"X-Hub-Signature": f"sha1={digest}", "X-GitHub-Event": "ping"},
+    )
+    assert response.status_code == 202
+
+def test_webhook_rotated_secret(queue, monkeypatch):
+    """Test that old and new secrets are both accepted during rotation."""
+    monkeypatch.setattr(
+        "src.handlers.github_webhook.github_verifier",
+        GitHubSignatureVerifier(["new-secret-value", SECRET]),
+    )
+    body = b"{}"
+    response = client.post("/github", content=body, headers=signed_headers(body))
+    assert response.status_code == 202
+
+@pytest.fixture
+def spool(tmp_path, monkeypatch):
+    from src.utils.spool import EventSpool
+    test_spool = EventSpool(str(tmp_path / "events.db"), flush_interval=0)
+    monkeypatch.setattr("src.handlers.github_webhook.event_spool", test_spool)
+    return test_spool
+
+@pytest.mark.asyncio
+async def test_webhook_spooled_before_accept(queue, spool):
+    """Test that the raw body is spooled before the 202 is sent."""
+    import httpx
+
+    await spool.open()
+    body = b'{"action": "opened"}'
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as ac:
+        response = await ac.post("/github", content=body, headers=signed_headers(body))
+    assert response.status_code == 202
+
+    event = queue.queue.get_nowait()
+    spooled = await spool.replay()
+    await spool.close()
+    assert [(s.spool_id, s.event_type, s.body) for s in spooled] == [
+        (event.spool_id, "issues", body)
+    ]
+
+@pytest.mark.asyncio
+async def test_spooled_events_replayed_and_acked(spool, monkeypatch):
+    """Test that undelivered events are replayed on startup and acked once sent."""
+    from src.handlers.coalescer import EventCoalescer
+    from src.handlers import github_webhook
+    from src.handlers.github_webhook import process_queued_event, start_ingestion
+
+    sent = []
+
+    async def send(target, content):
+        sent.append(content)
+
+    test_coalescer = EventCoalescer(send, window=60)
+    test_queue = WebhookQueue(process_queued_event, maxsize=10, workers=1)
+    monkeypatch.setattr("src.handlers.github_webhook.coalescer", test_coalescer)
+    monkeypatch.setattr("src.handlers.github_webhook.webhook_queue", test_queue)
+    monkeypatch.setattr(config, "DISCORD_WEBHOOK_URL", "https://discord.test/hook")
+
+    await spool.open()
+    body = json.dumps({"repository": {"full_name": "org/repo"}, "ref": "v1",
+                       "ref_type": "tag", "sender": {"login": "octo"}}).encode()
+    await spool.append("create", body, "delivery-1")
+    await spool.close()
+
+    await start_ingestion()
+    await github_webhook.resume_task
+    await test_queue.stop()
+    await test_coalescer.flush_all()
+    assert sent == ["**org/repo**\n🌱 octo created tag v1 in org/repo"]
+    await spool.close()
+
+    await spool.open()
+    assert await spool.replay() == []
+    await spool.close()
+
+@pytest.mark.asyncio
+async def test_spool_replayed_by_one_worker(spool, monkeypatch):
+    """Test that workers sharing a spool replay the previous run's events once."""
+    from src.handlers.github_webhook import replay_spooled_events
+
+    async def handler(event):
+        pass
+
+    test_queue = WebhookQueue(handler, maxsize=10, workers=1)
+    monkeypatch.setattr("src.handlers.github_webhook.webhook_queue", test_queue)
+
+    await spool.open()
+    await spool.append("push", b"{}", "before-start")
+    started_at = time.time()
+    monkeypatch.setattr("src.utils.spool.time.time", lambda: started_at + 1)
+    await spool.append("push", b"{}", "sibling-worker")
+
+    await replay_spooled_events(started_at)
+    await replay_spooled_events(started_at)
+    await spool.close()
+    events = [test_queue.queue.get_nowait() for _ in range(test_queue.queue.qsize())]
+    assert [event.delivery_id for event in events] == ["before-start"]
+
+@pytest.mark.asyncio
+async def test_failing_event_dead_lettered(spool, monkeypatch):
+    """Test that an event whose processing raises is not replayed again."""
+    from src.handlers.github_webhook import dead_letter_event, process_queued_event
+
+    def broken(event_type, payload):
+        raise AttributeError("'NoneType' object has no attribute 'get'")
+
+    monkeypatch.setattr("src.handlers.github_webhook.format_event_lines", broken)
+    monkeypatch.setattr(config, "DISCORD_WEBHOOK_URL", "https://discord.test/hook")
+    test_queue = WebhookQueue(
+        process_queued_event, maxsize=10, workers=1, on_error=dead_letter_event
+    )
+    await spool.open()
+    body = b'{"action": "closed", "pull_request": null}'
+    spool_id = await spool.append("pull_request", body, "delivery-1")
+    await test_queue.start()
+    test_queue.submit(
+        QueuedEvent("pull_request", json.loads(body), "delivery-1", spool_id=spool_id)
+    )
+    await test_queue.stop()
+    await spool.close()
+
+    await spool.open()
+    assert await spool.replay() == []
+    await spool.close()
+    assert spool.stats()["dead_lettered"] == 1
+
+@pytest.mark.asyncio
+async def test_event_acked_when_a_channel_is_gone(spool, monkeypatch):
+    """Test that a deleted channel does not keep the event spooled for replay."""
+    import aiohttp
+    from src.handlers.coalescer import EventCoalescer
+    from src.handlers.github_webhook import process_queued_event
+    from src.utils.subscriptions import Subscription, get_subscriptions
+
+    sent = []
+
+    async def send(target, content):
+        if target.endswith("/channels/2/messages"):
+            raise RuntimeError("Unknown Channel") from aiohttp.ClientResponseError(None, (), status=404)
+        sent.append(target)
+
+    test_coalescer = EventCoalescer(send, window=60)
+    monkeypatch.setattr("src.handlers.github_webhook.coalescer", test_coalescer)
+    for channel in ("1", "2"):
+        get_subscriptions().subscribe(Subscription(channel, "org/repo"))
+
+    await spool.open()
+    body = json.dumps({"repository": {"full_name": "org/repo"}, "ref": "v1",
+                       "ref_type": "tag", "sender": {"login": "octo"}}).encode()
+    spool_id = await spool.append("create", body, "delivery-1")
+    await process_queued_event(
+        QueuedEvent("create", json.loads(body), "delivery-1", spool_id=spool_id)
+    )
+    await test_coalescer.flush_all()
+    await spool.close()
+
+    await spool.open()
+    assert await spool.replay() == []
+    await spool.close()
+    assert [target.split("/")[-2] for target in sent] == ["1"]
+
+def test_webhook_redelivery_dropped(queue, dedup):
+    """Test that a redelivery with the same delivery ID is not queued twice."""
+    body = b'{"action": "opened"}'
+    headers = signed_headers(body, delivery="delivery-42")
+    assert client.post("/github", content=body, headers=headers).json() == {"status": "accepted"}
+    response = client.post("/github", content=body, headers=headers)
+    assert response.status_code == 202
+    assert response.json() == {"status": "duplicate"}
+    assert queue.queue.qsize() == 1
+    assert dedup.stats()["hits"] == 1
+    assert dedup.stats()["misses"] == 1
+
+def test_webhook_redelivery_after_rejection(queue, dedup):
+    """Test that a delivery rejected with 503 is accepted when retried."""
+    first = b"{}"
+    assert client.post("/github", content=first, headers=signed_headers(first)).status_code == 202
+    body = b'{"n": 2}'
+    headers = signed_headers(body, delivery="delivery-7")
+    assert client.post("/github", content=body, headers=headers).status_code == 503
+    queue.queue.get_nowait()
+    assert client.post("/github", content=body, headers=headers).status_code == 202
+
+def test_webhook_duplicate_skips_parsing(queue, monkeypatch):
+    """Test that duplicates are dropped before the body is parsed."""
+    body = b"{}"
+    headers = signed_headers(body, delivery="delivery-9")
+    client.post("/github", content=body, headers=headers)
+
+    def fail(_):
+        raise AssertionError("duplicate was parsed")
+
+    monkeypatch.setattr("src.handlers.github_webhook.decode_json", fail)
+    assert client.post("/github", content=body, headers=headers).json() == {"status": "duplicate"}
+
+@pytest.mark.asyncio
+async def test_process_queued_event_routes_to_subscriptions(monkeypatch, subscription_store):
+    """Test that events go to every matching subscribed channel."""
+    from src.handlers.coalescer import EventCoalescer
+    from src.handlers.github_webhook import process_queued_event
+    from src.handlers.webhook_queue import QueuedEvent
+    from src.utils.subscriptions import Subscription
+
+    sent = []
+
+    async def send(target, content):
+        sent.append(target)
+
+    test_coalescer = EventCoalescer(send, window=60)
+    monkeypatch.setattr("src.handlers.github_webhook.coalescer", test_coalescer)
+    monkeypatch.setattr(config, "DISCORD_WEBHOOK_URL", "")
+    subscription_store.subscribe(Subscription("1", "org/repo", events=("push",)))
+    subscription_store.subscribe(Subscription("2", "org/repo", branches=("main",)))
+    subscription_store.subscribe(Subscription("3", "org/repo", branches=("dev",)))
+    subscription_store.subscribe(Subscription("4", "org/repo", events=("issues",)))
+
+    payload = {"ref": "refs/heads/main", "repository": {"full_name": "org/repo"}}
+    await process_queued_event(QueuedEvent("push", payload))
+    await test_coalescer.flush_all()
+    assert sorted(sent) == [
+        "https://discord.com/api/v10/channels/1/messages",
+        "https://discord.com/api/v10/channels/2/messages",
+    ]
+
+@pytest.mark.asyncio
+async def test_send_to_channel_uses_bot_token(monkeypatch):
+    """Test that channel posts authenticate as the bot and webhooks do not."""
+    from src.handlers.github_webhook import send_discord_webhook
+
+    calls = []
+
+    async def fake_send(url, payload, headers=None):
+        calls.append((url, headers))
+
+    monkeypatch.setattr("src.handlers.github_webhook.rate_limiter.send", fake_send)
+    monkeypatch.setattr(config, "DISCORD_BOT_TOKEN", "bot-token")
+    await send_discord_webhook("https://discord.com/api/v10/channels/1/messages", "hi")
+    await send_discord_webhook("https://discord.com/api/webhooks/1/token", "hi")
+    assert calls == [
+        ("https://discord.com/api/v10/channels/1/messages", {"Authorization": "Bot bot-token"}),
+        ("https://discord.com/api/webhooks/1/token", None),
+    ]
+
+@pytest.mark.asyncio
+async def test_github_text_never_pings(monkeypatch):
+    """Test that mentions in GitHub content are not resolved by Discord."""
+    from src.handlers.github_webhook import send_discord_webhook
+
+    payloads = []
+
+    async def fake_send(url, payload, headers=None):
+        payloads.append(payload)
+
+    monkeypatch.setattr("src.handlers.github_webhook.rate_limiter.send", fake_send)
+    await send_discord_webhook("https://discord.com/api/webhooks/1/token", "@everyone")
+    assert payloads == [{"content": "@everyone", "allowed_mentions": {"parse": []}}]
+
+@pytest.mark.asyncio
+async def test_verify_signature_caps_preallocation(monkeypatch):
+    """Test a body over the preallocation cap grows as chunks arrive."""
+    from starlette.requests import Request
+    from src.handlers import github_webhook
+
+    monkeypatch.setattr(github_webhook, "MAX_PREALLOCATED_BYTES", 4)
+    body = b'{"hello": "world"}'
+    headers = signed_headers(body)
+    chunks = [body[:5], body[5:]]
+
+    async def receive():
+        chunk = chunks.pop(0)
+        return {"type": "http.request", "body": chunk, "more_body": bool(chunks)}
+
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "headers": [
+            (b"x-hub-signature-256", headers["X-Hub-Signature-256"].encode()),
+            (b"content-length", str(len(body)).encode()),
+        ],
+    }
+    verified = await github_webhook.verify_signature(Request(scope, receive))
+    assert verified == bytearray(body)
@@ -0,0 +1,60 @@
+import pytest
+from aiohttp import web
+from fastapi import HTTPException
+from src.handlers.github_webhook import send_discord_webhook
+from src.utils.http import HTTPSessionManager
+from src.utils.ratelimit import rate_limiter
+
+@pytest.fixture
+async def sessions(monkeypatch):
+    manager = HTTPSessionManager(limit=10, limit_per_host=5)
+    monkeypatch.setattr(rate_limiter, "sessions", manager)
+    yield manager
+    await manager.close()
+
+@pytest.mark.asyncio
+async def test_session_is_shared():
+    """Test that one session is reused until closed."""
+    manager = HTTPSessionManager()
+    first = manager.get_session()
+    assert manager.get_session() is first
+    assert first.connector.limit == 100
+    assert first.connector.limit_per_host == 20
+
+    await manager.close()
+    assert manager.closed
+    assert first.closed
+    second = manager.get_session()
+    assert second is not first
+    await manager.close()
+
+@pytest.mark.asyncio
+async def test_send_discord_webhook_reuses_connection(stub_server, sessions):
+    """Test that consecutive webhook sends share a keep-alive connection."""
+    peers = []
+    received = []
+
+    async def handler(request):
+        peers.append(request.transport.get_extra_info("peername"))
+        received.append(await request.json())
+        return web.Response(status=204)
+
+    base_url = await stub_server(handler)
+    for n in range(3):
+        await send_discord_webhook(f"{base_url}/api/webhooks/1/token", f"message {n}")
+
+    assert received == [
+        {"content": f"message {n}", "allowed_mentions": {"parse": []}} for n in range(3)
+    ]
+    assert len(set(peers)) == 1
+
+@pytest.mark.asyncio
+async def test_send_discord_webhook_error(stub_server, sessions):
+    """Test that Discord errors are surfaced as HTTP 500."""
+    async def handler(request):
+        return web.Response(status=400)
+
+    base_url = await stub_server(handler)
+    with pytest.raises(HTTPException) as exc_info:
+        await send_discord_webhook(f"{base_url}/api/webhooks/1/token", "hello")
+    assert exc_info.value.status_code == 500
@@ -0,0 +1,116 @@
+import pytest
+from unittest.mock import MagicMock
+from src.handlers.interactions import registry
+
+def command(name):
+    return {"type": 2, "data": {"name": name}}
+
+def test_ping_interaction():
+    """Test that PING is answered with PONG."""
+    assert registry.dispatch({"type": 1}) == {"type": 1}
+
+def test_ping_command_latency():
+    """Test ping command reports bot latency."""
+    client = MagicMock(latency=0.1234)
+    response = registry.dispatch(command("ping"), client)
+    assert response == {
+        "type": 4,
+        "data": {"content": "Pong! 🏓 (Latency: 123ms)", "flags": 64},
+    }
+
+def test_ping_command_not_connected():
+    """Test ping command when the bot has no latency yet."""
+    response = registry.dispatch(command("ping"), MagicMock(latency=float("nan")))
+    assert "Latency: 0ms" in response["data"]["content"]
+
+    response = registry.dispatch(command("ping"), None)
+    assert "Latency unavailable" in response["data"]["content"]
+
+def test_help_command_lists_registered_commands():
+    """Test help lists every registered command."""
+    content = registry.dispatch(command("help"))["data"]["content"]
+    assert content.startswith("**Available Commands:**")
+    for name, description in registry.commands():
+        assert f"`/{name}` - {description}" in content
+
+def subscribe_command(name, channel_id="123", permissions="16", **options):
+    interaction = command(name)
+    interaction["data"]["options"] = [
+        {"type": 3, "name": key, "value": value} for key, value in options.items()
+    ]
+    if channel_id:
+        interaction["channel_id"] = channel_id
+        interaction["guild_id"] = "999"
+        interaction["member"] = {"user": {"id": "42"}, "permissions": permissions}
+    return interaction
+
+@pytest.mark.asyncio
+async def test_githubsub_command_subscribes(subscription_store):
+    """Test githubsub stores a subscription for the channel."""
+    response = await registry.dispatch(subscribe_command(
+        "githubsub", repository="fleXRPL/bot", events="push,release", branches="main"
+    ))
+    assert response == {
+        "type": 4,
+        "data": {
+            "content": "✅ Subscribed <#123> to **fleXRPL/bot** (push, release; main)",
+            "flags": 64,
+        },
+    }
+    [subscription] = subscription_store.match("flexrpl/bot", "push", "main")
+    assert subscription.channel_id == "123"
+    assert subscription.guild_id == "999"
+    assert subscription.events == ("push", "release")
+
+@pytest.mark.asyncio
+async def test_githubsub_command_defaults_to_all(subscription_store):
+    """Test githubsub without filters subscribes to every event and branch."""
+    content = (await registry.dispatch(
+        subscribe_command("githubsub", repository="org/repo")
+    ))["data"]["content"]
+    assert "(all events; all branches)" in content
+    assert len(subscription_store.match("org/repo", "issues")) == 1
+
+def test_githubsub_command_validates_input(subscription_store):
+    """Test githubsub rejects bad repositories and direct messages."""
+    response = registry.dispatch(subscribe_command("githubsub", repository="not a repo"))
+    assert "not an owner/name repository" in response["data"]["content"]
+    response = registry.dispatch(
+        subscribe_command("githubsub", channel_id=None, repository="org/repo")
+    )
+    assert "server channel" in response["data"]["content"]
+    assert subscription_store.for_channel("123") == []
+
+@pytest.mark.asyncio
+async def test_githubunsub_command(subscription_store):
+    """Test githubunsub removes the channel's subscription."""
+    await registry.dispatch(subscribe_command("githubsub", repository="org/repo"))
+    response = await registry.dispatch(subscribe_command("githubunsub", repository="org/repo"))
+    assert response["data"]["content"] == "Unsubscribed <#123> from **org/repo**"
+    assert subscription_store.match("org/repo", "push") == []
+    response = await registry.dispatch(subscribe_command("githubunsub", repository="org/repo"))
+    assert "is not subscribed" in response["data"]["content"]
+
+@pytest.mark.asyncio
+async def test_subscription_commands_require_manage_channels(subscription_store, monkeypatch):
+    """Test only members who can manage channels or admins change subscriptions."""
+    from config import config
+    for name in ("githubsub", "githubunsub"):
+        response = registry.dispatch(
+            subscribe_command(name, permissions="2048", repository="org/repo")
+        )
+        assert "Manage Channels" in response["data"]["content"]
+    assert subscription_store.for_channel("123") == []
+
+    monkeypatch.setattr(config, "ADMIN_USER_IDS", [42])
+    response = await registry.dispatch(
+        subscribe_command("githubsub", permissions="0", repository="org/repo")
+    )
+    assert response["data"]["content"].startswith("✅ Subscribed")
+
+def test_subscription_commands_hidden_by_default():
+    """Test subscription commands are registered for Manage Channels only."""
+    payloads = {p["name"]: p for p in registry.command_payloads()}
+    assert payloads["githubsub"]["default_member_permissions"] == "16"
+    assert payloads["githubunsub"]["default_member_permissions"] == "16"
+    assert "default_member_permissions" not in payloads["ping"]
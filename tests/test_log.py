@@ -0,0 +1,86 @@
+import asyncio
+import io
+import json
+import logging
+import sys
+import pytest
+from src.utils import log
+from src.utils.log import JsonFormatter, configure_logging, request_id, stop_logging
+
+@pytest.fixture
+def stream():
+    """Capture what the log listener writes and restore the root logger."""
+    root = logging.getLogger()
+    level = root.level
+    output = io.StringIO()
+    yield output
+    stop_logging()
+    assert not any(isinstance(h, log.LogQueueHandler) for h in root.handlers)
+    root.setLevel(level)
+
+def records(stream):
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+def test_json_formatter_fields():
+    """Test that records render as JSON with extras and exceptions."""
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        record = logging.getLogger("test").makeRecord(
+            "test", logging.ERROR, __file__, 1, "failed %s", ("x",),
+            sys.exc_info(), extra={"event": "push"},
+        )
+    record.request_id = "abc"
+    entry = json.loads(JsonFormatter().format(record))
+    assert entry["message"] == "failed x"
+    assert entry["level"] == "ERROR"
+    assert entry["request_id"] == "abc"
+    assert entry["event"] == "push"
+    assert "ValueError: boom" in entry["exc_info"]
+
+def test_configure_logging_writes_json_off_thread(stream):
+    """Test that records go through the listener with the request ID."""
+    configure_logging("INFO", "json", stream)
+    token = request_id.set("delivery-1")
+    try:
+        logging.getLogger("src.test").info("queued %s event", "push")
+    finally:
+        request_id.reset(token)
+    stop_logging()
+    assert records(stream)[-1]["message"] == "queued push event"
+    assert records(stream)[-1]["request_id"] == "delivery-1"
+
+def test_log_level_applied_and_lazy(stream):
+    """Test that LOG_LEVEL filters records before their arguments are formatted."""
+    class NeverFormatted:
+        def __str__(self):
+            raise AssertionError("filtered record was formatted")
+
+    configure_logging("warning", "json", stream)
+    logging.getLogger("src.test").info("payload %s", NeverFormatted())
+    logging.getLogger("src.test").warning("payload %s", "kept")
+    stop_logging()
+    assert [entry["message"] for entry in records(stream)] == ["payload kept"]
+
+def test_text_format(stream):
+    """Test the plain text format for local development."""
+    configure_logging("INFO", "text", stream)
+    logging.getLogger("src.test").info("hello")
+    stop_logging()
+    assert "src.test - INFO - [-] hello" in stream.getvalue()
+
+@pytest.mark.asyncio
+async def test_queue_worker_sets_request_id():
+    """Test that webhook workers log under the delivery ID of their event."""
+    from src.handlers.webhook_queue import QueuedEvent, WebhookQueue
+    seen = []
+
+    async def handler(event):
+        seen.append(request_id.get())
+
+    queue = WebhookQueue(handler, workers=1)
+    await queue.start()
+    queue.submit(QueuedEvent("push", {}, delivery_id="d-1"))
+    queue.submit(QueuedEvent("push", {}))
+    await queue.stop()
+    assert seen == ["d-1", "-"]
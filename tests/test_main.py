@@ -2,7 +2,7 @@ import pytest
 from fastapi.testclient import TestClient
 from unittest.mock import AsyncMock, MagicMock, patch
 import discord
-from discord.interactions import InteractionType
+from discord.interactions import InteractionType, InteractionResponseType
 import time
 import os
 import asyncio
@@ -14,9 +14,11 @@ mock_flexrpl = MagicMock()
 sys.modules['bot'] = mock_bot
 sys.modules['bot.bot'] = MagicMock(FlexRPLBot=mock_flexrpl)
 
+import src.main
+from src.container import container
 from src.main import (
-    app, should_sync_commands, start_bot, start_server, 
-    handle_discord_interaction, startup_event
+    app, start_bot, start_server, 
+    startup_event
 )
 
 # Setup test client
@@ -45,78 +47,121 @@ def test_test_endpoint():
     assert "/ping" in response.json()["commands"]
 
 @pytest.mark.asyncio
-async def test_should_sync_commands():
-    """Test command sync rate limiting."""
-    assert await should_sync_commands() is True
-    assert await should_sync_commands() is False
+async def test_startup_event_gateway_leaves_sync_to_bot(mock_bot_instance):
+    """Test that gateway mode leaves command sync to the bot's setup hook."""
+    with patch.object(container, '_bot', mock_bot_instance), \
+         patch('src.main.sync_commands', AsyncMock()) as sync:
+        await startup_event()
+    mock_bot_instance.tree.sync.assert_not_called()
+    sync.assert_not_called()
 
 @pytest.mark.asyncio
-async def test_handle_discord_interaction_ping():
-    """Test handling PING interaction."""
-    with patch('src.main.InteractionType') as mock_interaction_type:
-        # Mock the interaction type values
-        mock_interaction_type.ping.value = 1
-        mock_interaction_type.pong.value = 1
-        
-        mock_request = MagicMock(
-            json=AsyncMock(return_value={"type": mock_interaction_type.ping.value})
-        )
-        
-        response = await handle_discord_interaction(mock_request)
-        assert response["type"] == mock_interaction_type.pong.value
+async def test_run_all_http_only_skips_gateway(monkeypatch):
+    """Test that HTTP-only mode serves the app without starting the bot."""
+    from src.main import run_all
+    from config import config
+    monkeypatch.setattr(config, "DISCORD_MODE", "http")
+    with patch('src.main.start_server', AsyncMock()) as server, \
+         patch('src.main.start_bot', AsyncMock()) as bot_start:
+        await run_all()
+    server.assert_awaited_once()
+    bot_start.assert_not_called()
 
 @pytest.mark.asyncio
-async def test_handle_discord_interaction_command():
-    """Test handling command interaction."""
-    mock_request = MagicMock(
-        json=AsyncMock(return_value={
-            "type": 2,  # APPLICATION_COMMAND type
-            "data": {"name": "ping"}
-        })
-    )
-    response = await handle_discord_interaction(mock_request)
-    assert response["type"] == 4
-    assert response["data"]["content"] == "Pong! 🏓"
+async def test_startup_event_http_only_syncs_over_rest(monkeypatch):
+    """Test that HTTP-only mode syncs commands over REST without a bot."""
+    from config import config
+    monkeypatch.setattr(config, "DISCORD_MODE", "http")
+    monkeypatch.setattr(container, "_bot", None)
+    with patch('src.main.sync_commands', AsyncMock()) as sync:
+        for _ in range(2):
+            await startup_event()
+            await src.main.command_sync_task
+    sync.assert_awaited_once()
+    names = [command["name"] for command in sync.call_args.args[0]]
+    assert "githubsub" in names
+    assert container.existing_bot is None
 
-@pytest.mark.asyncio
-async def test_handle_discord_interaction_help():
-    """Test handling help command."""
-    mock_request = MagicMock(
-        json=AsyncMock(return_value={
-            "type": 2,
-            "data": {"name": "help"}
-        })
-    )
-    response = await handle_discord_interaction(mock_request)
-    assert "Available commands" in response["data"]["content"]
+def test_serve_runs_workers_in_http_only_mode(monkeypatch):
+    """Test that HTTP-only mode starts one uvicorn worker per configured CPU."""
+    from src.main import serve
+    from config import config
+    monkeypatch.setattr(config, "DISCORD_MODE", "http")
+    monkeypatch.setattr(config, "WEB_CONCURRENCY", 4)
+    monkeypatch.delenv("SERVER_STARTED_AT", raising=False)
+    monkeypatch.delenv("SHARED_STATE_PATH", raising=False)
+    with patch('src.main.uvicorn.run') as run, \
+         patch('src.main.configure_logging') as configure:
+        serve()
+    configure.assert_called_once_with()
+    assert run.call_args.args == ("src.main:app",)
+    assert run.call_args.kwargs["workers"] == 4
+    assert float(os.environ.pop("SERVER_STARTED_AT")) <= time.time()
+    assert os.environ.pop("SHARED_STATE_PATH") == "data/shared_state.db"
 
-@pytest.mark.asyncio
-async def test_handle_discord_interaction_error():
-    """Test handling interaction error."""
-    mock_request = MagicMock(
-        json=AsyncMock(side_effect=Exception("Test error"))
-    )
-    response = await handle_discord_interaction(mock_request)
-    assert "An error occurred" in response["data"]["content"]
+def test_serve_keeps_configured_shared_state(monkeypatch):
+    """Test that workers use SHARED_STATE_PATH as set, even when empty."""
+    from src.main import serve
+    from config import config
+    monkeypatch.setattr(config, "DISCORD_MODE", "http")
+    monkeypatch.setattr(config, "WEB_CONCURRENCY", 2)
+    monkeypatch.setenv("SHARED_STATE_PATH", "")
+    monkeypatch.setenv("SERVER_STARTED_AT", "0")
+    with patch('src.main.uvicorn.run'):
+        serve()
+    assert os.environ["SHARED_STATE_PATH"] == ""
+
+def test_serve_gateway_mode_single_process(monkeypatch):
+    """Test that the gateway bot is never started in several workers."""
+    from src.main import serve
+    from config import config
+    monkeypatch.setattr(config, "DISCORD_MODE", "gateway")
+    monkeypatch.setattr(config, "WEB_CONCURRENCY", 4)
+    with patch('src.main.uvicorn.run') as run, \
+         patch('src.main.run_all', MagicMock()) as run_all, \
+         patch('src.main.asyncio.run') as asyncio_run:
+        serve()
+    run.assert_not_called()
+    asyncio_run.assert_called_once_with(run_all.return_value)
+
+def test_web_workers_default_to_cpus(monkeypatch):
+    """Test WEB_CONCURRENCY parsing and its CPU-count default."""
+    from config import parse_web_workers
+    monkeypatch.setenv("WEB_CONCURRENCY", "3")
+    assert parse_web_workers() == 3
+    monkeypatch.setenv("WEB_CONCURRENCY", "")
+    assert parse_web_workers() >= 1
 
 @pytest.mark.asyncio
-async def test_handle_discord_interaction_githubsub():
-    """Test handling githubsub command."""
-    mock_request = MagicMock(
-        json=AsyncMock(return_value={
-            "type": 2,  # APPLICATION_COMMAND type
-            "data": {"name": "githubsub"}
-        })
-    )
-    response = await handle_discord_interaction(mock_request)
-    assert response["type"] == 4
-    assert "GitHub subscription" in response["data"]["content"]
+async def test_startup_event_does_not_wait_for_discord(monkeypatch):
+    """Test that a slow command sync does not hold up server startup."""
+    from config import config
+    monkeypatch.setattr(config, "DISCORD_MODE", "http")
+    synced = asyncio.Event()
+
+    async def slow_sync(commands):
+        await synced.wait()
+
+    with patch('src.main.sync_commands', slow_sync):
+        await asyncio.wait_for(startup_event(), timeout=1)
+        assert not src.main.command_sync_task.done()
+        synced.set()
+        await src.main.command_sync_task
 
 @pytest.mark.asyncio
-async def test_startup_event(mock_bot_instance):
-    """Test startup event handler."""
-    with patch('src.main.bot', mock_bot_instance), \
-         patch('src.main.should_sync_commands', AsyncMock(return_value=True)), \
-         patch('src.main.asyncio.sleep', AsyncMock()):
-        await startup_event()
-        mock_bot_instance.tree.sync.assert_called_once() 
\ No newline at end of file
+async def test_bot_built_after_server_started(monkeypatch):
+    """Test that the gateway bot is only built once the server accepts requests."""
+    server = MagicMock(started=False, should_exit=False)
+    monkeypatch.setattr("src.main.SERVER_START_POLL_INTERVAL", 0)
+    monkeypatch.setattr(container, "_bot", None)
+    built = MagicMock(start=AsyncMock())
+    monkeypatch.setattr(container, "_bot_factory", lambda: built)
+
+    task = asyncio.create_task(start_bot(server))
+    for _ in range(5):
+        await asyncio.sleep(0)
+    assert container.existing_bot is None
+    server.started = True
+    await task
+    built.start.assert_awaited_once()
+    monkeypatch.setattr(container, "_bot", None)
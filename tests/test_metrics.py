@@ -0,0 +1,134 @@
+import pytest
+from fastapi.testclient import TestClient
+from src.utils.metrics import MetricsRegistry, flatten_stats, github_delivery_seconds
+
+def test_counter_renders_per_label():
+    """Test that counters render one sample per label set."""
+    registry = MetricsRegistry()
+    counter = registry.counter("events_total", "Events.", ["type"])
+    counter.inc("push")
+    counter.inc("push")
+    counter.inc('is"sue')
+    text = registry.render()
+    assert "# TYPE events_total counter" in text
+    assert 'events_total{type="push"} 2' in text
+    assert 'events_total{type="is\\"sue"} 1' in text
+
+def test_histogram_buckets_are_cumulative():
+    """Test that histogram buckets, sum and count follow the text format."""
+    registry = MetricsRegistry()
+    histogram = registry.histogram("latency_seconds", "Latency.", buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 2.0):
+        histogram.observe(value)
+    lines = registry.render().splitlines()
+    assert 'latency_seconds_bucket{le="0.1"} 2' in lines
+    assert 'latency_seconds_bucket{le="1"} 3' in lines
+    assert 'latency_seconds_bucket{le="+Inf"} 4' in lines
+    assert "latency_seconds_sum 2.65" in lines
+    assert "latency_seconds_count 4" in lines
+    assert histogram.count() == 4
+
+def test_gauge_skipped_when_unavailable():
+    """Test that gauges without a value and failing gauges emit no sample."""
+    registry = MetricsRegistry()
+    registry.gauge("up", "Up.", lambda: None)
+    registry.gauge("broken", "Broken.", lambda: 1 / 0)
+    registry.gauge("ratio", "Ratio.", lambda: 0.25)
+    lines = registry.render().splitlines()
+    assert "ratio 0.25" in lines
+    assert not any(line.startswith(("up ", "broken ")) for line in lines)
+
+def test_duplicate_metric_rejected():
+    """Test that a metric name can only be registered once."""
+    registry = MetricsRegistry()
+    registry.counter("events_total", "Events.")
+    with pytest.raises(ValueError):
+        registry.histogram("events_total", "Events.")
+
+def test_stats_exported():
+    """Test that nested numeric stats are flattened into samples."""
+    stats = {"depth": 3, "running": True, "delivery": {"sent": 5}, "name": "x"}
+    assert list(flatten_stats("queue", stats)) == [
+        ("queue_depth", "", 3), ("queue_delivery_sent", "", 5)
+    ]
+    registry = MetricsRegistry()
+    registry.register_stats("queue", lambda: stats)
+    assert "queue_delivery_sent 5" in registry.render()
+
+def test_stats_labelled_and_names_sanitized():
+    """Test that per-item stats share one labelled family with valid names."""
+    import re
+    stats = {
+        "sent-total": 1,
+        "buckets": {
+            "https://discord.com/api/v10/channels/1/messages": {"sent": 2},
+            'https://x/"quoted"': {"sent": 3},
+        },
+    }
+    registry = MetricsRegistry()
+    registry.register_stats("ratelimit", lambda: stats, labels={"buckets": "bucket"})
+    text = registry.render()
+    assert text.count("# TYPE ratelimit_buckets_sent untyped") == 1
+    assert 'ratelimit_buckets_sent{bucket="https://discord.com/api/v10/channels/1/messages"} 2' in text
+    assert 'ratelimit_buckets_sent{bucket="https://x/\\"quoted\\""} 3' in text
+    assert "ratelimit_sent_total 1" in text
+    for line in text.splitlines():
+        if not line.startswith("#"):
+            assert re.match(r"[a-zA-Z_:][a-zA-Z0-9_:]*[{ ]", line), line
+
+def test_metrics_endpoint():
+    """Test that the app serves metrics in the Prometheus text format."""
+    from app import app
+    response = TestClient(app).get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert "# TYPE discord_interaction_handler_seconds histogram" in response.text
+    assert "github_queue_depth" in response.text
+
+def test_gateway_latency_gauge(monkeypatch):
+    """Test that gateway latency is read from the connected bot."""
+    from unittest.mock import MagicMock
+    from app import gateway_latency
+    from src.container import container
+    monkeypatch.setattr(container, "_bot", None)
+    assert gateway_latency() is None
+    bot = MagicMock(latency=0.042, is_closed=MagicMock(return_value=False))
+    monkeypatch.setattr(container, "_bot", bot)
+    assert gateway_latency() == 0.042
+    bot.latency = float("inf")
+    assert gateway_latency() is None
+
+@pytest.mark.asyncio
+async def test_ingest_to_delivery_recorded(monkeypatch):
+    """Test that delivery latency is recorded once every target has the event."""
+    from src.handlers.github_webhook import ack_when_delivered
+    from src.handlers.webhook_queue import QueuedEvent
+    before = github_delivery_seconds.count("release")
+    delivered = ack_when_delivered(2, None, QueuedEvent("release", {}))
+    delivered()
+    assert github_delivery_seconds.count("release") == before
+    delivered()
+    assert github_delivery_seconds.count("release") == before + 1
+
+def test_metrics_endpoint_rate_limit_buckets(monkeypatch):
+    """Test that rate limit buckets are exported as a bucket label."""
+    from app import app
+    from src.utils.ratelimit import rate_limiter
+    monkeypatch.setattr(rate_limiter, "_buckets", {})
+    rate_limiter.bucket("https://discord.com/api/v10/channels/123/messages")
+    text = TestClient(app).get("/metrics").text
+    assert (
+        'discord_ratelimit_buckets_sent{bucket="https://discord.com/api/v10/channels/123/messages"} 0'
+        in text
+    )
+    assert "discord_ratelimit_buckets_https" not in text
+
+def test_metrics_endpoint_verification_and_replay():
+    """Test that replay rejections and verify counters reach /metrics."""
+    from app import app
+    from src.routes.discord import replay_guard
+    replay_guard.check_timestamp("not-a-timestamp")
+    text = TestClient(app).get("/metrics").text
+    assert 'discord_replay_rejections{reason="invalid_timestamp"}' in text
+    assert "discord_signature_verify_count" in text
+    assert "github_signature_verify_count" in text
@@ -0,0 +1,201 @@
+import pytest
+from aiohttp import web
+from src.utils.http import HTTPSessionManager
+from src.utils.shared_state import SharedState
+from src.utils.ratelimit import (
+    RateLimitExceeded,
+    RateLimitScheduler,
+    bucket_name,
+)
+
+@pytest.fixture
+async def scheduler():
+    sessions = HTTPSessionManager()
+    scheduler = RateLimitScheduler(sessions, max_retries=2)
+    yield scheduler
+    await sessions.close()
+
+def test_bucket_name_hides_token():
+    """Test that webhook tokens never appear in stats keys but stay distinct."""
+    name = bucket_name("https://discord.com/api/webhooks/123/secret")
+    assert name.startswith("https://discord.com/api/webhooks/123/")
+    assert "secret" not in name
+    assert name != bucket_name("https://discord.com/api/webhooks/123/other")
+    assert name == bucket_name("https://discord.com/api/webhooks/123/secret")
+
+@pytest.mark.asyncio
+async def test_retries_after_429(stub_server, scheduler):
+    """Test that a 429 is retried after retry_after."""
+    calls = []
+
+    async def handler(request):
+        calls.append(await request.json())
+        if len(calls) == 1:
+            return web.json_response(
+                {"message": "You are being rate limited.", "retry_after": 0.05, "global": False},
+                status=429,
+            )
+        return web.Response(status=204)
+
+    url = f"{await stub_server(handler)}/api/webhooks/1/token"
+    assert await scheduler.send(url, {"content": "hi"}) == 204
+
+    assert len(calls) == 2
+    stats = scheduler.stats()["buckets"][bucket_name(url)]
+    assert stats["rate_limited"] == 1
+    assert stats["sent"] == 1
+    assert stats["wait_ms"] >= 40
+
+@pytest.mark.asyncio
+async def test_gives_up_after_max_retries(stub_server, scheduler):
+    """Test that persistent 429s raise RateLimitExceeded."""
+    async def handler(request):
+        return web.json_response({"retry_after": 0.01}, status=429)
+
+    url = f"{await stub_server(handler)}/api/webhooks/1/token"
+    with pytest.raises(RateLimitExceeded):
+        await scheduler.send(url, {"content": "hi"})
+    assert scheduler.stats()["buckets"][bucket_name(url)]["rate_limited"] == 3
+
+@pytest.mark.asyncio
+async def test_exhausted_bucket_waits_for_reset(stub_server, scheduler):
+    """Test that sends queue when X-RateLimit-Remaining reaches zero."""
+    async def handler(request):
+        return web.Response(status=204, headers={
+            "X-RateLimit-Limit": "1",
+            "X-RateLimit-Remaining": "0",
+            "X-RateLimit-Reset-After": "0.05",
+            "X-RateLimit-Bucket": "abc",
+        })
+
+    url = f"{await stub_server(handler)}/api/webhooks/1/token"
+    await scheduler.send(url, {"content": "one"})
+    await scheduler.send(url, {"content": "two"})
+
+    stats = scheduler.stats()["buckets"][bucket_name(url)]
+    assert stats["bucket_id"] == "abc"
+    assert stats["limit"] == 1
+    assert stats["sent"] == 2
+    assert stats["wait_ms"] >= 40
+
+@pytest.mark.asyncio
+async def test_idle_buckets_are_evicted(stub_server, scheduler):
+    """Test that one-off follow-up URLs do not accumulate buckets."""
+    async def handler(request):
+        return web.Response(status=204)
+
+    base = await stub_server(handler)
+    for token in range(5):
+        await scheduler.send(f"{base}/api/webhooks/1/token{token}", {"content": "hi"})
+
+    assert len(scheduler._buckets) == 1
+
+@pytest.mark.asyncio
+async def test_exhausted_bucket_kept_until_reset(stub_server, scheduler):
+    """Test that a bucket still waiting for its reset is not evicted."""
+    async def handler(request):
+        return web.Response(status=204, headers={
+            "X-RateLimit-Remaining": "0",
+            "X-RateLimit-Reset-After": "60",
+        })
+
+    base = await stub_server(handler)
+    await scheduler.send(f"{base}/api/channels/1/messages", {"content": "hi"})
+    scheduler.bucket(f"{base}/api/channels/2/messages")
+
+    assert f"{base}/api/channels/1/messages" in scheduler._buckets
+
+@pytest.mark.asyncio
+async def test_global_rate_limit_blocks_all_buckets(stub_server):
+    """Test that a global 429 delays sends to every URL."""
+    sleeps = []
+
+    async def fake_sleep(delay):
+        sleeps.append(delay)
+
+    sessions = HTTPSessionManager()
+    scheduler = RateLimitScheduler(sessions, sleep=fake_sleep)
+    responses = [
+        web.json_response({"retry_after": 2.0, "global": True}, status=429),
+    ]
+
+    async def handler(request):
+        if responses:
+            return responses.pop()
+        return web.Response(status=204)
+
+    base_url = await stub_server(handler)
+    try:
+        await scheduler.send(f"{base_url}/api/webhooks/1/a", {"content": "one"})
+        await scheduler.send(f"{base_url}/api/webhooks/2/b", {"content": "two"})
+    finally:
+        await sessions.close()
+
+    assert scheduler.stats()["global_rate_limited"] == 1
+    assert len(sleeps) == 2
+    assert all(0 < delay <= 2.0 for delay in sleeps)
+
+@pytest.mark.asyncio
+async def test_other_errors_raise(stub_server, scheduler):
+    """Test that non-429 errors are not retried."""
+    calls = []
+
+    async def handler(request):
+        calls.append(1)
+        return web.Response(status=404)
+
+    url = f"{await stub_server(handler)}/api/webhooks/1/token"
+    with pytest.raises(Exception):
+        await scheduler.send(url, {"content": "hi"})
+    assert len(calls) == 1
+
+@pytest.mark.asyncio
+async def test_rate_limits_shared_between_workers(stub_server, tmp_path):
+    """Test that a 429 seen by one worker delays the others' sends."""
+    sleeps = []
+
+    async def fake_sleep(delay):
+        sleeps.append(delay)
+
+    responses = [web.json_response({"retry_after": 2.0}, status=429)]
+
+    async def handler(request):
+        if responses:
+            return responses.pop()
+        return web.Response(status=204)
+
+    url = f"{await stub_server(handler)}/api/webhooks/1/token"
+    sessions = HTTPSessionManager()
+    state = SharedState(str(tmp_path / "shared.db"))
+    first, second = (
+        RateLimitScheduler(sessions, sleep=fake_sleep, shared=state) for _ in range(2)
+    )
+    try:
+        await first.send(url, {"content": "one"})
+        await second.send(url, {"content": "two"})
+    finally:
+        await sessions.close()
+        state.close()
+
+    assert len(sleeps) == 2
+    assert 1.5 < sleeps[1] <= 2.0
+    assert second.stats()["buckets"][bucket_name(url)]["rate_limited"] == 0
+
+@pytest.mark.asyncio
+async def test_follow_ups_do_not_share_a_bucket(stub_server, scheduler):
+    """Test that an exhausted follow-up does not hold back other follow-ups."""
+    async def handler(request):
+        if request.path.endswith("/first"):
+            return web.Response(status=204, headers={
+                "X-RateLimit-Remaining": "0",
+                "X-RateLimit-Reset-After": "60",
+            })
+        return web.Response(status=204)
+
+    base = await stub_server(handler)
+    await scheduler.send(f"{base}/api/webhooks/1/first", {"content": "one"})
+    await scheduler.send(f"{base}/api/webhooks/1/second", {"content": "two"})
+
+    buckets = scheduler.stats()["buckets"]
+    assert buckets[bucket_name(f"{base}/api/webhooks/1/first")]["remaining"] == 0
+    assert buckets[bucket_name(f"{base}/api/webhooks/1/second")]["wait_ms"] == 0
@@ -0,0 +1,71 @@
+import pytest
+from src.utils.replay import ReplayGuard
+from src.utils.shared_state import SharedState
+
+def test_timestamp_window():
+    """Test timestamps inside and outside the skew window."""
+    guard = ReplayGuard(tolerance=5, clock=lambda: 1000)
+    assert guard.check_timestamp("1000") is True
+    assert guard.check_timestamp("995") is True
+    assert guard.check_timestamp("1005") is True
+    assert guard.check_timestamp("994") is False
+    assert guard.check_timestamp("1006") is False
+    assert guard.rejections["stale_timestamp"] == 2
+
+def test_invalid_timestamp():
+    """Test that non-numeric timestamps are rejected."""
+    guard = ReplayGuard()
+    assert guard.check_timestamp("yesterday") is False
+    assert guard.rejections["invalid_timestamp"] == 1
+
+def test_signature_replay():
+    """Test that each signature is accepted once."""
+    guard = ReplayGuard()
+    assert guard.check_signature("abc") is True
+    assert guard.check_signature("abc") is False
+    assert guard.check_signature("def") is True
+    assert guard.rejections["replayed_signature"] == 1
+
+def test_signature_replay_ignores_hex_case():
+    """Test that a replayed signature is caught whatever its hex case."""
+    guard = ReplayGuard()
+    assert guard.check_signature("abcd" * 32) is True
+    assert guard.check_signature("ABCD" * 32) is False
+    assert guard.check_signature("ab cd" * 32) is False
+
+def test_interaction_duplicates():
+    """Test interaction ID de-duplication."""
+    guard = ReplayGuard()
+    assert guard.check_interaction("1") is True
+    assert guard.check_interaction("1") is False
+    assert guard.check_interaction(None) is True
+    assert guard.check_interaction(None) is True
+    assert guard.stats() == {
+        "rejections": {"duplicate_interaction": 1},
+        "seen_signatures": 0,
+        "seen_interactions": 1,
+    }
+
+def test_reset():
+    """Test that reset forgets seen requests and counters."""
+    guard = ReplayGuard()
+    guard.check_signature("abc")
+    guard.check_signature("abc")
+    guard.reset()
+    assert guard.check_signature("abc") is True
+    assert guard.rejections == {}
+
+@pytest.mark.asyncio
+async def test_interaction_claimed_across_workers(tmp_path):
+    """Test that a replay sent to another worker is refused there."""
+    path = str(tmp_path / "shared.db")
+    first = ReplayGuard(shared=SharedState(path))
+    second = ReplayGuard(shared=SharedState(path))
+
+    assert first.check_interaction("1") and await first.claim_interaction("1")
+    assert second.check_interaction("1") is True
+    assert await second.claim_interaction("1") is False
+    assert second.rejections["duplicate_interaction"] == 1
+    assert await ReplayGuard().claim_interaction("1") is True
+    first.shared.close()
+    second.shared.close()
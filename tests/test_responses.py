@@ -0,0 +1,57 @@
+import json
+import pytest
+from unittest.mock import patch
+from src.handlers.interactions import build_static_responses, static_responses
+from src.utils.responses import StaticResponse, decode_json, encode_json, render_response
+
+def test_encode_json_compact():
+    """Test that encoded JSON is compact and keeps unicode."""
+    body = encode_json({"type": 4, "data": {"content": "Pong! 🏓"}})
+    assert b" " not in body.replace("Pong! ".encode(), b"")
+    assert json.loads(body) == {"type": 4, "data": {"content": "Pong! 🏓"}}
+
+def test_encode_json_without_orjson():
+    """Test the standard library fallback encoder."""
+    with patch("src.utils.responses.orjson", None):
+        assert encode_json({"type": 1, "data": {"content": "é"}}) == (
+            '{"type":1,"data":{"content":"é"}}'.encode()
+        )
+
+def test_static_response_renders_once():
+    """Test that the body is rendered at construction time."""
+    with patch("src.utils.responses.encode_json", return_value=b"{}") as mock_encode:
+        response = StaticResponse({"type": 1})
+        render_response(response)
+        render_response(response)
+        mock_encode.assert_called_once()
+
+def test_static_response_is_immutable():
+    """Test that cached responses cannot be changed by handlers."""
+    response = StaticResponse({"type": 1})
+    with pytest.raises(TypeError):
+        response["type"] = 4
+    with pytest.raises(TypeError):
+        response.update({"type": 4})
+    assert response == {"type": 1}
+
+def test_render_response_dynamic():
+    """Test rendering a plain dict payload."""
+    response = render_response({"type": 4, "data": {"content": "hi"}})
+    assert response.media_type == "application/json"
+    assert json.loads(response.body) == {"type": 4, "data": {"content": "hi"}}
+
+def test_static_interaction_responses():
+    """Test the pre-rendered interaction replies."""
+    responses = build_static_responses()
+    assert responses is static_responses
+    assert json.loads(responses["pong"].body) == {"type": 1}
+    assert json.loads(responses["channel_required"].body)["data"]["flags"] == 64
+    assert "Available Commands" in responses["help"]["data"]["content"]
+    assert responses["error"]["data"]["flags"] == 64
+
+def test_decode_json_from_bytes():
+    """Test parsing request bodies straight from bytes."""
+    body = '{"type":2,"data":{"name":"é"}}'.encode()
+    assert decode_json(body) == {"type": 2, "data": {"name": "é"}}
+    with patch("src.utils.responses.orjson", None):
+        assert decode_json(body) == {"type": 2, "data": {"name": "é"}}
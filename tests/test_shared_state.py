@@ -0,0 +1,41 @@
+import pytest
+from src.utils import shared_state as shared_state_module
+from src.utils.shared_state import SharedState, create_shared_state, register_backend
+
+def test_create_shared_state_from_path(tmp_path):
+    """Test that plain paths and sqlite:// URLs use the SQLite backend."""
+    assert create_shared_state("") is None
+    state = create_shared_state(str(tmp_path / "state.db"))
+    assert isinstance(state, SharedState)
+    assert state.path == str(tmp_path / "state.db")
+    url_state = create_shared_state(f"sqlite://{tmp_path}/url.db")
+    assert url_state.path == f"{tmp_path}/url.db"
+
+def test_create_shared_state_unknown_backend():
+    """Test that an unregistered scheme is a configuration error."""
+    with pytest.raises(ValueError, match="redis"):
+        create_shared_state("redis://localhost:6379/0")
+
+def test_register_backend(monkeypatch):
+    """Test that registered backends are built from the rest of the URL."""
+    monkeypatch.setattr(shared_state_module, "BACKENDS", dict(shared_state_module.BACKENDS))
+    created = []
+
+    def factory(location):
+        created.append(location)
+        return "custom"
+
+    register_backend("custom", factory)
+    assert create_shared_state("custom://host/db") == "custom"
+    assert created == ["host/db"]
+
+@pytest.mark.asyncio
+async def test_values_shared_between_processes(tmp_path):
+    """Test that values set through one connection are read by another."""
+    path = str(tmp_path / "state.db")
+    first, second = SharedState(path), SharedState(path)
+    assert await second.get("ns", "key") is None
+    await first.set("ns", "key", "1")
+    assert await second.get("ns", "key") == "1"
+    first.close()
+    second.close()
@@ -0,0 +1,129 @@
+import asyncio
+import pytest
+from src.utils.spool import EventSpool
+
+@pytest.fixture
+def spool_path(tmp_path):
+    return str(tmp_path / "spool" / "events.db")
+
+@pytest.mark.asyncio
+async def test_append_and_replay_after_restart(spool_path):
+    """Test that unacknowledged events survive closing the spool."""
+    spool = EventSpool(spool_path)
+    await spool.open()
+    first = await spool.append("push", b'{"n": 1}', "delivery-1")
+    second = await spool.append("issues", bytearray(b'{"n": 2}'))
+    spool.ack(first)
+    await spool.close()
+
+    reopened = EventSpool(spool_path)
+    await reopened.open()
+    events = await reopened.replay()
+    await reopened.close()
+
+    assert [(e.spool_id, e.event_type, e.delivery_id, e.body) for e in events] == [
+        (second, "issues", None, b'{"n": 2}')
+    ]
+
+@pytest.mark.asyncio
+async def test_concurrent_appends_share_commits(spool_path):
+    """Test that appends arriving together are group-committed."""
+    spool = EventSpool(spool_path, flush_interval=0.01)
+    await spool.open()
+    ids = await asyncio.gather(*(spool.append("push", b"{}") for _ in range(50)))
+    stats = spool.stats()
+    await spool.close()
+
+    assert len(set(ids)) == 50
+    assert stats["appended"] == 50
+    assert stats["batches"] < 50
+
+@pytest.mark.asyncio
+async def test_batch_size_caps_transaction(spool_path):
+    """Test that a full batch is committed without waiting for the interval."""
+    spool = EventSpool(spool_path, flush_interval=60, batch_size=5)
+    await spool.open()
+    ids = await asyncio.wait_for(
+        asyncio.gather(*(spool.append("push", b"{}") for _ in range(10))), 5
+    )
+    await spool.close()
+    assert len(ids) == 10
+    assert spool.stats()["batches"] == 2
+
+@pytest.mark.asyncio
+async def test_ack_is_flushed_on_close(spool_path):
+    """Test that acks pending at shutdown are still applied."""
+    spool = EventSpool(spool_path, flush_interval=0)
+    await spool.open()
+    spool_id = await spool.append("push", b"{}")
+    spool.flush_interval = 60
+    spool.ack(spool_id)
+    await spool.close()
+    assert spool.stats()["acked"] == 1
+
+    await spool.open()
+    assert await spool.replay() == []
+    await spool.close()
+
+@pytest.mark.asyncio
+async def test_disabled_spool_is_a_no_op():
+    """Test that an unopened or pathless spool stores nothing."""
+    spool = EventSpool("")
+    await spool.open()
+    assert spool.enabled is False
+    assert await spool.append("push", b"{}") is None
+    spool.ack(1)
+    assert await spool.replay() == []
+    await spool.close()
+
+@pytest.mark.asyncio
+async def test_replay_before(spool_path, monkeypatch):
+    """Test that replay can be limited to events received before a time."""
+    spool = EventSpool(spool_path)
+    await spool.open()
+    monkeypatch.setattr("src.utils.spool.time.time", lambda: 100.0)
+    old = await spool.append("push", b"{}")
+    monkeypatch.setattr("src.utils.spool.time.time", lambda: 200.0)
+    await spool.append("push", b"{}")
+    events = await spool.replay(before=150.0)
+    await spool.close()
+    assert [event.spool_id for event in events] == [old]
+
+def dead_letters(path):
+    import sqlite3
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute(
+            "SELECT id, delivery_id, attempts, reason FROM dead_letters ORDER BY id"
+        ).fetchall()
+    finally:
+        conn.close()
+
+@pytest.mark.asyncio
+async def test_dead_letter_removes_event_from_replay(spool_path):
+    """Test that a failed event is kept aside instead of being replayed."""
+    spool = EventSpool(spool_path)
+    await spool.open()
+    failed = await spool.append("pull_request", b'{"pull_request": null}', "d-1")
+    spool.dead_letter(failed, "AttributeError: boom")
+    await spool.close()
+
+    await spool.open()
+    assert await spool.replay() == []
+    await spool.close()
+    assert dead_letters(spool_path) == [(failed, "d-1", 0, "AttributeError: boom")]
+    assert spool.stats()["dead_lettered"] == 1
+
+@pytest.mark.asyncio
+async def test_replay_attempts_bounded(spool_path):
+    """Test that an event never acked is dead-lettered after max_attempts replays."""
+    spool = EventSpool(spool_path, max_attempts=2)
+    await spool.open()
+    spool_id = await spool.append("push", b"{}", "d-2")
+    for _ in range(2):
+        assert [event.spool_id for event in await spool.replay()] == [spool_id]
+    assert await spool.replay() == []
+    await spool.close()
+    [(dead_id, _, attempts, reason)] = dead_letters(spool_path)
+    assert (dead_id, attempts) == (spool_id, 2)
+    assert "2 replays" in reason
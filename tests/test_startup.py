@@ -0,0 +1,27 @@
+import pytest
+from benchmarks.bench_startup import import_times
+
+# Heavy modules the web app only imports once a request or the bot needs them
+LAZY_MODULES = ("discord", "aiohttp", "uvicorn", "httpx")
+
+# Generous so slow CI machines pass; a regression here is usually seconds
+IMPORT_BUDGET_SECONDS = 2.5
+
+@pytest.fixture(scope="module")
+def app_import_times():
+    return import_times("app")
+
+def test_app_import_skips_heavy_modules(app_import_times):
+    """Test that importing the app does not pull in discord.py or HTTP clients."""
+    assert [name for name in LAZY_MODULES if name in app_import_times] == []
+
+def test_main_import_skips_discord():
+    """Test that the HTTP worker entry point does not import discord.py."""
+    times = import_times("src.main")
+    assert "discord" not in times
+    assert "aiohttp" not in times
+
+def test_app_import_within_budget(app_import_times):
+    """Test that `import app` stays within its -X importtime budget."""
+    slowest = sorted(app_import_times.items(), key=lambda item: item[1], reverse=True)
+    assert app_import_times["app"] < IMPORT_BUDGET_SECONDS, slowest[:10]
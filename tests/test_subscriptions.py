@@ -0,0 +1,97 @@
+import pytest
+from src.utils.subscriptions import (
+    Subscription, SubscriptionStore, event_branch, parse_filter
+)
+
+def test_parse_filter():
+    """Test comma-separated filters are split, trimmed and deduplicated."""
+    assert parse_filter(None) == ()
+    assert parse_filter("") == ()
+    assert parse_filter(" push, release ,push,") == ("push", "release")
+
+def test_event_branch():
+    """Test branch extraction for branch-scoped events."""
+    assert event_branch("push", {"ref": "refs/heads/main"}) == "main"
+    assert event_branch("push", {"ref": "refs/tags/v1"}) is None
+    assert event_branch("pull_request", {"pull_request": {"base": {"ref": "dev"}}}) == "dev"
+    assert event_branch("workflow_run", {"workflow_run": {"head_branch": "ci"}}) == "ci"
+    assert event_branch("create", {"ref_type": "branch", "ref": "feature"}) == "feature"
+    assert event_branch("create", {"ref_type": "tag", "ref": "v1"}) is None
+    assert event_branch("issues", {}) is None
+
+def test_match_by_repository_and_event(subscription_store):
+    """Test that lookup returns only subscriptions for the event's repo and type."""
+    subscription_store.subscribe(Subscription("1", "org/repo", events=("push",)))
+    subscription_store.subscribe(Subscription("2", "org/repo"))
+    subscription_store.subscribe(Subscription("3", "org/other"))
+
+    assert {s.channel_id for s in subscription_store.match("org/repo", "push")} == {"1", "2"}
+    assert {s.channel_id for s in subscription_store.match("ORG/Repo", "issues")} == {"2"}
+    assert subscription_store.match("org/missing", "push") == []
+
+def test_branch_filter(subscription_store):
+    """Test that branch filters are applied to matching subscriptions."""
+    subscription_store.subscribe(Subscription("1", "org/repo", branches=("main",)))
+    assert len(subscription_store.match("org/repo", "push", "main")) == 1
+    assert subscription_store.match("org/repo", "push", "feature") == []
+    assert subscription_store.match("org/repo", "push", None) == []
+
+def test_resubscribe_replaces_filters(subscription_store):
+    """Test that subscribing again updates the channel's filters."""
+    subscription_store.subscribe(Subscription("1", "org/repo", events=("push",)))
+    subscription_store.subscribe(Subscription("1", "Org/Repo", events=("release",)))
+    assert subscription_store.match("org/repo", "push") == []
+    assert len(subscription_store.match("org/repo", "release")) == 1
+    assert len(subscription_store.for_channel("1")) == 1
+
+def test_unsubscribe(subscription_store):
+    """Test removing a subscription from the store and the index."""
+    subscription_store.subscribe(Subscription("1", "org/repo", events=("push", "issues")))
+    assert subscription_store.unsubscribe("1", "org/repo") is True
+    assert subscription_store.unsubscribe("1", "org/repo") is False
+    assert subscription_store.match("org/repo", "issues") == []
+
+def test_persisted_and_loaded_lazily(tmp_path):
+    """Test that subscriptions survive a restart and load on first use."""
+    path = str(tmp_path / "subs.db")
+    store = SubscriptionStore(path)
+    store.subscribe(Subscription("1", "org/repo", guild_id="9", events=("push",),
+                                 branches=("main", "dev")))
+    store.close()
+
+    reloaded = SubscriptionStore(path)
+    assert reloaded.loaded is False
+    [subscription] = reloaded.match("org/repo", "push", "dev")
+    assert reloaded.loaded is True
+    assert subscription.guild_id == "9"
+    assert subscription.branches == ("dev", "main")
+    reloaded.close()
+
+def test_changes_from_other_workers_reloaded(tmp_path):
+    """Test that a worker sees subscriptions another worker changed."""
+    path = str(tmp_path / "subs.db")
+    first = SubscriptionStore(path)
+    second = SubscriptionStore(path, refresh_interval=0)
+    assert second.match("org/repo", "push") == []
+
+    first.subscribe(Subscription("1", "org/repo"))
+    assert [sub.channel_id for sub in second.match("org/repo", "push")] == ["1"]
+    first.unsubscribe("1", "org/repo")
+    assert second.match("org/repo", "push") == []
+    first.close()
+    second.close()
+
+def test_other_workers_checked_once_per_interval(tmp_path):
+    """Test that routing only polls data_version once per refresh interval."""
+    path = str(tmp_path / "subs.db")
+    now = [100.0]
+    first = SubscriptionStore(path)
+    second = SubscriptionStore(path, refresh_interval=5, clock=lambda: now[0])
+    assert second.match("org/repo", "push") == []
+
+    first.subscribe(Subscription("1", "org/repo"))
+    assert second.match("org/repo", "push") == []
+    now[0] += 5
+    assert [sub.channel_id for sub in second.match("org/repo", "push")] == ["1"]
+    first.close()
+    second.close()
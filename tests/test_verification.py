@@ -0,0 +1,163 @@
+import hashlib
+import hmac
+import pytest
+from unittest.mock import patch
+from nacl.signing import SigningKey
+from src.utils.verification import (
+    GitHubSignatureVerifier,
+    InteractionVerifier,
+    load_verify_key,
+)
+
+old_signing_key = SigningKey.generate()
+new_signing_key = SigningKey.generate()
+OLD_KEY_HEX = old_signing_key.verify_key.encode().hex()
+NEW_KEY_HEX = new_signing_key.verify_key.encode().hex()
+
+def sign(signing_key, message: bytes) -> str:
+    return signing_key.sign(message).signature.hex()
+
+def test_load_verify_key_invalid():
+    """Test that invalid keys are rejected."""
+    assert load_verify_key("not-hex") is None
+    assert load_verify_key("abcd") is None
+    assert load_verify_key(OLD_KEY_HEX) is not None
+
+def test_verifier_caches_key():
+    """Test that the key is decoded once, not per verification."""
+    verifier = InteractionVerifier(OLD_KEY_HEX)
+    message = b"1234567890{\"type\":1}"
+    with patch("src.utils.verification.VerifyKey") as mock_verify_key:
+        assert verifier.verify(message, sign(old_signing_key, message)) is True
+        mock_verify_key.assert_not_called()
+
+def test_verifier_rejects_bad_signatures():
+    """Test rejection of malformed and mismatched signatures."""
+    verifier = InteractionVerifier(OLD_KEY_HEX)
+    message = b"1234567890{}"
+    assert verifier.verify(message, "invalid") is False
+    assert verifier.verify(message, sign(new_signing_key, message)) is False
+    assert verifier.verify_failures == 2
+
+def test_verifier_not_ready_without_key():
+    """Test that an empty key leaves the verifier unusable."""
+    verifier = InteractionVerifier("")
+    assert verifier.ready is False
+    assert verifier.verify(b"x", sign(old_signing_key, b"x")) is False
+
+def test_previous_key_expires():
+    """Test that old and new keys are both valid until the previous key expires."""
+    message = b"1234567890{}"
+    with patch("src.utils.verification.time.time", return_value=1000.0):
+        verifier = InteractionVerifier(
+            NEW_KEY_HEX, previous_public_key=OLD_KEY_HEX, previous_key_expires_at=1060
+        )
+        assert verifier.verify(message, sign(old_signing_key, message)) is True
+        assert verifier.verify(message, sign(new_signing_key, message)) is True
+
+    with patch("src.utils.verification.time.time", return_value=1061.0):
+        assert verifier.verify(message, sign(old_signing_key, message)) is False
+        assert verifier.verify(message, sign(new_signing_key, message)) is True
+        assert len(verifier.active_keys()) == 1
+
+def test_previous_key_from_config():
+    """Test seeding a previous key for deploy-time rotation."""
+    with patch("src.utils.verification.time.time", return_value=1000.0):
+        verifier = InteractionVerifier(
+            NEW_KEY_HEX, previous_public_key=OLD_KEY_HEX, previous_key_expires_at=1060
+        )
+        message = b"1234567890{}"
+        assert verifier.verify(message, sign(old_signing_key, message)) is True
+        assert len(verifier.active_keys()) == 2
+
+def test_previous_key_expiry_survives_restarts():
+    """Test that a restart does not extend the previous key's validity."""
+    message = b"1234567890{}"
+    with patch("src.utils.verification.time.time", return_value=1061.0):
+        restarted = InteractionVerifier(
+            NEW_KEY_HEX, previous_public_key=OLD_KEY_HEX, previous_key_expires_at=1060
+        )
+        assert restarted.verify(message, sign(old_signing_key, message)) is False
+
+    without_expiry = InteractionVerifier(NEW_KEY_HEX, previous_public_key=OLD_KEY_HEX)
+    assert len(without_expiry.active_keys()) == 1
+
+def test_verify_stats():
+    """Test that per-request verify timing is recorded."""
+    verifier = InteractionVerifier(OLD_KEY_HEX)
+    message = b"1234567890{}"
+    verifier.verify(message, sign(old_signing_key, message))
+    stats = verifier.stats()
+    assert stats["verify_count"] == 1
+    assert stats["last_verify_ms"] > 0
+    assert stats["avg_verify_ms"] == pytest.approx(stats["last_verify_ms"])
+
+def test_verify_request_over_raw_bytes():
+    """Test verifying timestamp and body bytes without decoding the body."""
+    verifier = InteractionVerifier(OLD_KEY_HEX)
+    body = '{"type":2,"data":{"name":"ping","value":"é"}}'.encode()
+    signature = sign(old_signing_key, b"1234567890" + body)
+
+    assert verifier.verify_request("1234567890", body, signature) is True
+    assert verifier.verify_request("1234567891", body, signature) is False
+    assert verifier.verify_request("1234567890", body + b" ", signature) is False
+
+def test_verify_request_rejects_short_signature():
+    """Test that a truncated signature is rejected."""
+    verifier = InteractionVerifier(OLD_KEY_HEX)
+    signature = sign(old_signing_key, b"1{}")
+    assert verifier.verify_request("1", b"{}", signature[:-2]) is False
+
+def github_signature(secret: str, body: bytes, algorithm: str = "sha256") -> str:
+    digest = hmac.new(secret.encode(), body, getattr(hashlib, algorithm)).hexdigest()
+    return f"{algorithm}={digest}"
+
+def test_github_verifier_sha256_and_sha1():
+    """Test both GitHub signature digests."""
+    verifier = GitHubSignatureVerifier(["s3cret-value"])
+    body = b'{"action": "opened"}'
+    assert verifier.verify(body, "sha256", github_signature("s3cret-value", body))
+    assert verifier.verify(body, "sha1", github_signature("s3cret-value", body, "sha1"))
+    assert not verifier.verify(body, "sha256", github_signature("other", body))
+    assert verifier.stats()["verify_failures"] == 1
+
+def test_github_verifier_streamed_chunks():
+    """Test incremental verification matches the whole-body digest."""
+    verifier = GitHubSignatureVerifier(["s3cret-value"])
+    body = b"x" * 10000
+    check = verifier.start("sha256")
+    for start in range(0, len(body), 777):
+        check.update(body[start:start + 777])
+    assert check.matches(github_signature("s3cret-value", body))
+
+def test_github_verifier_reuses_keyed_state():
+    """Test that requests copy the precomputed state instead of re-keying."""
+    verifier = GitHubSignatureVerifier(["s3cret-value"])
+    signature = github_signature("s3cret-value", b"{}")
+    with patch("src.utils.verification.hmac.new") as mock_new:
+        assert verifier.verify(b"{}", "sha256", signature)
+        mock_new.assert_not_called()
+
+def test_github_verifier_multiple_secrets():
+    """Test zero-downtime rotation with several active secrets."""
+    verifier = GitHubSignatureVerifier(["new-secret", "old-secret", ""])
+    body = b"{}"
+    assert verifier.verify(body, "sha256", github_signature("new-secret", body))
+    assert verifier.verify(body, "sha256", github_signature("old-secret", body))
+    assert verifier.stats()["active_secrets"] == 2
+
+def test_github_signature_header_selection():
+    """Test that sha256 is preferred over sha1."""
+    verifier = GitHubSignatureVerifier(["s"])
+    assert verifier.signature_from_headers(
+        {"X-Hub-Signature-256": "sha256=a", "X-Hub-Signature": "sha1=b"}
+    ) == ("sha256", "sha256=a")
+    assert verifier.signature_from_headers({"X-Hub-Signature": "sha1=b"}) == ("sha1", "sha1=b")
+    assert verifier.signature_from_headers({}) is None
+
+def test_github_verify_latency_recorded():
+    """Test that per-request verify latency is recorded."""
+    verifier = GitHubSignatureVerifier(["s"])
+    verifier.verify(b"{}", "sha256", github_signature("s", b"{}"))
+    assert verifier.stats()["verify_count"] == 1
+    assert verifier.stats()["last_verify_ms"] > 0
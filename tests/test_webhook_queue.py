@@ -0,0 +1,89 @@
+import asyncio
+import pytest
+from src.handlers.webhook_queue import QueuedEvent, WebhookQueue
+
+@pytest.mark.asyncio
+async def test_workers_drain_queue():
+    """Test that workers process every submitted event."""
+    handled = []
+
+    async def handler(event):
+        handled.append(event.payload["n"])
+
+    queue = WebhookQueue(handler, maxsize=10, workers=3)
+    await queue.start()
+    for n in range(5):
+        assert queue.submit(QueuedEvent("push", {"n": n})) is True
+    await queue.stop()
+
+    assert sorted(handled) == [0, 1, 2, 3, 4]
+    stats = queue.stats()
+    assert stats["processed"] == 5
+    assert stats["depth"] == 0
+    assert stats["workers"] == 0
+
+@pytest.mark.asyncio
+async def test_queue_full_sheds_events():
+    """Test that submit refuses events once the queue is full."""
+    async def handler(event):
+        pass
+
+    queue = WebhookQueue(handler, maxsize=2, workers=1)
+    assert queue.submit(QueuedEvent("push", {})) is True
+    assert queue.submit(QueuedEvent("push", {})) is True
+    assert queue.submit(QueuedEvent("push", {})) is False
+    assert queue.stats()["dropped"] == 1
+    assert queue.stats()["depth"] == 2
+
+@pytest.mark.asyncio
+async def test_concurrency_limit():
+    """Test that at most `workers` events are handled at once."""
+    active = 0
+    peak = 0
+
+    async def handler(event):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+
+    queue = WebhookQueue(handler, maxsize=20, workers=2)
+    await queue.start()
+    for _ in range(6):
+        queue.submit(QueuedEvent("push", {}))
+    await queue.stop()
+    assert peak == 2
+
+@pytest.mark.asyncio
+async def test_handler_failure_is_isolated():
+    """Test that a failing event does not stop the worker."""
+    async def handler(event):
+        if event.payload.get("fail"):
+            raise RuntimeError("boom")
+
+    failures = []
+    queue = WebhookQueue(
+        handler, maxsize=10, workers=1,
+        on_error=lambda event, error: failures.append((event.spool_id, str(error))),
+    )
+    await queue.start()
+    queue.submit(QueuedEvent("push", {"fail": True}, spool_id=7))
+    queue.submit(QueuedEvent("push", {}))
+    await queue.stop()
+    assert queue.failed == 1
+    assert queue.processed == 1
+    assert failures == [(7, "boom")]
+
+@pytest.mark.asyncio
+async def test_time_in_queue_recorded():
+    """Test that queue wait time is measured."""
+    async def handler(event):
+        pass
+
+    queue = WebhookQueue(handler, maxsize=10, workers=1)
+    queue.submit(QueuedEvent("push", {}))
+    await asyncio.sleep(0.02)
+    await queue.start()
+    await queue.stop()
+    assert queue.stats()["max_wait_ms"] >= 20